@@ -93,6 +93,10 @@ def _postUpload(event):
         if fileObj['name'].endswith('.geo.tiff'):
             item['largeImage']['sourceName'] = 'gdal'
         Item().save(item)
+        try:
+            ImageItem().prewarm(item)
+        except Exception:
+            logger.exception('Failed to prewarm large image %s', item['_id'])
         # If the job looks finished, update it once more to force notifications
         if 'jobId' in item['largeImage'] and item['largeImage'].get('notify'):
             job = Job().load(item['largeImage']['jobId'], force=True)
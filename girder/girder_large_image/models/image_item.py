@@ -25,6 +25,7 @@ import pymongo
 from girder_jobs.constants import JobStatus
 from girder_jobs.models.job import Job
 
+import large_image
 from girder import logger
 from girder.constants import SortDir
 from girder.exceptions import FilePathException, GirderException, ValidationException
@@ -300,8 +301,53 @@ class ImageItem(Item):
 
     def getMetadata(self, item, **kwargs):
         tileSource = self._loadTileSource(item, **kwargs)
+        self._prewarmTileSource(tileSource)
         return tileSource.getMetadata()
 
+    def _prewarmSeconds(self):
+        """
+        Get the prewarm_seconds config value.
+
+        :returns: the number of seconds to prewarm a tile source; 0 to not
+            prewarm.
+        """
+        try:
+            return max(0, float(large_image.config.getConfig('prewarm_seconds') or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def _prewarmTileSource(self, tileSource):
+        """
+        If the prewarm_seconds config value is set, start rendering the
+        coarsest tiles of a tile source in the background.  A tile source is
+        only prewarmed once while it is cached.
+
+        :param tileSource: the tile source.
+        :returns: a TilePrewarmer or None.
+        """
+        seconds = self._prewarmSeconds()
+        if not seconds:
+            return None
+        # Tile requests use mayRedirect, so it is part of the cached tile key
+        return tileSource.prewarm(budget_seconds=seconds, mayRedirect=False)
+
+    def prewarm(self, item, **kwargs):
+        """
+        If the prewarm_seconds config value is set, start rendering the
+        coarsest tiles of an item's large image in the background.
+
+        :param item: the item with the large image.
+        :param kwargs: optional parameters used to open the tile source.
+        :returns: a TilePrewarmer or None.
+        """
+        if not self._prewarmSeconds():
+            return None
+        try:
+            tileSource = self._loadTileSource(item, **kwargs)
+        except (TileSourceError, OSError):
+            return None
+        return self._prewarmTileSource(tileSource)
+
     def getInternalMetadata(self, item, **kwargs):
         tileSource = self._loadTileSource(item, **kwargs)
         result = tileSource.getInternalMetadata() or {}
@@ -244,6 +244,7 @@ class LargeImageResource(Resource):
         self.resourceName = 'large_image'
         self.route('GET', ('cache', ), self.cacheInfo)
         self.route('PUT', ('cache', 'clear'), self.cacheClear)
+        self.route('GET', ('cache', 'stats'), self.cacheStats)
         self.route('POST', ('config', 'format'), self.configFormat)
         self.route('POST', ('config', 'validate'), self.configValidate)
         self.route('POST', ('config', 'replace'), self.configReplace)
@@ -288,6 +289,20 @@ class LargeImageResource(Resource):
     def cacheInfo(self, params):
         return cache_util.cachesInfo()
 
+    @describeRoute(
+        Description('Get hit, miss, and timing statistics for cached methods '
+                    'and tile sources in this process.')
+        .param('reset', 'If true, clear the statistics after reporting them.',
+               required=False, dataType='boolean', default=False),
+    )
+    @access.admin(scope=TokenScope.DATA_READ)
+    def cacheStats(self, params):
+        reset = str(params.get('reset', False)).lower() == 'true'
+        return {
+            'caches': cache_util.cachesInfo(),
+            'stats': cache_util.cachesStats(reset=reset),
+        }
+
     @describeRoute(
         Description('Get public settings for large image display.'),
     )
@@ -341,6 +341,11 @@ def testCaches(server, admin):
     assert utilities.respStatus(resp) == 200
     results = resp.json
     assert 'tilesource' in results
+    resp = server.request(path='/large_image/cache/stats', user=admin)
+    assert utilities.respStatus(resp) == 200
+    results = resp.json
+    assert 'tilesource' in results['caches']
+    assert 'stats' in results
     resp = server.request(path='/large_image/cache/clear', method='PUT', user=admin)
     assert utilities.respStatus(resp) == 200
     results = resp.json
@@ -15,15 +15,20 @@
 #############################################################################
 
 import atexit
+import contextlib
 from collections.abc import Callable
 from typing import Any
 
+from .base import cacheGetMany, cacheSetMany
 from .cache import (CacheProperties, LruCacheMetaclass, getTileCache,
-                    isTileCacheSetup, methodcache, strhash)
+                    isTileCacheSetup, methodcache, methodcacheKey, strhash)
 from .cachefactory import CacheFactory, pickAvailableCache
+from .diskcache import DiskCache, TieredCache, getOverviewStore, storeInBackground
+from .stats import cachesStats
 
 MemCache: Any
 RedisCache: Any
+SharedMemoryCache: Any
 try:
     from .memcache import MemCache
 except ImportError:
@@ -32,6 +37,10 @@ try:
     from .rediscache import RedisCache
 except ImportError:
     RedisCache = None
+try:
+    from .sharedmemcache import SharedMemoryCache
+except ImportError:
+    SharedMemoryCache = None
 
 _cacheClearFuncs: list[Callable] = []
 
@@ -53,6 +62,8 @@ def cachesClearExceptTile(*args, **kwargs) -> None:
 def cachesClear(*args, **kwargs) -> None:
     """
     Clear the tilesource caches, the load model cache, and the tile cache.
+    If the tile cache has a disk tier, that tier is not cleared; see
+    cachesPurge.
     """
     cachesClearExceptTile()
     if isTileCacheSetup():
@@ -67,44 +78,63 @@ def cachesClear(*args, **kwargs) -> None:
             pass
 
 
-def cachesInfo(*args, **kwargs) -> dict[str, dict[str, int]]:
+def cachesPurge(*args, **kwargs) -> None:
+    """
+    Clear all caches, including the disk tier of the tile cache.  cachesClear
+    leaves the disk tier intact so that tiles survive restarts and clearing
+    the memory caches.
+    """
+    cachesClear()
+    if isTileCacheSetup():
+        tileCache, _ = getTileCache()
+        if isinstance(tileCache, TieredCache):
+            tileCache.purge()
+
+
+def _cacheInfo(cache: Any, items: bool = False) -> dict[str, int]:
+    info = {
+        'maxsize': cache.maxsize,
+        'used': cache.currsize,
+    }
+    if items:
+        info['items'] = getattr(cache, 'curritems' if hasattr(
+            cache, 'curritems') else 'currsize', None)
+    if hasattr(cache, 'evictions'):
+        info['evictions'] = cache.evictions
+    return info
+
+
+def cachesInfo(*args, stats: bool = False, **kwargs) -> dict[str, dict[str, Any]]:
     """
     Report on each cache.
 
+    :param stats: if True, add a 'stats' entry with the hits, misses, and
+        fill times of each cached method and tile source class.  See
+        cachesStats.
     :returns: a dictionary with the cache names as the keys and values that
-        include 'maxsize' and 'used', if known.
+        include 'maxsize' and 'used', if known, and 'evictions' if the cache
+        counts them.
     """
-    info = {}
+    info: dict[str, dict[str, Any]] = {}
     for name in LruCacheMetaclass.namedCaches:
         with LruCacheMetaclass.namedCaches[name][1]:
-            cache = LruCacheMetaclass.namedCaches[name][0]
-            info[name] = {
-                'maxsize': cache.maxsize,
-                'used': cache.currsize,
-            }
+            info[name] = _cacheInfo(LruCacheMetaclass.namedCaches[name][0])
     if isTileCacheSetup():
         tileCache, tileLock = getTileCache()
         try:
-            if tileLock:
-                with tileLock:
-                    info['tileCache'] = {
-                        'maxsize': tileCache.maxsize,
-                        'used': tileCache.currsize,
-                        'items': getattr(tileCache, 'curritems' if hasattr(
-                            tileCache, 'curritems') else 'currsize', None),
-                    }
-            else:
-                info['tileCache'] = {
-                    'maxsize': tileCache.maxsize,
-                    'used': tileCache.currsize,
-                    'items': getattr(tileCache, 'curritems' if hasattr(
-                        tileCache, 'curritems') else 'currsize', None),
-                }
+            with tileLock if tileLock else contextlib.nullcontext():
+                info['tileCache'] = _cacheInfo(tileCache, True)
+                if isinstance(tileCache, TieredCache):
+                    info['tileDiskCache'] = _cacheInfo(tileCache.secondary, True)
         except Exception:
             pass
+    if stats:
+        info['stats'] = cachesStats()
     return info
 
 
 __all__ = ('CacheFactory', 'getTileCache', 'isTileCacheSetup', 'MemCache', 'RedisCache',
-           'strhash', 'LruCacheMetaclass', 'pickAvailableCache', 'methodcache',
-           'CacheProperties')
+           'SharedMemoryCache', 'DiskCache', 'TieredCache', 'strhash', 'LruCacheMetaclass',
+           'pickAvailableCache', 'methodcache', 'methodcacheKey', 'cacheGetMany',
+           'cacheSetMany', 'cachesStats', 'CacheProperties', 'getOverviewStore',
+           'storeInBackground')
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
+import contextlib
 import hashlib
+import pickle
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import Any, Optional, TypeVar
 
 import cachetools
@@ -66,6 +70,32 @@ class BaseCache(cachetools.Cache):
         # hashedKey = self._hashKey(key)
         raise NotImplementedError
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Get multiple values from the cache.  Backends that can fetch multiple
+        values in a single request should override this.
+
+        :param keys: the keys to get.
+        :returns: a dictionary of the keys that were found and their values.
+        """
+        results = {}
+        for key in keys:
+            with contextlib.suppress(
+                    KeyError, ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+                results[key] = self[key]
+        return results
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        """
+        Set multiple values in the cache.  Backends that can store multiple
+        values in a single request should override this.
+
+        :param mapping: a dictionary of keys and values to store.
+        """
+        for key, value in mapping.items():
+            with contextlib.suppress(ValueError, KeyError, RuntimeError):
+                self[key] = value
+
     @property
     def curritems(self) -> int:
         raise NotImplementedError
@@ -85,3 +115,48 @@ class BaseCache(cachetools.Cache):
     def getCache() -> tuple[Optional['BaseCache'], threading.Lock]:
         # return cache, cacheLock
         raise NotImplementedError
+
+
+def cacheGetMany(
+        cache: cachetools.Cache, keys: Iterable[str],
+        lock: threading.Lock | None = None) -> dict[str, Any]:
+    """
+    Get multiple values from a cache.  If the cache supports getting multiple
+    values at once, this is done in a single request.
+
+    :param cache: the cache to query.
+    :param keys: the keys to get.
+    :param lock: if not None, a lock to hold while accessing the cache.
+    :returns: a dictionary of the keys that were found and their values.
+    """
+    with lock if lock else contextlib.nullcontext():
+        if hasattr(cache, 'get_many'):
+            return cache.get_many(keys)
+        results = {}
+        for key in keys:
+            with contextlib.suppress(
+                    KeyError, ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+                results[key] = cache[key]
+        return results
+
+
+def cacheSetMany(
+        cache: cachetools.Cache, mapping: dict[str, Any],
+        lock: threading.Lock | None = None) -> None:
+    """
+    Set multiple values in a cache.  If the cache supports setting multiple
+    values at once, this is done in a single request.
+
+    :param cache: the cache to modify.
+    :param mapping: a dictionary of keys and values to store.
+    :param lock: if not None, a lock to hold while accessing the cache.
+    """
+    if not mapping:
+        return
+    with lock if lock else contextlib.nullcontext():
+        if hasattr(cache, 'set_many'):
+            cache.set_many(mapping)
+            return
+        for key, value in mapping.items():
+            with contextlib.suppress(ValueError, KeyError, RuntimeError):
+                cache[key] = value
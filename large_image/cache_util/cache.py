@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import functools
+import os
 import pickle
 import threading
+import time
 import uuid
 from collections.abc import Callable
 from typing import Any, TypeVar
@@ -20,6 +22,8 @@ import contextlib
 
 from .. import config
 from .cachefactory import CacheFactory, pickAvailableCache
+from .diskcache import TieredCache
+from .stats import recordCoalesced, recordHit, recordMiss
 
 P = ParamSpec('P')
 T = TypeVar('T')
@@ -29,6 +33,10 @@ _tileLock: threading.Lock | None = None
 
 _cacheLockKeyToken = '_cacheLock_key'
 
+# Values that methodcache is computing, keyed by cache key
+_methodcacheInflight: dict[str, dict[str, Any]] = {}
+_methodcacheInflightLock = threading.Lock()
+
 # If we have a resource module, ask to use as many file handles as the hard
 # limit allows, then calculate how may tile sources we can have open based on
 # the actual limit.
@@ -73,55 +81,127 @@ def strhash(*args, **kwargs) -> str:
     return repr(args)
 
 
+def _diskTierKey(instance: Any) -> str:
+    """
+    If an instance caches values in a tiered cache, get the modification time
+    and size of its file.  The disk tier outlives the process, so these are
+    part of the cache keys of the instance to avoid using values from a file
+    that has since been replaced.
+
+    :param instance: a tile source or other instance with a cache attribute.
+    :returns: a string to add to the class key of the instance.
+    """
+    if not isinstance(getattr(instance, 'cache', None), TieredCache):
+        return ''
+    try:
+        stat = os.stat(instance._getLargeImagePath())
+    except Exception:
+        return ''
+    return f' {stat.st_mtime_ns} {stat.st_size}'
+
+
+def methodcacheKey(self, key: Callable | None, *args, **kwargs) -> str:
+    """
+    Compute the cache key that the methodcache decorator uses for a call to a
+    method.  This can be used to access cached values for a method without
+    calling it.
+
+    :param self: the instance whose method is cached.
+    :param key: if a function, use that for the key, otherwise use
+        self.wrapKey.
+    :param args: the positional arguments of the method call, excluding self.
+    :param kwargs: the keyword arguments of the method call.
+    :returns: the cache key.
+    """
+    k = key(*args, **kwargs) if key else self.wrapKey(*args, **kwargs)
+    lock = getattr(self, 'cache_lock', None)
+    ck = getattr(self, '_classkey', None)
+    with lock if lock else contextlib.nullcontext():
+        if hasattr(self, '_classkeyLock'):
+            if self._classkeyLock.acquire(blocking=False):
+                self._classkeyLock.release()
+            else:
+                ck = getattr(self, '_unlocked_classkey', ck)
+    if ck:
+        k = ck + ' ' + k
+    return k
+
+
 def methodcache(key: Callable | None = None) -> Callable:  # noqa
     """
     Decorator to wrap a function with a memoizing callable that saves results
     in self.cache.  This is largely taken from cachetools, but uses a cache
     from self.cache rather than a passed value.  If self.cache_lock is
-    present and not none, a lock is used.
+    present and not none, a lock is used.  If multiple threads request the
+    same uncached value at the same time, only one computes it and the others
+    use its result or get its exception.
 
     :param key: if a function, use that for the key, otherwise use self.wrapKey.
     """
     def decorator(func: Callable[P, T]) -> Callable[..., T]:
         @functools.wraps(func)
         def wrapper(self, *args: P.args, **kwargs: P.kwargs) -> T:
-            k = key(*args, **kwargs) if key else self.wrapKey(*args, **kwargs)
+            k = methodcacheKey(self, key, *args, **kwargs)
             lock = getattr(self, 'cache_lock', None)
-            ck = getattr(self, '_classkey', None)
-            if lock:
-                with self.cache_lock:
-                    if hasattr(self, '_classkeyLock'):
-                        if self._classkeyLock.acquire(blocking=False):
-                            self._classkeyLock.release()
-                        else:
-                            ck = getattr(self, '_unlocked_classkey', ck)
-            if ck:
-                k = ck + ' ' + k
+            statName = type(self).__name__ + '.' + func.__name__
             try:
                 if lock:
                     with self.cache_lock:
-                        return self.cache[k]
+                        v = self.cache[k]
                 else:
-                    return self.cache[k]
+                    v = self.cache[k]
+                recordHit(statName)
+                return v
             except KeyError:
                 pass  # key not found
             except (ValueError, pickle.UnpicklingError, ModuleNotFoundError):
                 # this can happen if a different version of python wrote the record
                 pass
-            v = func(self, *args, **kwargs)
+            # Only one thread computes a value for a specific key at a time;
+            # other threads that want the same key wait for its result.
+            with _methodcacheInflightLock:
+                inflight = _methodcacheInflight.get(k)
+                if inflight is None:
+                    inflight = _methodcacheInflight[k] = {'lock': threading.RLock(), 'count': 0}
+                inflight['count'] += 1
             try:
-                if lock:
-                    with self.cache_lock:
-                        self.cache[k] = v
-                else:
-                    self.cache[k] = v
-            except ValueError:
-                pass  # value too large
-            except (KeyError, RuntimeError):
-                # the key was refused for some reason
-                config.getLogger().debug(
-                    'Had a cache KeyError while trying to store a value to key %r' % (k))
-            return v
+                with inflight['lock']:
+                    if 'error' in inflight:
+                        # Threads that were waiting for a value that failed
+                        # get the same error rather than each trying again.
+                        recordCoalesced(statName)
+                        raise inflight['error']
+                    if 'value' in inflight:
+                        recordCoalesced(statName)
+                        return inflight['value']
+                    starttime = time.perf_counter()
+                    try:
+                        v = func(self, *args, **kwargs)
+                    except Exception as exc:
+                        inflight['error'] = exc
+                        raise
+                    recordMiss(statName, time.perf_counter() - starttime, v)
+                    # Store the value before releasing the key, so there is
+                    # no time when it is in neither place.
+                    try:
+                        if lock:
+                            with self.cache_lock:
+                                self.cache[k] = v
+                        else:
+                            self.cache[k] = v
+                    except ValueError:
+                        pass  # value too large
+                    except (KeyError, RuntimeError):
+                        # the key was refused for some reason
+                        config.getLogger().debug(
+                            'Had a cache KeyError while trying to store a value to key %r' % (k))
+                    inflight['value'] = v
+                    return v
+            finally:
+                with _methodcacheInflightLock:
+                    inflight['count'] -= 1
+                    if not inflight['count']:
+                        _methodcacheInflight.pop(k, None)
         return wrapper
     return decorator
 
@@ -201,11 +281,13 @@ class LruCacheMetaclass(type):
         else:
             key = strhash(args[0], kwargs)
         key = cls.__name__ + ' ' + key
+        statName = cls.__name__ + '.__init__'
         with cacheLock:
             try:
                 result = cache[key]
                 if (not isinstance(result, tuple) or len(result) != 2 or
                         result[0] != _cacheLockKeyToken):
+                    recordHit(statName)
                     return result
                 cacheLockForKey = result[1]
             except KeyError:
@@ -220,9 +302,11 @@ class LruCacheMetaclass(type):
                     result = cache[key]
                     if (not isinstance(result, tuple) or len(result) != 2 or
                             result[0] != _cacheLockKeyToken):
+                        recordHit(statName)
                         return result
                 except KeyError:
                     pass
+            starttime = time.perf_counter()
             try:
                 # This conditionally copies a non-styled class and adds a style.
                 if (kwargs.get('style') and hasattr(cls, '_setStyle') and
@@ -234,13 +318,14 @@ class LruCacheMetaclass(type):
                     with subresult._sourceLock:
                         result.__dict__ = subresult.__dict__.copy()
                         result._sourceLock = threading.RLock()
-                    result._classkey = key
+                    result._classkey = key + _diskTierKey(result)
                     # for pickling
                     result._initValues = (args, kwargs.copy())
                     result._unstyledInstance = subresult
                     result._derivedSource = True
                     # Has to be after setting the _unstyledInstance
                     result._setStyle(kwargs['style'])
+                    recordMiss(statName, time.perf_counter() - starttime)
                     with cacheLock:
                         cache[key] = result
                         return result
@@ -251,12 +336,13 @@ class LruCacheMetaclass(type):
                 with cacheLock, contextlib.suppress(Exception):
                     del cache[key]
                 raise exc
-            instance._classkey = key
+            instance._classkey = key + _diskTierKey(instance)
             if kwargs.get('style') != getattr(cls, '_unstyledStyle', None):
                 subkwargs = kwargs.copy()
                 subkwargs['style'] = getattr(cls, '_unstyledStyle', None)
                 instance._unstyledInstance = subresult = cls(*args, **subkwargs)
                 instance._derivedSource = True
+            recordMiss(statName, time.perf_counter() - starttime)
             with cacheLock:
                 cache[key] = instance
         return instance
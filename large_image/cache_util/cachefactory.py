@@ -9,12 +9,61 @@ import cachetools
 
 from .. import config
 from ..exceptions import TileCacheError
+from .diskcache import DiskCache, TieredCache
 from .memcache import MemCache
 from .rediscache import RedisCache
+from .sharedmemcache import SharedMemoryCache
+from .stats import valueSize
 
 # DO NOT MANUALLY ADD ANYTHING TO `_availableCaches`
 #  use entrypoints and let loadCaches fill in `_availableCaches`
 _availableCaches: dict[str, type[cachetools.Cache]] = {}
+_explicitOnlyCaches = {'sharedmemory'}
+
+
+class LRUCache(cachetools.LRUCache):
+    """A cachetools LRUCache that counts how many items it has evicted."""
+
+    evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class ByteSizeLRUCache(LRUCache):
+    """
+    An LRU cache whose size is the total number of bytes of its values rather
+    than the number of values.  Values whose size cannot be determined are
+    counted as a fixed default size.
+    """
+
+    def __init__(
+            self, maxsize: int, maxitems: int | None = None,
+            defaultItemSize: int = 256**2 * 4 * 2) -> None:
+        """
+        :param maxsize: the maximum total size of the values in bytes.
+        :param maxitems: if not None, also limit the number of values.
+        :param defaultItemSize: the size to use for values whose size cannot
+            be determined.
+        """
+        self.maxitems = maxitems
+        self.defaultItemSize = defaultItemSize
+        super().__init__(maxsize, getsizeof=self._valueSize)
+
+    def _valueSize(self, value) -> int:
+        size = valueSize(value)
+        return size if size is not None else self.defaultItemSize
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        while self.maxitems and len(self) > self.maxitems:
+            self.popitem()
+
+    @property
+    def curritems(self) -> int:
+        return len(self)
 
 
 def loadCaches(
@@ -46,6 +95,8 @@ def loadCaches(
         _availableCaches['memcached'] = MemCache
     if RedisCache is not None:
         _availableCaches['redis'] = RedisCache
+    if SharedMemoryCache is not None:
+        _availableCaches['sharedmemory'] = SharedMemoryCache
     # NOTE: `python` cache is viewed as a fallback and isn't listed in `availableCaches`
 
 
@@ -87,6 +138,10 @@ def getFirstAvailableCache() -> tuple[cachetools.Cache | None, threading.Lock |
     loadCaches()
     cache, cacheLock = None, None
     for cacheBackend in _availableCaches:
+        # The shared memory cache persists after processes exit, so it is
+        # only used when explicitly requested
+        if cacheBackend in _explicitOnlyCaches:
+            continue
         try:
             cache, cacheLock = cast(
                 tuple[cachetools.Cache, Optional[threading.Lock]],
@@ -105,25 +160,47 @@ def getFirstAvailableCache() -> tuple[cachetools.Cache | None, threading.Lock |
 class CacheFactory:
     logged = False
 
-    def getCacheSize(self, numItems: int | None, cacheName: str | None = None) -> int:
-        if numItems is None:
-            defaultPortion = 32
-            try:
-                portion = int(config.getConfig('cache_python_memory_portion', 0))
-                if cacheName:
-                    portion = max(portion, int(config.getConfig(
-                        f'cache_{cacheName}_memory_portion', portion)))
-                portion = max(portion or defaultPortion, 3)
-            except ValueError:
-                portion = defaultPortion
-            numItems = pickAvailableCache(256**2 * 4 * 2, portion)
+    def getCachePortion(self, cacheName: str | None = None) -> int:
+        """
+        Get the inverse fraction of memory that a python cache may use.
+
+        :param cacheName: if specified, the portion can be affected by the
+            configuration.
+        :returns: the portion.
+        """
+        defaultPortion = 32
+        try:
+            portion = int(config.getConfig('cache_python_memory_portion', 0))
+            if cacheName:
+                portion = max(portion, int(config.getConfig(
+                    f'cache_{cacheName}_memory_portion', portion)))
+            portion = max(portion or defaultPortion, 3)
+        except ValueError:
+            portion = defaultPortion
+        return portion
+
+    def getCacheMaxItems(self, cacheName: str | None = None) -> int | None:
+        """
+        Get the configured maximum number of items in a python cache.
+
+        :param cacheName: the name of the cache.
+        :returns: the maximum number of items or None for no limit.
+        """
         if cacheName:
             try:
                 maxItems = int(config.getConfig(f'cache_{cacheName}_maximum', 0))
                 if maxItems > 0:
-                    numItems = min(numItems, max(maxItems, 3))
+                    return max(maxItems, 3)
             except ValueError:
                 pass
+        return None
+
+    def getCacheSize(self, numItems: int | None, cacheName: str | None = None) -> int:
+        if numItems is None:
+            numItems = pickAvailableCache(256**2 * 4 * 2, self.getCachePortion(cacheName))
+        maxItems = self.getCacheMaxItems(cacheName)
+        if maxItems:
+            numItems = min(numItems, maxItems)
         return numItems
 
     def getCache(
@@ -146,9 +223,26 @@ class CacheFactory:
 
         if cache is None:  # fallback backend or inProcess
             cacheBackend = 'python'
-            cache = cachetools.LRUCache(self.getCacheSize(numItems, cacheName=cacheName))
+            if (numItems is None and not inProcess and
+                    config.getConfig('cache_python_size_mode') == 'bytes'):
+                # Tiles vary greatly in size, so optionally limit the cache by
+                # the total size of the tiles rather than by their number.
+                cache = ByteSizeLRUCache(
+                    max(config.total_memory() // self.getCachePortion(cacheName),
+                        256**2 * 4 * 2),
+                    maxitems=self.getCacheMaxItems(cacheName))
+            else:
+                cache = LRUCache(self.getCacheSize(numItems, cacheName=cacheName))
             cacheLock = threading.Lock()
 
+        if not inProcess:
+            diskCache, _ = DiskCache.getCache()
+            if diskCache is not None:
+                # The tiered cache locks its memory tier itself so that disk
+                # access doesn't block other threads' cache lookups.
+                cache = TieredCache(cache, diskCache, lock=cacheLock)
+                cacheLock = None
+
         if not inProcess and not CacheFactory.logged:
             config.getLogger('logprint').debug(f'Using {cacheBackend} for large_image caching')
             CacheFactory.logged = True
@@ -0,0 +1,504 @@
+#############################################################################
+#  Copyright Kitware Inc.
+#
+#  Licensed under the Apache License, Version 2.0 ( the "License" );
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#############################################################################
+
+import concurrent.futures
+import contextlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Optional, TypeVar
+
+import cachetools
+
+from .. import config
+from .base import BaseCache, cacheGetMany, cacheSetMany
+
+_VT = TypeVar('_VT')
+
+# Overview stores by path and maximum size, and a thread used to write to them
+_overviewStores: dict[tuple[str, int], 'DiskCache'] = {}
+_overviewStoreLock = threading.Lock()
+_overviewWriter: concurrent.futures.ThreadPoolExecutor | None = None
+
+_schema = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    size INTEGER NOT NULL,
+    items INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, size, items) VALUES (0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET size = size + NEW.size, items = items + 1 WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET size = size - OLD.size, items = items - 1 WHERE id = 0;
+END;
+"""
+
+
+class DiskCache(BaseCache):
+    """
+    Use a sqlite database on a local disk as the backing cache.  This persists
+    when processes are restarted and can be shared by processes on the same
+    machine.  Items are evicted in least-recently-used order when the total
+    size of the stored values exceeds the maximum size.
+    """
+
+    # Only update the last used time of an item when it is older than this
+    # many seconds to reduce writes.
+    usedResolution = 10
+    # When evicting, reduce the stored size to this fraction of the maximum.
+    evictFraction = 0.9
+
+    def __init__(
+            self, path: str, maxSize: int = 10 * 1024 ** 3,
+            getsizeof: Callable[[_VT], float] | None = None) -> None:
+        """
+        Open or create a disk cache.
+
+        :param path: the directory where the cache is stored.
+        :param maxSize: the maximum total size in bytes of cached values.
+        """
+        super().__init__(0, getsizeof=getsizeof)
+        os.makedirs(path, exist_ok=True)
+        self._path = os.path.join(path, 'large_image_cache.sqlite')
+        self._maxSize = int(maxSize)
+        self._local = threading.local()
+        # Evictions by this process
+        self.evictions = 0
+        self._connection().executescript(_schema)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get a database connection for the current thread and process.
+
+        :returns: a sqlite3 connection.
+        """
+        if getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=60, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    def __repr__(self) -> str:
+        return f'DiskCache {self._path!r}'
+
+    def __iter__(self):
+        # return invalid iter
+        return None
+
+    def __len__(self) -> int:
+        return self.curritems
+
+    def __contains__(self, key) -> bool:
+        row = self._connection().execute(
+            'SELECT 1 FROM entries WHERE key = ?', (self._hashKey(key), )).fetchone()
+        return row is not None
+
+    def __delitem__(self, key: str) -> None:
+        cursor = self._connection().execute(
+            'DELETE FROM entries WHERE key = ?', (self._hashKey(key), ))
+        if not cursor.rowcount:
+            raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        hashedKey = self._hashKey(key)
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT value, used FROM entries WHERE key = ?', (hashedKey, )).fetchone()
+            if row is None:
+                return self.__missing__(key)
+            now = time.time()
+            if now - row[1] > self.usedResolution:
+                conn.execute('UPDATE entries SET used = ? WHERE key = ?', (now, hashedKey))
+        except sqlite3.Error:
+            self.logError(sqlite3.Error, config.getLogger('logprint').exception,
+                          'Disk cache sqlite error')
+            return self.__missing__(key)
+        return pickle.loads(row[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        hashedKeys = {self._hashKey(key): key for key in keys}
+        hashedList = list(hashedKeys)
+        results = {}
+        now = time.time()
+        try:
+            conn = self._connection()
+            stale = []
+            # Stay under sqlite's limit on the number of parameters
+            for start in range(0, len(hashedList), 500):
+                chunk = hashedList[start:start + 500]
+                for hashedKey, value, used in conn.execute(
+                        'SELECT key, value, used FROM entries WHERE key IN (%s)' % (
+                            ','.join('?' * len(chunk))), chunk):
+                    with contextlib.suppress(
+                            ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+                        results[hashedKeys[hashedKey]] = pickle.loads(value)
+                    if now - used > self.usedResolution:
+                        stale.append((now, hashedKey))
+            if stale:
+                conn.executemany('UPDATE entries SET used = ? WHERE key = ?', stale)
+        except sqlite3.Error:
+            self.logError(sqlite3.Error, config.getLogger('logprint').exception,
+                          'Disk cache sqlite error')
+        return results
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        records = []
+        now = time.time()
+        for key, value in mapping.items():
+            try:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except (TypeError, pickle.PicklingError, AttributeError) as exc:
+                self.logError(
+                    exc.__class__, config.getLogger('logprint').error,
+                    '%s: Failed to save value with key %s' % (exc.__class__.__name__, key))
+                continue
+            if len(data) <= self._maxSize * (1 - self.evictFraction):
+                records.append((self._hashKey(key), data, len(data), now))
+        if not records:
+            return
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Deleting first keeps the totals accurate via the triggers
+                conn.executemany(
+                    'DELETE FROM entries WHERE key = ?', [(record[0], ) for record in records])
+                conn.executemany(
+                    'INSERT INTO entries (key, value, size, used) '
+                    'VALUES (?, ?, ?, ?)', records)
+                self._evict(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error:
+            self.logError(sqlite3.Error, config.getLogger('logprint').exception,
+                          'Disk cache sqlite error')
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        If the total size of the cache exceeds the maximum, remove the least
+        recently used items.  This must be called within a transaction.
+
+        :param conn: the database connection.
+        """
+        size = conn.execute('SELECT size FROM totals WHERE id = 0').fetchone()[0]
+        if size <= self._maxSize:
+            return
+        target = size - self._maxSize * self.evictFraction
+        freed = 0
+        keys = []
+        for key, itemSize in conn.execute('SELECT key, size FROM entries ORDER BY used'):
+            keys.append((key, ))
+            freed += itemSize
+            if freed >= target:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', keys)
+        self.evictions += len(keys)
+
+    def _getTotal(self, column: str) -> int:
+        try:
+            return int(self._connection().execute(
+                f'SELECT {column} FROM totals WHERE id = 0').fetchone()[0])
+        except sqlite3.Error:
+            return 0
+
+    @property
+    def curritems(self) -> int:
+        return self._getTotal('items')
+
+    @property
+    def currsize(self) -> int:
+        return self._getTotal('size')
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxSize
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM entries')
+
+    @staticmethod
+    def getCache() -> tuple[Optional['DiskCache'], threading.Lock]:
+        cacheLock = threading.Lock()
+
+        path = config.getConfig('cache_disk_path')
+        try:
+            maxSize = int(config.getConfig('cache_disk_size') or 0)
+        except ValueError:
+            maxSize = 0
+        cache = None
+        if path and maxSize > 0:
+            try:
+                cache = DiskCache(path, maxSize)
+            except Exception:
+                config.getLogger().info('Cannot use a disk cache.')
+        return cache, cacheLock
+
+
+def getOverviewStore() -> DiskCache | None:
+    """
+    Get the store used to persist tiles that are composited for levels that
+    are missing from an image.  This is a disk cache separate from the tile
+    cache, so these tiles are only computed once, even across processes and
+    restarts.
+
+    :returns: a DiskCache or None if the overview_store_path config value is
+        not set.
+    """
+    path = config.getConfig('overview_store_path')
+    try:
+        maxSize = int(config.getConfig('overview_store_size') or 0)
+    except ValueError:
+        maxSize = 0
+    if not path or maxSize <= 0:
+        return None
+    with _overviewStoreLock:
+        if (path, maxSize) not in _overviewStores:
+            try:
+                _overviewStores[(path, maxSize)] = DiskCache(path, maxSize)
+            except Exception:
+                config.getLogger().info('Cannot use an overview store.')
+                return None
+        return _overviewStores[(path, maxSize)]
+
+
+def storeInBackground(cache: cachetools.Cache, key: str, value: Any) -> concurrent.futures.Future:
+    """
+    Add a value to a cache in a background thread, so slow stores don't delay
+    the caller.
+
+    :param cache: the cache, such as an overview store.
+    :param key: the key to store.
+    :param value: the value to store.
+    :returns: a future that is done when the value has been stored.
+    """
+    global _overviewWriter
+
+    with _overviewStoreLock:
+        if _overviewWriter is None:
+            _overviewWriter = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='large_image_overview')
+        return _overviewWriter.submit(cacheSetMany, cache, {key: value})
+
+
+class TieredCache(BaseCache):
+    """
+    Combine a fast cache with a slower, larger cache.  Values are stored in
+    both caches.  Values that are only found in the slower cache are added to
+    the fast cache when they are retrieved.
+
+    This cache does its own locking so that the slower cache is never accessed
+    while holding the lock of the fast cache.  Values are written to the
+    slower cache in batches by a background thread.  Clearing this cache only
+    clears the fast cache; use purge to also remove the values in the slower
+    cache.  If too many values are waiting to be written, new values are
+    written by the calling thread instead.
+    """
+
+    def __init__(
+            self, primary: cachetools.Cache, secondary: cachetools.Cache,
+            getsizeof: Callable[[_VT], float] | None = None,
+            lock: Optional[threading.Lock] = None, maxPending: int = 256) -> None:
+        """
+        :param primary: the fast cache, such as an in-memory cache.
+        :param secondary: the slower cache, such as a DiskCache.
+        :param lock: a lock to hold while accessing the fast cache.  If None,
+            a new lock is used.
+        :param maxPending: the maximum number of values waiting to be written
+            to the slower cache in the background.
+        """
+        super().__init__(0, getsizeof=getsizeof)
+        self.primary = primary
+        self.secondary = secondary
+        self._lock = lock or threading.Lock()
+        # Values waiting to be written to the slower cache
+        self._pending: dict[str, Any] = {}
+        self._pendingLock = threading.Lock()
+        self._maxPending = maxPending
+        self._writer: concurrent.futures.ThreadPoolExecutor | None = None
+        self._writerPid: int | None = None
+        self._writeScheduled = False
+
+    def __repr__(self) -> str:
+        return f'TieredCache {self.primary!r}, {self.secondary!r}'
+
+    def __iter__(self):
+        # return invalid iter
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.primary)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            if key in self.primary:
+                return True
+        with self._pendingLock:
+            if key in self._pending:
+                return True
+        return key in self.secondary
+
+    def __delitem__(self, key: str) -> None:
+        found = False
+        with self._lock, contextlib.suppress(KeyError):
+            del self.primary[key]
+            found = True
+        with self._pendingLock:
+            if key in self._pending:
+                del self._pending[key]
+                found = True
+        with contextlib.suppress(KeyError):
+            del self.secondary[key]
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock, contextlib.suppress(KeyError):
+            return self.primary[key]
+        with self._pendingLock:
+            if key in self._pending:
+                return self._pending[key]
+        value = self.secondary[key]
+        with self._lock, contextlib.suppress(ValueError, KeyError, RuntimeError):
+            self.primary[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        try:
+            with self._lock:
+                self.primary[key] = value
+        finally:
+            self._queueWrite({key: value})
+
+    def _queueWrite(self, mapping: dict[str, Any]) -> None:
+        """
+        Add values to the slower cache in a background thread.  Values that
+        are added while a write is in progress are written together in the
+        next batch.  If this would exceed the maximum number of pending
+        values, the values are written before returning, so a slow disk slows
+        the callers rather than growing memory use.
+
+        :param mapping: a dictionary of keys and values to store.
+        """
+        with self._pendingLock:
+            if len(self._pending) + len(mapping) > self._maxPending:
+                # Older values of these keys mustn't be written afterwards
+                for key in mapping:
+                    self._pending.pop(key, None)
+                inline = True
+            else:
+                self._pending.update(mapping)
+                inline = False
+                # Threads don't survive forking, so a child process needs its
+                # own
+                if self._writerPid != os.getpid():
+                    self._writer = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix='large_image_tiered')
+                    self._writerPid = os.getpid()
+                    self._writeScheduled = False
+                if not self._writeScheduled:
+                    self._writeScheduled = True
+                    self._writer.submit(self.flush)
+        if inline:
+            cacheSetMany(self.secondary, mapping)
+
+    def flush(self) -> None:
+        """
+        Write all values that are waiting to be added to the slower cache.
+        """
+        with self._pendingLock:
+            pending = self._pending
+            self._pending = {}
+            self._writeScheduled = False
+        if pending:
+            cacheSetMany(self.secondary, pending)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        results = cacheGetMany(self.primary, keys, self._lock)
+        missing = [key for key in keys if key not in results]
+        if missing:
+            with self._pendingLock:
+                results.update({key: self._pending[key] for key in missing
+                                if key in self._pending})
+            missing = [key for key in missing if key not in results]
+        if missing:
+            found = cacheGetMany(self.secondary, missing)
+            cacheSetMany(self.primary, found, self._lock)
+            results.update(found)
+        return results
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        try:
+            cacheSetMany(self.primary, mapping, self._lock)
+        finally:
+            self._queueWrite(mapping)
+
+    @property
+    def curritems(self) -> int:
+        return getattr(self.primary, 'curritems', self.primary.currsize)
+
+    @property
+    def currsize(self) -> int:
+        return self.primary.currsize
+
+    @property
+    def evictions(self) -> int:
+        return getattr(self.primary, 'evictions', 0)
+
+    @property
+    def maxsize(self) -> int:
+        return self.primary.maxsize
+
+    def clear(self) -> None:
+        """
+        Clear the fast cache.  Values in the slower cache are kept so that
+        they are available after the fast cache is cleared or the process is
+        restarted.
+        """
+        with self._lock:
+            self.primary.clear()
+
+    def purge(self) -> None:
+        """
+        Clear both the fast and the slower cache, including any values that
+        are waiting to be written.
+        """
+        with self._pendingLock:
+            self._pending = {}
+        self.clear()
+        self.secondary.clear()
@@ -15,9 +15,10 @@
 #############################################################################
 
 import copy
+import pickle
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from typing import Any, Optional, TypeVar
 
 from .. import config
@@ -125,6 +126,40 @@ class MemCache(BaseCache):
                 self.logError(self.pylibmc.Error, config.getLogger('logprint').exception,
                               'pylibmc exception')
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        hashedKeys = {self._hashKey(key): key for key in keys}
+        try:
+            found = self._client.get_multi(list(hashedKeys))
+        except self.pylibmc.ServerDown:
+            self.logError(self.pylibmc.ServerDown, config.getLogger('logprint').info,
+                          'Memcached ServerDown')
+            self._reconnect()
+            return {}
+        except self.pylibmc.Error:
+            self.logError(self.pylibmc.Error, config.getLogger('logprint').exception,
+                          'pylibmc exception')
+            return {}
+        except (ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+            # A value couldn't be decoded; fetch values individually
+            return super().get_many(hashedKeys.values())
+        return {hashedKeys[hashedKey]: value for hashedKey, value in found.items()}
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        try:
+            failed = self._client.set_multi(
+                {self._hashKey(key): value for key, value in mapping.items()})
+        except self.pylibmc.ServerDown:
+            self.logError(self.pylibmc.ServerDown, config.getLogger('logprint').info,
+                          'Memcached ServerDown')
+            self._reconnect()
+            return
+        except (TypeError, KeyError, self.pylibmc.Error):
+            # Store values individually so that errors are handled per value
+            super().set_many(mapping)
+            return
+        if failed:
+            config.getLogger().debug('Memcached failed to store %d values' % len(failed))
+
     @property
     def curritems(self) -> int:
         return self._getStat('curr_items')
@@ -137,6 +172,10 @@ class MemCache(BaseCache):
     def maxsize(self) -> int:
         return self._getStat('limit_maxbytes')
 
+    @property
+    def evictions(self) -> int:
+        return self._getStat('evictions')
+
     def _reconnect(self) -> None:
         try:
             self._lastReconnectBackoff = getattr(self, '_lastReconnectBackoff', 2)
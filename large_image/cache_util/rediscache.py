@@ -14,6 +14,7 @@
 #  limitations under the License.
 #############################################################################
 
+import contextlib
 import pickle
 import threading
 import time
@@ -126,6 +127,50 @@ class RedisCache(BaseCache):
             self.logError(self.redis.RedisError, config.getLogger('logprint').info,
                           'redis ConnectionError')
 
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        try:
+            values = self._client.mget([
+                self._cache_key_prefix + self._hashKey(key) for key in keys])
+        except self.redis.ConnectionError:
+            self.logError(self.redis.ConnectionError, config.getLogger('logprint').info,
+                          'redis ConnectionError')
+            self._reconnect()
+            return {}
+        except self.redis.RedisError:
+            self.logError(self.redis.RedisError, config.getLogger('logprint').exception,
+                          'redis RedisError')
+            return {}
+        results = {}
+        for key, value in zip(keys, cast(list, values), strict=True):
+            if value is not None:
+                with contextlib.suppress(
+                        ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+                    results[key] = pickle.loads(value)
+        return results
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            try:
+                data = pickle.dumps(value)
+            except (TypeError, pickle.PicklingError, AttributeError) as exc:
+                self.logError(
+                    exc.__class__, config.getLogger('logprint').error,
+                    '%s: Failed to save value with key %s' % (exc.__class__.__name__, key))
+                continue
+            pipeline.set(
+                self._cache_key_prefix + self._hashKey(key), data, ex=self.expiry_ttl)
+        try:
+            pipeline.execute()
+        except self.redis.ConnectionError:
+            self.logError(self.redis.ConnectionError, config.getLogger('logprint').info,
+                          'redis ConnectionError')
+            self._reconnect()
+        except self.redis.RedisError:
+            self.logError(self.redis.RedisError, config.getLogger('logprint').info,
+                          'redis RedisError')
+
     @property
     def curritems(self) -> int:
         return self._client.dbsize()
@@ -141,6 +186,10 @@ class RedisCache(BaseCache):
             return maxmemory
         return self._getStat('total_system_memory')
 
+    @property
+    def evictions(self) -> int:
+        return self._getStat('evicted_keys')
+
     def _reconnect(self) -> None:
         try:
             self._lastReconnectBackoff = getattr(self, '_lastReconnectBackoff', 2)
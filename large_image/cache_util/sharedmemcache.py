@@ -0,0 +1,365 @@
+#############################################################################
+#  Copyright Kitware Inc.
+#
+#  Licensed under the Apache License, Version 2.0 ( the "License" );
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#############################################################################
+
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Optional, TypeVar
+
+import numpy as np
+
+from .. import config
+from .base import BaseCache
+
+_VT = TypeVar('_VT')
+
+# The shared memory segment starts with a header, followed by an index with one
+# record per possible item, followed by the data area.
+_headerMagic = 0x4C4943414348450A  # 'LICACHE\n'
+_headerFields = ('magic', 'slots', 'datasize', 'clock')
+_headerSize = 64
+_indexDtype = np.dtype([
+    ('key', '<u8'), ('check', '<u8'), ('offset', '<u8'), ('length', '<u8'), ('used', '<u8'),
+])
+
+
+class SharedMemoryCache(BaseCache):
+    """
+    Use a shared memory segment as the backing cache.  All processes on the
+    same machine that use the same name share the cache.  Items are evicted in
+    least-recently-used order when space is needed.
+    """
+
+    def __init__(
+            self, name: str = 'large_image_cache', size: int = 256 * 1024 ** 2,
+            itemSize: int = 32 * 1024,
+            getsizeof: Callable[[_VT], float] | None = None) -> None:
+        """
+        Attach to a shared memory cache, creating it if it does not exist.
+
+        :param name: the name of the shared memory segment.  A lock file with
+            a related name is created in the temp directory.
+        :param size: the size in bytes of the shared memory segment if it is
+            created.  If the segment already exists, its size is used.
+        :param itemSize: the expected average size of an item.  This
+            determines how many items can be stored.
+        """
+        import fcntl
+        from multiprocessing import shared_memory
+
+        self.fcntl = fcntl
+        super().__init__(0, getsizeof=getsizeof)
+        self._name = name
+        self._lockPath = os.path.join(tempfile.gettempdir(), f'{name}.lock')
+        self._threadLock = threading.RLock()
+        self._lockFile: Any = None
+        self._lockPid: int | None = None
+        # Evictions by this process
+        self.evictions = 0
+        slots = max(1024, size // itemSize)
+        minSize = _headerSize + slots * _indexDtype.itemsize + itemSize
+        size = max(size, minSize)
+        with self._lock(initializing=True):
+            try:
+                self._shm = self._openSharedMemory(shared_memory, create=True, size=size)
+            except FileExistsError:
+                self._shm = self._openSharedMemory(shared_memory, create=False)
+            self._header = np.ndarray(
+                (len(_headerFields), ), dtype='<u8', buffer=self._shm.buf)
+            if self._header[0] != _headerMagic:
+                self._header[:] = (_headerMagic, slots, size - _headerSize - slots *
+                                   _indexDtype.itemsize, 0)
+                self._index = self._mapIndex()
+                self._index[:] = 0
+            else:
+                self._index = self._mapIndex()
+
+    def _openSharedMemory(self, shared_memory: Any, **kwargs) -> Any:
+        """
+        Open a shared memory segment that is not removed when this process
+        exits.
+
+        :param shared_memory: the multiprocessing.shared_memory module.
+        :param kwargs: parameters to pass to SharedMemory.
+        :returns: a SharedMemory instance.
+        """
+        try:
+            return shared_memory.SharedMemory(self._name, track=False, **kwargs)
+        except TypeError:
+            pass
+        # Before Python 3.13, the resource tracker removes the segment when
+        # the process that opened it exits, even if other processes use it.
+        from multiprocessing import resource_tracker
+
+        shm = shared_memory.SharedMemory(self._name, **kwargs)
+        with contextlib.suppress(Exception):
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return shm
+
+    def _mapIndex(self) -> np.ndarray:
+        slots = int(self._header[1])
+        return np.ndarray(
+            (slots, ), dtype=_indexDtype, buffer=self._shm.buf, offset=_headerSize)
+
+    @property
+    def _dataOffset(self) -> int:
+        return _headerSize + int(self._header[1]) * _indexDtype.itemsize
+
+    @contextlib.contextmanager
+    def _lock(self, initializing: bool = False) -> Iterator[None]:
+        """
+        Lock the cache against access from other threads and processes.  The
+        lock file is reopened after a fork, since file locks are shared by
+        file descriptors that are inherited.
+        """
+        with self._threadLock:
+            if self._lockPid != os.getpid():
+                self._lockFile = open(self._lockPath, 'a+b')  # noqa: SIM115
+                self._lockPid = os.getpid()
+            self.fcntl.flock(self._lockFile, self.fcntl.LOCK_EX)
+            try:
+                if not initializing and self._header[0] != _headerMagic:
+                    msg = 'Shared memory cache is not initialized'
+                    raise RuntimeError(msg)
+                yield
+            finally:
+                self.fcntl.flock(self._lockFile, self.fcntl.LOCK_UN)
+
+    def _keyValues(self, key: str) -> tuple[int, int]:
+        digest = hashlib.sha256(key.encode()).digest()
+        return (int.from_bytes(digest[:8], 'little') or 1,
+                int.from_bytes(digest[8:16], 'little'))
+
+    def _find(self, key: str) -> int | None:
+        """
+        Find the index record for a key.  This must be called while locked.
+
+        :param key: the key to find.
+        :returns: the index of the record or None if not found.
+        """
+        keyval, check = self._keyValues(key)
+        for idx in np.flatnonzero(self._index['key'] == keyval):
+            if self._index['check'][idx] == check and self._index['length'][idx]:
+                return int(idx)
+        return None
+
+    def _touch(self, idx: int) -> None:
+        self._header[3] += 1
+        self._index['used'][idx] = self._header[3]
+
+    def _findSpace(self, length: int) -> int | None:
+        """
+        Find an offset in the data area where a value of a specific length can
+        be stored.  This must be called while locked.
+
+        :param length: the length of the value.
+        :returns: an offset relative to the data area or None.
+        """
+        live = np.flatnonzero(self._index['length'])
+        starts = self._index['offset'][live]
+        order = np.argsort(starts)
+        starts = starts[order].astype(np.int64)
+        ends = starts + self._index['length'][live][order].astype(np.int64)
+        gapStarts = np.concatenate(([0], ends))
+        gapEnds = np.concatenate((starts, [int(self._header[2])]))
+        fits = np.flatnonzero(gapEnds - gapStarts >= length)
+        if not len(fits):
+            return None
+        return int(gapStarts[fits[0]])
+
+    def _evict(self, length: int) -> int | None:
+        """
+        Evict least recently used items until a value of a specific length can
+        be stored.  This must be called while locked.
+
+        :param length: the length of the value.
+        :returns: an offset relative to the data area or None.
+        """
+        offset = self._findSpace(length)
+        while offset is None:
+            live = np.flatnonzero(self._index['length'])
+            if not len(live):
+                return None
+            oldest = live[np.argsort(self._index['used'][live])]
+            # Evict at least enough items to free the needed space
+            count = int(np.searchsorted(
+                np.cumsum(self._index['length'][oldest]), length)) + 1
+            self._index[oldest[:count]] = 0
+            self.evictions += count
+            offset = self._findSpace(length)
+        return offset
+
+    def __repr__(self) -> str:
+        return f'SharedMemoryCache {self._name!r}'
+
+    def __iter__(self):
+        # return invalid iter
+        return None
+
+    def __len__(self) -> int:
+        return self.curritems
+
+    def __contains__(self, key) -> bool:
+        with self._lock():
+            return self._find(key) is not None
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock():
+            idx = self._find(key)
+            if idx is None:
+                raise KeyError(key)
+            self._index[idx] = 0
+
+    def _read(self, key: str) -> bytes | None:
+        """
+        Read the pickled data for a key.  This must be called while locked.
+
+        :param key: the key to read.
+        :returns: the pickled data or None if the key is not in the cache.
+        """
+        idx = self._find(key)
+        if idx is None:
+            return None
+        self._touch(idx)
+        start = self._dataOffset + int(self._index['offset'][idx])
+        return bytes(self._shm.buf[start:start + int(self._index['length'][idx])])
+
+    def _pickle(self, key: str, value: Any) -> bytes | None:
+        try:
+            return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (TypeError, pickle.PicklingError, AttributeError) as exc:
+            self.logError(
+                exc.__class__, config.getLogger('logprint').error,
+                '%s: Failed to save value with key %s' % (exc.__class__.__name__, key))
+        return None
+
+    def _store(self, key: str, data: bytes) -> None:
+        """
+        Store pickled data for a key.  This must be called while locked.
+
+        :param key: the key to store.
+        :param data: the pickled data.
+        """
+        # Don't let a single value take more than a quarter of the cache
+        if len(data) > int(self._header[2]) // 4:
+            return
+        keyval, check = self._keyValues(key)
+        idx = self._find(key)
+        if idx is not None:
+            self._index[idx] = 0
+        offset = self._evict(len(data))
+        empty = np.flatnonzero(self._index['length'] == 0)
+        if not len(empty):
+            live = np.flatnonzero(self._index['length'])
+            empty = live[np.argsort(self._index['used'][live])[:1]]
+            self._index[empty[0]] = 0
+            self.evictions += 1
+            offset = self._evict(len(data))
+        if offset is None:
+            return
+        idx = int(empty[0])
+        start = self._dataOffset + offset
+        self._shm.buf[start:start + len(data)] = data
+        self._index[idx] = (keyval, check, offset, len(data), 0)
+        self._touch(idx)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock():
+            data = self._read(key)
+        if data is None:
+            return self.__missing__(key)
+        return pickle.loads(data)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        data = self._pickle(key, value)
+        if data is not None:
+            with self._lock():
+                self._store(key, data)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        with self._lock():
+            found = {key: self._read(key) for key in keys}
+        results = {}
+        for key, data in found.items():
+            if data is not None:
+                with contextlib.suppress(
+                        ValueError, pickle.UnpicklingError, ModuleNotFoundError):
+                    results[key] = pickle.loads(data)
+        return results
+
+    def set_many(self, mapping: dict[str, Any]) -> None:
+        pickled = {key: self._pickle(key, value) for key, value in mapping.items()}
+        with self._lock():
+            for key, data in pickled.items():
+                if data is not None:
+                    self._store(key, data)
+
+    @property
+    def curritems(self) -> int:
+        with self._lock():
+            return int(np.count_nonzero(self._index['length']))
+
+    @property
+    def currsize(self) -> int:
+        with self._lock():
+            return int(self._index['length'].sum())
+
+    @property
+    def maxsize(self) -> int:
+        return int(self._header[2])
+
+    def clear(self) -> None:
+        with self._lock():
+            self._index[:] = 0
+
+    def unlink(self) -> None:
+        """
+        Remove the shared memory segment.  Processes that are attached to it
+        can continue to use it, but new instances will create a new segment.
+        """
+        try:
+            import _posixshmem
+
+            _posixshmem.shm_unlink(self._shm._name)
+        except ImportError:
+            self._shm.unlink()
+
+    @staticmethod
+    def getCache() -> tuple[Optional['SharedMemoryCache'], threading.Lock]:
+        cacheLock = threading.Lock()
+
+        name = config.getConfig('cache_sharedmemory_name') or 'large_image_cache'
+        size = config.getConfig('cache_sharedmemory_size')
+        try:
+            size = int(size or 0)
+        except ValueError:
+            size = 0
+        if size <= 0:
+            try:
+                portion = max(int(config.getConfig('cache_python_memory_portion', 0)) or 32, 3)
+            except ValueError:
+                portion = 32
+            size = config.total_memory() // portion
+        try:
+            cache = SharedMemoryCache(name, size)
+        except Exception:
+            config.getLogger().info('Cannot use shared memory for caching.')
+            cache = None
+        return cache, cacheLock
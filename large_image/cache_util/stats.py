@@ -0,0 +1,118 @@
+import threading
+from typing import Any
+
+# Upper bounds in seconds of the buckets used for fill time histograms.  The
+# last bucket holds everything slower than the last value.
+FillTimeBuckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+
+_stats: dict[str, dict[str, Any]] = {}
+_statsLock = threading.Lock()
+
+
+def valueSize(value: Any) -> int | None:
+    """
+    Estimate the number of bytes used by a cached value.  This handles numpy
+    arrays, PIL images, bytes-like objects, and tuples or lists of these.
+
+    :param value: the value to measure.
+    :returns: the size in bytes or None if it cannot be determined.
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if hasattr(value, 'getbands') and hasattr(value, 'size'):
+        return value.size[0] * value.size[1] * len(value.getbands())
+    if isinstance(value, (tuple, list)):
+        sizes = [valueSize(entry) for entry in value]
+        if any(size is not None for size in sizes):
+            return sum(size for size in sizes if size is not None)
+    return None
+
+
+def _entry(name: str) -> dict[str, Any]:
+    """
+    Get the statistics record for a name, creating it if needed.  This must
+    be called while holding the statistics lock.
+
+    :param name: the name of the statistics record.
+    :returns: the record.
+    """
+    if name not in _stats:
+        _stats[name] = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'fillTime': 0.0,
+            'fillTimeMax': 0.0,
+            'fillTimeHistogram': [0] * (len(FillTimeBuckets) + 1),
+            'bytes': 0,
+        }
+    return _stats[name]
+
+
+def recordHit(name: str) -> None:
+    """
+    Record a cache hit.
+
+    :param name: the name of the cached function or class.
+    """
+    with _statsLock:
+        _entry(name)['hits'] += 1
+
+
+def recordCoalesced(name: str) -> None:
+    """
+    Record a cache miss that used a value computed by a concurrent request.
+
+    :param name: the name of the cached function.
+    """
+    with _statsLock:
+        _entry(name)['coalesced'] += 1
+
+
+def recordMiss(name: str, fillTime: float, value: Any = None) -> None:
+    """
+    Record a cache miss and how long it took to compute the value.
+
+    :param name: the name of the cached function or class.
+    :param fillTime: the time in seconds to compute the value.
+    :param value: if not None, the computed value.  Its size is recorded.
+    """
+    size = valueSize(value) if value is not None else None
+    bucket = 0
+    while bucket < len(FillTimeBuckets) and fillTime > FillTimeBuckets[bucket]:
+        bucket += 1
+    with _statsLock:
+        entry = _entry(name)
+        entry['misses'] += 1
+        entry['fillTime'] += fillTime
+        entry['fillTimeMax'] = max(entry['fillTimeMax'], fillTime)
+        entry['fillTimeHistogram'][bucket] += 1
+        if size:
+            entry['bytes'] += size
+
+
+def cachesStats(reset: bool = False) -> dict[str, dict[str, Any]]:
+    """
+    Report hits, misses, and the time spent computing values for each cached
+    method and tile source class.  Methods are named by their class and
+    method, such as 'TiffFileTileSource.getTile'.  Opening tile sources is
+    recorded as '<class name>.__init__'.
+
+    :param reset: if True, clear the statistics after reporting them.
+    :returns: a dictionary with the names as keys.  Each value has 'hits',
+        'misses', 'coalesced' (misses that waited for a concurrent request
+        for the same value), 'fillTime' (total seconds spent computing values),
+        'fillTimeMax', 'fillTimeHistogram' (a dictionary of upper bounds in
+        seconds and counts), and 'bytes' (the total size of computed values,
+        when known).
+    """
+    bounds = [str(bound) for bound in FillTimeBuckets] + ['inf']
+    with _statsLock:
+        result = {name: dict(
+            entry, fillTimeHistogram=dict(zip(bounds, entry['fillTimeHistogram'], strict=True)),
+        ) for name, entry in _stats.items()}
+        if reset:
+            _stats.clear()
+    return result
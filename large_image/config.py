@@ -44,15 +44,24 @@ ConfigValues = {
     'default_projection': 'EPSG:3857' if _in_notebook() else None,
 
     # For tiles
-    'cache_backend': None,  # 'python', 'redis' or 'memcached'
+    'cache_backend': None,  # 'python', 'redis', 'memcached', or 'sharedmemory'
     # 'python' cache can use 1/(val) of the available memory
     'cache_python_memory_portion': 32,
+    # 'items' limits the 'python' tile cache by the number of tiles based on an
+    # expected tile size; 'bytes' limits it by the measured size of the tiles
+    'cache_python_size_mode': 'items',
     # cache_memcached_url may be a list
     'cache_memcached_url': '127.0.0.1',
     'cache_memcached_username': None,
     'cache_memcached_password': None,
     'cache_redis_url': '127.0.0.1:6379',
     'cache_redis_password': None,
+    'cache_sharedmemory_name': 'large_image_cache',
+    # If 0, the size is based on cache_python_memory_portion
+    'cache_sharedmemory_size': 0,
+    # If set, tiles are also cached in this directory and persist on restart
+    'cache_disk_path': None,
+    'cache_disk_size': 10 * 1024 ** 3,
 
     # If set to False, the default will be to not cache tile sources.  This has
     # substantial performance penalties if sources are used multiple times, so
@@ -71,6 +80,33 @@ ConfigValues = {
 
     'max_small_image_size': 4096,
 
+    # If >0, styles with automatic ranges compute them from a sample of this
+    # many tiles of a low resolution level rather than all of its tiles
+    'auto_range_sample_tiles': 0,
+
+    # When compositing tiles for levels that are missing from a file, 'quality'
+    # decodes the higher resolution tiles fully.  'speed' decodes JPEG tiles at
+    # a reduced size, which is much faster but slightly less sharp.
+    'empty_level_decode': 'quality',
+    # The number of threads used to decode the tiles of a composited tile when
+    # empty_level_decode is 'speed'.  If negative, use the minimum of the
+    # absolute value of this number or the number of cpus.
+    'empty_level_workers': -4,
+
+    # If set, tiles composited for levels that are missing from a file are
+    # saved in a disk store in this directory, so they are only computed once
+    'overview_store_path': None,
+    'overview_store_size': 2 * 1024 ** 3,
+
+    # Prewarming renders tiles of the coarsest levels in the background.  By
+    # default, it stops after this many tiles per frame or when the tiles use
+    # this fraction of the tile cache.  If prewarm_seconds is set, the Girder
+    # plugin prewarms sources for up to this many seconds when they are first
+    # opened.
+    'prewarm_max_tiles': 1024,
+    'prewarm_cache_fraction': 0.25,
+    'prewarm_seconds': 0,
+
     # Should ICC color correction be applied by default
     'icc_correction': True,
 
@@ -16,6 +16,7 @@ from ..exceptions import (TileGeneralError, TileGeneralException,
 from .base import (TILE_FORMAT_IMAGE, TILE_FORMAT_NUMPY, TILE_FORMAT_PIL,
                    FileTileSource, TileOutputMimeTypes, TileSource,
                    dictToEtree, etreeToDict, nearPowerOfTwo)
+from .eagermultiiterator import MultiEagerIterator
 
 AvailableTileSources: dict[str, type[FileTileSource]] = {}
 
@@ -318,6 +319,22 @@ def listMimeTypes(
     return sorted(listSources(availableSources)['mimeTypes'].keys())
 
 
+def eagerIterator(sources: list, **kwargs) -> MultiEagerIterator:
+    """
+    Create an eager iterator that interleaves batched reads from multiple tile
+    sources.  All sources share one pool of worker processes, so batches can
+    mix tiles or regions from different sources.  Sources are opened and
+    planned as iteration reaches them.
+
+    :param sources: a list of paths to open or of tile sources.
+    :param kwargs: MultiEagerIterator options such as masks, source_regions,
+        tiles, regions, policy, weights, seed, open_slides, batch, prefetch,
+        workers, and reuse_buffers, and any other EagerIterator options.
+    :returns: a MultiEagerIterator.
+    """
+    return MultiEagerIterator(sources, **kwargs)
+
+
 __all__ = [
     'TileSource', 'FileTileSource',
     'TileGeneralError', 'TileSourceError',
@@ -325,7 +342,7 @@ __all__ = [
     'TileGeneralException', 'TileSourceException', 'TileSourceAssetstoreException',
     'TileOutputMimeTypes', 'TILE_FORMAT_IMAGE', 'TILE_FORMAT_PIL', 'TILE_FORMAT_NUMPY',
     'AvailableTileSources', 'getTileSource', 'getSourceNameFromDict', 'nearPowerOfTwo',
-    'canRead', 'open', 'new',
+    'canRead', 'open', 'new', 'eagerIterator', 'MultiEagerIterator',
     'listSources', 'listExtensions', 'listMimeTypes',
     'etreeToDict', 'dictToEtree',
 ]
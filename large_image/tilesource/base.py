@@ -1,3 +1,4 @@
+import collections
 import contextlib
 import functools
 import io
@@ -22,14 +23,19 @@ import PIL.ImageColor
 import PIL.ImageDraw
 
 from .. import config, exceptions
-from ..cache_util import getTileCache, methodcache, strhash
+from ..cache_util import (cacheGetMany, cacheSetMany, getOverviewStore, getTileCache,
+                          methodcache, methodcacheKey, storeInBackground, strhash)
 from ..constants import (TILE_FORMAT_IMAGE, TILE_FORMAT_NUMPY, TILE_FORMAT_PIL,
                          ExtraExtensionsToMimetypes, SourcePriority,
                          TileInputUnits, TileOutputMimeTypes,
                          TileOutputPILFormat)
 from . import utilities
 from .eageriterator import EagerIterator
+from .histogram import (countedValueRange, histogramFromCounts, mergeStatistics,
+                        roundHistogramRange, sampleMeanError, sampleTilePositions,
+                        statisticsMean, summarizeCounts, tileStatistics)
 from .jupyter import IPyLeafletMixin
+from .prewarm import TilePrewarmer
 from .tiledict import LazyTileDict
 from .tileiterator import TileIterator
 from .utilities import (ImageBytes, JSONDict, _imageToNumpy,  # noqa: F401
@@ -73,6 +79,19 @@ class TileSource(IPyLeafletMixin):
     # _maxSkippedLevels, such large gaps are composited in stages.
     _maxSkippedLevels = 3
 
+    # When reading multiple tiles at once from sources that support reading
+    # blocks of tiles, this is the maximum number of tiles in a single read.
+    _maxTileBlock = 64
+
+    # True if the source decodes image data in libraries that release the GIL,
+    # so reading from several threads at once runs in parallel.
+    _releasesGIL = False
+
+    # When computing a sampled histogram without a specified output size or
+    # scale, sample the coarsest level that is at least this many pixels
+    # across.
+    histogramSampleSize = 1024
+
     _initValues: tuple[tuple[Any, ...], dict[str, Any]]
     _iccprofilesObjects: list[Any]
 
@@ -569,7 +588,8 @@ class TileSource(IPyLeafletMixin):
     def histogram(  # noqa
             self, dtype: npt.DTypeLike | None = None, onlyMinMax: bool = False,
             bins: int = 256, density: bool = False, format: Any = None,
-            *args, **kwargs) -> dict[str, np.ndarray | list[dict[str, Any]]]:
+            *args, max_workers: int | None = -4, sampleTiles: int | None = None,
+            **kwargs) -> dict[str, np.ndarray | list[dict[str, Any]]]:
         """
         Get a histogram for a region.
 
@@ -589,6 +609,22 @@ class TileSource(IPyLeafletMixin):
             If 'round', use the computed values, but the number of bins may be
             reduced or the bin_edges rounded to integer values for
             integer-based source data.
+        :param max_workers: maximum number of threads used to read and
+            analyze tiles.  If negative, use the minimum of the absolute value
+            of this number or multiprocessing.cpu_count().  If None, 0, or 1,
+            tiles are processed sequentially.
+        :param sampleTiles: if a positive number, compute an approximate
+            histogram from a stratified random sample of this many of the
+            tiles that the tileIterator would yield.  Only the sampled tiles
+            are read.  If neither output nor scale is specified, the coarsest
+            level that is at least histogramSampleSize pixels across is used,
+            and resample defaults to False so that a specified output size
+            uses the coarsest level with at least that resolution.  The
+            results include a 'sample' record with the number of tiles
+            analyzed ('tiles'), the number of tiles available
+            ('totalTiles'), and the estimated standard error of each band's
+            mean ('meanError', None if fewer than two tiles were analyzed).
+            The minimum and maximum are those of the sampled tiles.
         :param args: parameters to pass to the tileIterator.
         :param kwargs: parameters to pass to the tileIterator.
         :returns: if onlyMinMax is true, this is a dictionary with keys min and
@@ -601,49 +637,63 @@ class TileSource(IPyLeafletMixin):
             number of bins used.  bin_edges is an array one longer than the
             hist array that contains the boundaries between bins.
         """
-        lastlog = time.time()
         kwargs = kwargs.copy()
         histRange = kwargs.pop('range', None)
+        if max_workers is not None and max_workers < 0:
+            max_workers = min(-max_workers, config.cpu_count(False))
+        explicitRange = histRange is not None and histRange != 'round'
+        histSpecs = None
+        valueRange = None
+        countedDtype = None
+        positions = None
+        if sampleTiles and sampleTiles > 0:
+            # Use the coarsest level that has the requested resolution
+            if not any(key in kwargs for key in ('output', 'scale')):
+                kwargs['output'] = {
+                    'maxWidth': min(self.sizeX, self.histogramSampleSize),
+                    'maxHeight': min(self.sizeY, self.histogramSampleSize)}
+            kwargs.setdefault('resample', False)
+            # This computes the number of tiles from the tile grid of the
+            # level without iterating through them
+            totalTiles = len(self.tileIterator(format=TILE_FORMAT_NUMPY, **kwargs))
+            positions = sampleTilePositions(totalTiles, sampleTiles)
+            tileMeans: list[np.ndarray] = []
+
+        def tileStats(tile: np.ndarray) -> dict[str, Any]:
+            return tileStatistics(
+                tile, valueRange if tile.dtype == countedDtype else None, histSpecs)
+
+        # The first pass gets the minimum, maximum, mean, and standard
+        # deviation.  For integer data with few possible values, or when the
+        # range is specified, it also collects what is needed for the
+        # histogram so a second pass is not required.
         results: dict[str, Any] | None = None
-        for itile in self.tileIterator(format=TILE_FORMAT_NUMPY, **kwargs):
-            if time.time() - lastlog > 10:
-                self.logger.info(
-                    'Calculating histogram min/max for frame %d, tile %d/%d',
-                    kwargs.get('frame', 0),
-                    itile['tile_position']['position'], itile['iterator_range']['position'])
-                lastlog = time.time()
-            tile = itile['tile']
-            if dtype is not None and tile.dtype != dtype:
-                if tile.dtype == np.uint8 and dtype == np.uint16:
-                    tile = np.array(tile, dtype=np.uint16) * 257
-                else:
-                    continue
-            tilemin = np.array([
-                np.amin(tile[:, :, idx]) for idx in range(tile.shape[2])], tile.dtype)
-            tilemax = np.array([
-                np.amax(tile[:, :, idx]) for idx in range(tile.shape[2])], tile.dtype)
-            tilesum: np.ndarray = np.array([
-                np.sum(tile[:, :, idx]) for idx in range(tile.shape[2])], float)
-            tilesum2: np.ndarray = np.array([
-                np.sum(np.array(tile[:, :, idx], float) ** 2)
-                for idx in range(tile.shape[2])], float)
-            tilecount = tile.shape[0] * tile.shape[1]
-            if results is None:
-                results = {
-                    'min': tilemin,
-                    'max': tilemax,
-                    'sum': tilesum,
-                    'sum2': tilesum2,
-                    'count': tilecount,
-                }
-            else:
-                results['min'] = np.minimum(results['min'], tilemin[:len(results['min'])])
-                results['max'] = np.maximum(results['max'], tilemax[:len(results['min'])])
-                results['sum'] += tilesum[:len(results['min'])]
-                results['sum2'] += tilesum2[:len(results['min'])]
-                results['count'] += tilecount
+        for first, stats in self._histogramTiles(
+                dtype, tileStats, max_workers, 'Calculating histogram min/max', kwargs,
+                positions=positions):
+            if first is not None:
+                valueRange = countedValueRange(first.dtype)
+                countedDtype = first.dtype
+                if valueRange is None and explicitRange and not onlyMinMax:
+                    histSpecs = [(bins, histRange)] * first.shape[2]
+                stats = tileStats(first)
+            if positions is not None:
+                tileMeans.append(statisticsMean(stats))
+            results = mergeStatistics(results, stats)
         if results is None:
             return {}
+        summarizeCounts(results)
+        if positions is not None:
+            results['sample'] = {
+                'tiles': len(tileMeans),
+                'totalTiles': totalTiles,
+                'meanError': sampleMeanError(tileMeans, totalTiles, len(results['min'])),
+            }
+        counts = results.pop('counts', None)
+        valueOffset = results.pop('offset', None)
+        results.pop('dtype', None)
+        hists = results.pop('hist', None)
+        binEdges = results.pop('binEdges', None)
         results['mean'] = results['sum'] / results['count']
         results['stdev'] = np.maximum(
             results['sum2'] / results['count'] - results['mean'] ** 2,
@@ -651,7 +701,7 @@ class TileSource(IPyLeafletMixin):
         results.pop('sum', None)
         results.pop('sum2', None)
         results.pop('count', None)
-        if results is None or onlyMinMax:
+        if onlyMinMax:
             return results
         results['histogram'] = [{
             'min': float(results['min'][idx]),
@@ -659,7 +709,7 @@ class TileSource(IPyLeafletMixin):
             'mean': float(results['mean'][idx]),
             'stdev': float(results['stdev'][idx]),
             'range': ((float(results['min'][idx]), float(results['max'][idx]) + 1)
-                      if histRange is None or histRange == 'round' else histRange),
+                      if not explicitRange else histRange),
             'hist': None,
             'bin_edges': None,
             'bins': bins,
@@ -667,33 +717,28 @@ class TileSource(IPyLeafletMixin):
         } for idx in range(len(results['min']))]
         if histRange == 'round' and np.issubdtype(dtype or self.dtype, np.integer):
             for record in results['histogram']:
-                if (record['range'][1] - record['range'][0]) < bins * 10:
-                    step = int(math.ceil((record['range'][1] - record['range'][0]) / bins))
-                    rbins = int(math.ceil((record['range'][1] - record['range'][0]) / step))
-                    record['range'] = (record['range'][0], record['range'][0] + step * rbins)
-                    record['bins'] = rbins
-        for tile in self.tileIterator(format=TILE_FORMAT_NUMPY, **kwargs):
-            if time.time() - lastlog > 10:
-                self.logger.info(
-                    'Calculating histogram %d/%d',
-                    tile['tile_position']['position'], tile['iterator_range']['position'])
-                lastlog = time.time()
-            tile = tile['tile']
-            if dtype is not None and tile.dtype != dtype:
-                if tile.dtype == np.uint8 and dtype == np.uint16:
-                    tile = np.array(tile, dtype=np.uint16) * 257
-                else:
-                    continue
-            for idx in range(min(len(results['min']), tile.shape[-1])):
-                entry = results['histogram'][idx]
-                hist, bin_edges = np.histogram(
-                    tile[:, :, idx], entry['bins'],
-                    (float(entry['range'][0]), float(entry['range'][1])), density=False)
-                if entry['hist'] is None:
-                    entry['hist'] = hist
-                    entry['bin_edges'] = bin_edges
-                else:
-                    entry['hist'] += hist
+                roundHistogramRange(record, bins)
+        if counts is not None:
+            for entry, valueCounts in zip(results['histogram'], counts, strict=True):
+                entry['hist'], entry['bin_edges'] = histogramFromCounts(
+                    valueCounts, valueOffset, entry['bins'], entry['range'])
+        elif hists is not None:
+            for entry, hist, edges in zip(results['histogram'], hists, binEdges, strict=True):
+                entry['hist'] = hist
+                entry['bin_edges'] = edges
+        else:
+            histSpecs = [(entry['bins'], entry['range']) for entry in results['histogram']]
+            valueRange = None
+            for _, stats in self._histogramTiles(
+                    dtype, tileStats, max_workers, 'Calculating histogram', kwargs,
+                    readFirst=False, positions=positions):
+                for entry, hist, edges in zip(
+                        results['histogram'], stats['hist'], stats['binEdges'], strict=False):
+                    if entry['hist'] is None:
+                        entry['hist'] = hist
+                        entry['bin_edges'] = edges
+                    else:
+                        entry['hist'] += hist
         for idx in range(len(results['min'])):
             entry = results['histogram'][idx]
             if entry['hist'] is not None:
@@ -702,6 +747,98 @@ class TileSource(IPyLeafletMixin):
                     entry['hist'] = entry['hist'].astype(float) / entry['samples']
         return results
 
+    def _histogramTiles(
+            self, dtype: npt.DTypeLike | None, func: Any, max_workers: int | None,
+            logMessage: str, kwargs: dict[str, Any], readFirst: bool = True,
+            positions: set[int] | None = None,
+    ) -> Iterator[tuple[np.ndarray | None, Any]]:
+        """
+        Iterate through the tiles of a region, computing a function on each
+        tile in a pool of threads.  Tiles that are not of the requested data
+        type are skipped, except that uint8 tiles are scaled to uint16 if
+        needed.
+
+        :param dtype: if not None, the tiles must be this numpy.dtype.
+        :param func: a function that takes a numpy tile and returns a value.
+        :param max_workers: the maximum number of threads to use.  If None, 0,
+            or 1, tiles are processed sequentially.
+        :param logMessage: a message to log periodically with the progress.
+        :param kwargs: parameters to pass to the tileIterator.
+        :param readFirst: if True, the first usable tile is yielded without
+            calling the function on it, so the caller can make decisions
+            based on it before the function is called for other tiles.
+        :param positions: if not None, only use the tiles at these positions
+            in the order the tileIterator yields them.
+        :yields: a tuple for each usable tile in order.  For the first tile
+            when readFirst is True, this is the numpy tile and None.
+            Otherwise, this is None and the result of the function.
+        """
+        lastlog = time.time()
+
+        def getTile(itile: LazyTileDict) -> np.ndarray | None:
+            nonlocal lastlog
+
+            if time.time() - lastlog > 10:
+                lastlog = time.time()
+                self.logger.info(
+                    '%s for frame %d, tile %d/%d', logMessage, kwargs.get('frame') or 0,
+                    itile['tile_position']['position'], itile['iterator_range']['position'])
+            tile = itile['tile']
+            itile.release()
+            if dtype is not None and tile.dtype != dtype:
+                if tile.dtype == np.uint8 and dtype == np.uint16:
+                    tile = np.array(tile, dtype=np.uint16) * 257
+                else:
+                    return None
+            return tile
+
+        def process(itile: LazyTileDict) -> Any:
+            tile = getTile(itile)
+            return func(tile) if tile is not None else None
+
+        if positions is not None:
+            kwargs = {**kwargs, 'tile_position': sorted(positions)}
+        tileIter: Iterator[LazyTileDict] = iter(self.tileIterator(
+            format=TILE_FORMAT_NUMPY, **kwargs))
+        if readFirst:
+            for itile in tileIter:
+                tile = getTile(itile)
+                if tile is not None:
+                    yield tile, None
+                    break
+        if not max_workers or max_workers <= 1:
+            results: Iterator[Any] = (process(itile) for itile in tileIter)
+        else:
+            results = self._mapTilesParallel(process, tileIter, max_workers)
+        for result in results:
+            if result is not None:
+                yield None, result
+
+    def _mapTilesParallel(
+            self, func: Any, tileIter: Iterator[LazyTileDict],
+            max_workers: int) -> Iterator[Any]:
+        """
+        Call a function on each tile of an iterator using a pool of threads.
+
+        :param func: a function that takes a LazyTileDict.
+        :param tileIter: an iterator of LazyTileDict.
+        :param max_workers: the maximum number of threads to use.
+        :yields: the result of the function for each tile in order.
+        """
+        import concurrent.futures
+
+        # Only keep a few results pending so that memory use is bounded
+        futures: collections.deque = collections.deque()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for itile in tileIter:
+                futures.append(pool.submit(func, itile))
+                while len(futures) > max_workers * 2 or futures[0].done():
+                    yield futures.popleft().result()
+                    if not futures:
+                        break
+            while futures:
+                yield futures.popleft().result()
+
     def _scanForMinMax(
             self, dtype: npt.DTypeLike, frame: int | None = None,
             analysisSize: int = 1024, onlyMinMax: bool = True, **kwargs) -> None:
@@ -715,6 +852,12 @@ class TileSource(IPyLeafletMixin):
         :param onlyMinMax: if True, only find the min and max.  If False, get
             the entire histogram.
         """
+        try:
+            sampleTiles = int(config.getConfig('auto_range_sample_tiles') or 0)
+        except ValueError:
+            sampleTiles = 0
+        if sampleTiles > 0:
+            kwargs.setdefault('sampleTiles', sampleTiles)
         self._bandRanges[frame] = self._unstyled.histogram(
             dtype=dtype,
             onlyMinMax=onlyMinMax,
@@ -994,6 +1137,72 @@ class TileSource(IPyLeafletMixin):
                 self.logger.exception('Failed to apply ICC profile')
         return sc.iccimage
 
+    def _getStyleFrameTiles(self, sc: types.SimpleNamespace) -> dict[int, np.ndarray]:
+        """
+        Get the tiles of the frames other than the main frame that are used by
+        the bands of a style.  These are fetched concurrently so that a style
+        that composites many frames isn't limited to reading one at a time.
+
+        :param sc: the style context.
+        :returns: a dictionary of numpy tiles keyed by frame.
+        """
+        frames = []
+        for entry in sc.style['bands']:
+            if ((entry.get('frame') is None and not entry.get('framedelta')) or
+                    entry.get('frame') == sc.mainFrame):
+                continue
+            frame = entry['frame'] if entry.get('frame') is not None else (
+                sc.mainFrame + entry['framedelta'])
+            if frame not in frames:
+                frames.append(frame)
+        if not frames:
+            return {}
+        tiles = self._unstyled.getTiles(
+            [(sc.x, sc.y, sc.z, frame) for frame in frames],
+            max_workers=-len(frames), numpyAllowed=True)
+        return {
+            frame: _imageToNumpy(tile)[0]
+            for frame, tile in zip(frames, tiles, strict=True)}
+
+    def _getStyleBandColors(
+            self, sc: types.SimpleNamespace) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Map the current band of a style through its palette for all of the
+        output channels at once.
+
+        :param sc: the style context.  This uses the band, palette,
+            palettebase, discrete, and composite values.
+        :returns: an array of colors with a channel for each used output
+            channel and a boolean array of which output channels are used.
+            Channels with a constant palette that wouldn't change the output
+            are not used.
+        """
+        palette = sc.palette
+        constant = np.all(palette == palette[0], axis=0)
+        used = ~(constant & (palette[0] == (255 if sc.composite == 'multiply' else 0)))
+        channels = np.flatnonzero(used)
+        band = sc.band
+        clrs = np.empty(band.shape[:2] + (len(channels), ), dtype=np.result_type(
+            band.dtype, palette.dtype, np.float64))
+        fixed = np.flatnonzero(constant[channels])
+        clrs[:, :, fixed] = palette[0, channels[fixed]]
+        varied = np.flatnonzero(~constant[channels])
+        if sc.discrete and len(varied):
+            clrs[:, :, varied] = palette[
+                np.floor(band * len(palette)).astype(int).clip(0, len(palette) - 1)][
+                :, :, channels[varied]]
+        elif len(varied):
+            # Two-color palettes starting at zero scale linearly without
+            # clamping; other palettes are interpolated.
+            linear = (palette[0, channels[varied]] == 0) & (len(palette) == 2)
+            if linear.any():
+                clrs[:, :, varied[linear]] = (
+                    band[:, :, np.newaxis] * palette[1, channels[varied[linear]]])
+            if not linear.all():
+                clrs[:, :, varied[~linear]] = utilities._interpolatePalette(
+                    band, sc.palettebase, palette[:, channels[varied[~linear]]])
+        return clrs, used
+
     def _applyStyle(  # noqa
             self, image: np.ndarray, style: JSONDict | None, x: int, y: int,
             z: int, frame: int | None = None) -> np.ndarray:
@@ -1034,6 +1243,7 @@ class TileSource(IPyLeafletMixin):
                 (image.shape[0], image.shape[1], newwidth),
                 np.float32 if image.dtype != np.float64 else image.dtype)
         image = self._applyStyleFunction(image, sc, 'pre')
+        frameTiles = self._getStyleFrameTiles(sc)
         for eidx, entry in enumerate(sc.style['bands']):
             sc.styleIndex = eidx
             sc.dtype = sc.dtype if sc.dtype is not None else entry.get('dtype')
@@ -1052,7 +1262,7 @@ class TileSource(IPyLeafletMixin):
             else:
                 frame = entry['frame'] if entry.get('frame') is not None else (
                     sc.mainFrame + entry['framedelta'])
-                image = self._unstyled.getTile(x, y, z, frame=frame, numpyAllowed=True)
+                image = frameTiles[frame]
                 image = image[:sc.mainImage.shape[0],
                               :sc.mainImage.shape[1],
                               :sc.mainImage.shape[2]]
@@ -1114,39 +1324,22 @@ class TileSource(IPyLeafletMixin):
             # divide.
             # See https://docs.gimp.org/en/gimp-concepts-layer-modes.html for
             # some details.
-            for channel in range(sc.output.shape[2]):
-                if np.all(sc.palette[:, channel] == sc.palette[0, channel]):
-                    if ((sc.palette[0, channel] == 0 and sc.composite != 'multiply') or
-                            (sc.palette[0, channel] == 255 and sc.composite == 'multiply')):
-                        continue
-                    clrs = np.full(sc.band.shape, sc.palette[0, channel], dtype=sc.band.dtype)
-                else:
-                    # Don't recompute if the sc.palette is repeated two channels
-                    # in a row.
-                    if not channel or np.any(
-                            sc.palette[:, channel] != sc.palette[:, channel - 1]):
-                        if not sc.discrete:
-                            if len(sc.palette) == 2 and sc.palette[0, channel] == 0:
-                                clrs = sc.band * sc.palette[1, channel]
-                            else:
-                                clrs = np.interp(sc.band, sc.palettebase, sc.palette[:, channel])
-                        else:
-                            clrs = sc.palette[
-                                np.floor(sc.band * len(sc.palette)).astype(int).clip(
-                                    0, len(sc.palette) - 1), channel]
+            clrs, used = self._getStyleBandColors(sc)
+            if used.any() and (eidx or sc.composite != 'multiply'):
+                # Composite all of the used channels at once
+                mask = sc.mask[:, :, np.newaxis] if sc.mask is not None else None
+                region = (slice(None, clrs.shape[0]), slice(None, clrs.shape[1]),
+                          slice(None) if used.all() else used)
                 if sc.composite == 'multiply':
-                    if eidx:
-                        sc.output[:clrs.shape[0], :clrs.shape[1], channel] = np.multiply(
-                            sc.output[:clrs.shape[0], :clrs.shape[1], channel],
-                            (clrs / 255) if sc.mask is None else np.where(sc.mask, clrs / 255, 1))
+                    sc.output[region] = np.multiply(
+                        sc.output[region],
+                        (clrs / 255) if mask is None else np.where(mask, clrs / 255, 1))
+                elif not eidx:
+                    sc.output[region] = clrs if mask is None else np.where(mask, clrs, 0)
                 else:
-                    if not eidx:
-                        sc.output[:clrs.shape[0], :clrs.shape[1], channel] = (
-                            clrs if sc.mask is None else np.where(sc.mask, clrs, 0))
-                    else:
-                        sc.output[:clrs.shape[0], :clrs.shape[1], channel] = np.maximum(
-                            sc.output[:clrs.shape[0], :clrs.shape[1], channel],
-                            clrs if sc.mask is None else np.where(sc.mask, clrs, 0))
+                    sc.output[region] = np.maximum(
+                        sc.output[region],
+                        clrs if mask is None else np.where(mask, clrs, 0))
             sc.output = self._applyStyleFunction(sc.output, sc, 'postband')
         if hasattr(sc, 'styleIndex'):
             del sc.styleIndex
@@ -1584,11 +1777,60 @@ class TileSource(IPyLeafletMixin):
         """
         return [True] * self.levels
 
+    def _overviewStoreKey(self, x: int, y: int, z: int, frame: int | None) -> str | None:
+        """
+        Get the key of a composited tile in the overview store.  The key
+        includes the state of the unstyled source and, for files, their
+        modification time and size, so changed files aren't served stale
+        tiles.
+
+        :param x: location of tile within original level.
+        :param y: location of tile within original level.
+        :param z: original level.
+        :param frame: the frame number.
+        :returns: a key or None if the source can't be identified across
+            processes.
+        """
+        source = self._unstyled
+        if getattr(source, '_noCache', False):
+            return None
+        fileStat: Any = None
+        with contextlib.suppress(Exception):
+            stat = os.stat(source._getLargeImagePath())  # type: ignore[attr-defined]
+            fileStat = (stat.st_mtime_ns, stat.st_size)
+        return strhash(
+            'overview', source.getState(), fileStat, frame, z, x, y,
+            config.getConfig('empty_level_decode'))
+
     def _getTileFromEmptyLevel(self, x: int, y: int, z: int, **kwargs) -> tuple[
             PIL.Image.Image | np.ndarray, str]:
         """
         Given the x, y, z tile location in an unpopulated level, get tiles from
-        higher resolution levels to make the lower-res tile.
+        higher resolution levels to make the lower-res tile.  If an overview
+        store is configured, composited tiles are saved to it in the
+        background and later reads use the saved tiles.
+
+        :param x: location of tile within original level.
+        :param y: location of tile within original level.
+        :param z: original level.
+        :returns: tile in PIL format.
+        """
+        store = getOverviewStore()
+        key = self._overviewStoreKey(
+            x, y, z, kwargs.get('frame')) if store is not None else None
+        if store is not None and key is not None:
+            with contextlib.suppress(KeyError):
+                return store[key]
+        result = self._compositeTileFromEmptyLevel(x, y, z, **kwargs)
+        if store is not None and key is not None:
+            storeInBackground(store, key, result)
+        return result
+
+    def _compositeTileFromEmptyLevel(self, x: int, y: int, z: int, **kwargs) -> tuple[
+            PIL.Image.Image | np.ndarray, str]:
+        """
+        Composite a tile for an unpopulated level from tiles of higher
+        resolution levels.
 
         :param x: location of tile within original level.
         :param y: location of tile within original level.
@@ -1618,49 +1860,53 @@ class TileSource(IPyLeafletMixin):
                 ty = (newY * self.tileHeight) // scale
                 if (newY and y * scale + newY >= maxY) or dy >= self.tileHeight:
                     continue
+                rowTiles = []
                 for newX in range(scale):
                     stx = (x * scale + newX) * self.tileWidth
                     dx = stx % scale
                     if (newX and x * scale + newX >= maxX) or dx >= self.tileWidth:
                         continue
-                    tx = (newX * self.tileWidth) // scale
-                    if time.time() - lastlog > 10:
-                        self.logger.info(
-                            'Compositing tile from higher resolution tiles x=%d y=%d z=%d',
-                            x * scale + newX, y * scale + newY, z)
-                        lastlog = time.time()
-                    subtile = self._unstyled.getTile(
-                        x * scale + newX, y * scale + newY, z,
+                    rowTiles.append((newX, dx))
+                if time.time() - lastlog > 10:
+                    self.logger.info(
+                        'Compositing tile from higher resolution tiles x=%d y=%d z=%d',
+                        x * scale, y * scale + newY, z)
+                    lastlog = time.time()
+                # Fetch a limited number of tiles at a time to bound memory
+                for start in range(0, len(rowTiles), self._maxTileBlock):
+                    chunk = rowTiles[start:start + self._maxTileBlock]
+                    subtiles = self._unstyled.getTiles(
+                        [(x * scale + newX, y * scale + newY, z, kwargs.get('frame'))
+                         for newX, _ in chunk],
                         pilImageAllowed=False, numpyAllowed='always',
-                        sparseFallback=True, edge=False, frame=kwargs.get('frame'))
-                    subtile = subtile[dy::scale, dx::scale]
-                    nptile[ty:ty + subtile.shape[0], tx:tx + subtile.shape[1]] = subtile
+                        sparseFallback=True, edge=False)
+                    for (newX, dx), subtile in zip(chunk, subtiles, strict=True):
+                        tx = (newX * self.tileWidth) // scale
+                        subtile = subtile[dy::scale, dx::scale]
+                        nptile[ty:ty + subtile.shape[0], tx:tx + subtile.shape[1]] = subtile
             return nptile, TILE_FORMAT_NUMPY
         while z - basez > self._maxSkippedLevels:
             z -= self._maxSkippedLevels
             scale = int(scale / 2 ** self._maxSkippedLevels)
+        if config.getConfig('empty_level_decode') == 'speed':
+            return self._getTileFromEmptyLevelReduced(x, y, z, scale, **kwargs)
         tile = PIL.Image.new('RGBA', (
             min(self.sizeX, self.tileWidth * scale), min(self.sizeY, self.tileHeight * scale)))
         maxX = 2.0 ** (z + 1 - self.levels) * self.sizeX / self.tileWidth
         maxY = 2.0 ** (z + 1 - self.levels) * self.sizeY / self.tileHeight
-        for newY in range(scale):
-            for newX in range(scale):
-                if ((newX or newY) and ((x * scale + newX) >= maxX or
-                                        (y * scale + newY) >= maxY)):
-                    continue
-                if time.time() - lastlog > 10:
-                    self.logger.info(
-                        'Compositing tile from higher resolution tiles x=%d y=%d z=%d',
-                        x * scale + newX, y * scale + newY, z)
-                    lastlog = time.time()
-                subtile = self._unstyled.getTile(
-                    x * scale + newX, y * scale + newY, z,
-                    pilImageAllowed=True, numpyAllowed=False,
-                    sparseFallback=True, edge=False, frame=kwargs.get('frame'))
-                subtile = _imageToPIL(subtile)
-                mode = subtile.mode
-                tile.paste(subtile, (newX * self.tileWidth,
-                                     newY * self.tileHeight))
+        positions = [
+            (newX, newY) for newY in range(scale) for newX in range(scale)
+            if not ((newX or newY) and ((x * scale + newX) >= maxX or
+                                        (y * scale + newY) >= maxY))]
+        subtiles = self._unstyled.getTiles(
+            [(x * scale + newX, y * scale + newY, z, kwargs.get('frame'))
+             for newX, newY in positions],
+            pilImageAllowed=True, numpyAllowed=False, sparseFallback=True, edge=False)
+        for (newX, newY), subtile in zip(positions, subtiles, strict=True):
+            subtile = _imageToPIL(subtile)
+            mode = subtile.mode
+            tile.paste(subtile, (newX * self.tileWidth,
+                                 newY * self.tileHeight))
         tile = tile.resize(
             (min(self.tileWidth, (tile.width + scale - 1) // scale),
              min(self.tileHeight, (tile.height + scale - 1) // scale)),
@@ -1672,6 +1918,101 @@ class TileSource(IPyLeafletMixin):
         tile = tile.convert(mode)
         return (tile, TILE_FORMAT_PIL)
 
+    def _getTileFromEmptyLevelReduced(
+            self, x: int, y: int, z: int, scale: int, **kwargs) -> tuple[
+            PIL.Image.Image, str]:
+        """
+        Composite a tile for an unpopulated level from tiles of a higher
+        resolution level that are decoded at a reduced size.  JPEG tiles are
+        decoded at 1/2, 1/4, or 1/8 scale by libjpeg, which is much faster than
+        decoding them fully; other tiles are decoded fully and box-reduced.
+
+        :param x: location of tile within original level.
+        :param y: location of tile within original level.
+        :param z: the populated level used for the composite.
+        :param scale: the scale between the original level and level z.  This
+            is at most 2 ** _maxSkippedLevels.
+        :returns: tile in PIL format.
+        """
+        import concurrent.futures
+
+        reduction = min(scale, 8)
+        while reduction > 1 and (self.tileWidth % reduction or self.tileHeight % reduction):
+            reduction //= 2
+        subWidth = self.tileWidth // reduction
+        subHeight = self.tileHeight // reduction
+        tile = PIL.Image.new('RGBA', (
+            (min(self.sizeX, self.tileWidth * scale) + reduction - 1) // reduction,
+            (min(self.sizeY, self.tileHeight * scale) + reduction - 1) // reduction))
+        maxX = 2.0 ** (z + 1 - self.levels) * self.sizeX / self.tileWidth
+        maxY = 2.0 ** (z + 1 - self.levels) * self.sizeY / self.tileHeight
+        positions = [
+            (newX, newY) for newY in range(scale) for newX in range(scale)
+            if not ((newX or newY) and ((x * scale + newX) >= maxX or
+                                        (y * scale + newY) >= maxY))]
+
+        def getSubtile(position: tuple[int, int]) -> PIL.Image.Image:
+            tx, ty = x * scale + position[0], y * scale + position[1]
+            subtile = self._unstyled._getReducedTile(tx, ty, z, reduction, kwargs.get('frame'))
+            if subtile is None:
+                subtile = _imageToPIL(self._unstyled.getTile(
+                    tx, ty, z, pilImageAllowed=True, numpyAllowed=False,
+                    sparseFallback=True, frame=kwargs.get('frame')))
+            if subtile.size != (subWidth, subHeight):
+                if (subtile.width == subWidth * reduction and
+                        subtile.height == subHeight * reduction):
+                    subtile = subtile.reduce(reduction)
+                else:
+                    subtile = subtile.resize(
+                        (subWidth, subHeight), getattr(PIL.Image, 'Resampling', PIL.Image).BOX)
+            return subtile
+
+        try:
+            maxWorkers = int(config.getConfig('empty_level_workers', -4) or 0)
+        except ValueError:
+            maxWorkers = -4
+        if maxWorkers < 0:
+            maxWorkers = min(-maxWorkers, config.cpu_count(False))
+        maxWorkers = min(maxWorkers, len(positions))
+        if maxWorkers <= 1:
+            subtiles = [getSubtile(position) for position in positions]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as pool:
+                subtiles = list(pool.map(getSubtile, positions))
+        for (newX, newY), subtile in zip(positions, subtiles, strict=True):
+            mode = subtile.mode
+            tile.paste(subtile, (newX * subWidth, newY * subHeight))
+        scale //= reduction
+        if scale > 1:
+            tile = tile.resize(
+                (min(self.tileWidth, (tile.width + scale - 1) // scale),
+                 min(self.tileHeight, (tile.height + scale - 1) // scale)),
+                getattr(PIL.Image, 'Resampling', PIL.Image).LANCZOS)
+        if tile.width != self.tileWidth or tile.height != self.tileHeight:
+            fulltile = PIL.Image.new('RGBA', (self.tileWidth, self.tileHeight))
+            fulltile.paste(tile, (0, 0))
+            tile = fulltile
+        tile = tile.convert(mode)
+        return (tile, TILE_FORMAT_PIL)
+
+    def _getReducedTile(self, x: int, y: int, z: int, reduction: int,
+                        frame: int | None = None) -> PIL.Image.Image | None:
+        """
+        Get a tile decoded at a reduced size, if the source can do so faster
+        than decoding it fully.  This is used when compositing unpopulated
+        levels.  Sources with JPEG tiles should override this.
+
+        :param x: the 0-based x position of the tile on the level.
+        :param y: the 0-based y position of the tile on the level.
+        :param z: the level of the tile.
+        :param reduction: the power of two by which to reduce the tile.
+        :param frame: the frame number.
+        :returns: a PIL image that is approximately the tile size divided by
+            the reduction or None if the tile can't be decoded at a reduced
+            size.
+        """
+        return None
+
     @methodcache()
     def getTile(self, x: int, y: int, z: int, pilImageAllowed: bool = False,
                 numpyAllowed: bool | str = False,
@@ -1700,6 +2041,188 @@ class TileSource(IPyLeafletMixin):
         """
         raise NotImplementedError
 
+    def prewarm(
+            self, levels: int | list[int] | None = None,
+            frames: list[int | None] | None = None,
+            budget_seconds: float | None = None, max_workers: int | None = -4,
+            restart: bool = False, **kwargs) -> TilePrewarmer:
+        """
+        Render tiles of the coarsest levels in background threads so that
+        they are cached before they are requested.  This includes tiles of
+        levels that are composited because they are missing from the file.
+        Only one prewarm runs per source; calling this while one is running
+        or after one has finished returns that one.
+
+        :param levels: if an integer, prewarm this many of the coarsest levels.
+            If a list, prewarm these levels.  If None, prewarm the coarsest
+            levels with no more than the prewarm_max_tiles config value of
+            tiles.
+        :param frames: a list of frames to prewarm.  None prewarms the default
+            frame.
+        :param budget_seconds: if not None, stop after this many seconds.
+        :param max_workers: the number of threads used to render tiles.  If
+            negative, use the minimum of the absolute value of this number or
+            the number of cpus.
+        :param restart: if True, cancel any previous prewarm and start a new
+            one.
+        :param kwargs: parameters passed to getTile, such as mayRedirect.
+            These must match the parameters used when tiles are requested for
+            the cached tiles to be used.
+        :returns: a TilePrewarmer, which can be cancelled or waited on.
+        """
+        with self._sourceLock:
+            prewarmer = getattr(self, '_prewarmer', None)
+            if prewarmer is not None and not restart:
+                return prewarmer
+            if prewarmer is not None:
+                prewarmer.cancel()
+            self._prewarmer = TilePrewarmer(
+                self, levels=levels, frames=frames, budget_seconds=budget_seconds,
+                max_workers=max_workers, **kwargs)
+        return self._prewarmer.start()
+
+    def getTiles(
+            self, tiles: list[tuple[int, ...]], max_workers: int | None = None,
+            **kwargs) -> list[ImageBytes | PIL.Image.Image | bytes | np.ndarray]:
+        """
+        Get multiple tiles from a tile source.  The results are the same as
+        calling getTile for each tile, but tiles that are not already cached
+        can be read more efficiently.  If the source implements
+        _getTileBlock, adjacent tiles on the same level and frame are read in
+        blocks.  Otherwise, tiles are optionally read using a pool of threads.
+        Sources may override this for other optimizations.
+
+        :param tiles: a list of tiles to get.  Each entry is a tuple of
+            (x, y, z) or (x, y, z, frame).  See getTile.
+        :param max_workers: maximum number of threads used to read tiles.  If
+            negative, use the minimum of the absolute value of this number or
+            multiprocessing.cpu_count().  If None, 0, or 1, tiles are read
+            sequentially.
+        :param kwargs: parameters passed to getTile for each tile, such as
+            pilImageAllowed, numpyAllowed, and sparseFallback.  These are part
+            of the cache key of each tile, so pass the same parameters that
+            getTile would be called with.
+        :returns: a list of tiles in the same order as requested.  Each is
+            either a numpy array, a PIL image, or a memory object with an image
+            file.
+        """
+        import concurrent.futures
+
+        tileList = [(int(entry[0]), int(entry[1]), int(entry[2]),
+                     entry[3] if len(entry) > 3 else None) for entry in tiles]
+        tileKwargs = [
+            dict(kwargs, frame=entry[3]) if len(entry) > 3 else kwargs for entry in tiles]
+        results: list[Any] = [None] * len(tileList)
+        missing = self._getTilesFromCache(tileList, results, tileKwargs)
+        if missing and hasattr(self, '_getTileBlock') and not kwargs.get('edge'):
+            missing = self._getTilesFromBlocks(tileList, missing, results, tileKwargs)
+        if max_workers is not None and max_workers < 0:
+            max_workers = min(-max_workers, config.cpu_count(False))
+        if not max_workers or max_workers <= 1 or len(missing) <= 1:
+            for idx in missing:
+                results[idx] = self.getTile(*tileList[idx][:3], **tileKwargs[idx])
+            return results
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_workers, len(missing))) as pool:
+            futures = [(idx, pool.submit(self.getTile, *tileList[idx][:3], **tileKwargs[idx]))
+                       for idx in missing]
+            for idx, future in futures:
+                results[idx] = future.result()
+        return results
+
+    def _getTilesFromCache(
+            self, tileList: list[tuple[int, int, int, int | None]],
+            results: list[Any], tileKwargs: list[dict[str, Any]]) -> list[int]:
+        """
+        Populate a list of results with tiles that are in the tile cache.
+
+        :param tileList: a list of (x, y, z, frame) tuples.
+        :param results: a list the same length as tileList.  Tiles that are
+            in the cache are stored in this list.
+        :param tileKwargs: the parameters passed to getTile for each tile.
+        :returns: a list of indices within tileList of the tiles that were not
+            in the cache.
+        """
+        keys = [methodcacheKey(self, None, x, y, z, **entryKwargs)
+                for (x, y, z, _), entryKwargs in zip(tileList, tileKwargs, strict=True)]
+        found = cacheGetMany(self.cache, keys, self.cache_lock)
+        missing = []
+        for idx, k in enumerate(keys):
+            if k in found:
+                results[idx] = found[k]
+            else:
+                missing.append(idx)
+        return missing
+
+    def _getTilesFromBlocks(
+            self, tileList: list[tuple[int, int, int, int | None]],
+            missing: list[int], results: list[Any],
+            tileKwargs: list[dict[str, Any]]) -> list[int]:
+        """
+        Read tiles in rectangular blocks using the source's _getTileBlock
+        method.  Tiles are grouped by level and frame.  If the tiles in a group
+        fill most of their bounding box, the whole box is read at once;
+        otherwise, each contiguous run of tiles within a row is read at once.
+        Tiles that are read are added to the results and to the tile cache.
+
+        :param tileList: a list of (x, y, z, frame) tuples.
+        :param missing: a list of indices within tileList to read.
+        :param results: a list the same length as tileList where tiles are
+            stored.
+        :param tileKwargs: the parameters passed to getTile for each tile.
+        :returns: a list of indices within tileList of the tiles that still
+            need to be read.
+        """
+        groups: dict[tuple[int, int | None], list[int]] = {}
+        for idx in missing:
+            x, y, z, frame = tileList[idx]
+            groups.setdefault((z, frame), []).append(idx)
+        remaining = []
+        toCache: dict[str, Any] = {}
+        for (z, frame), group in groups.items():
+            xmin = min(tileList[idx][0] for idx in group)
+            xmax = max(tileList[idx][0] for idx in group) + 1
+            ymin = min(tileList[idx][1] for idx in group)
+            ymax = max(tileList[idx][1] for idx in group) + 1
+            blocks: list[tuple[tuple[int, int, int, int], list[int]]] = []
+            if (xmax - xmin) * (ymax - ymin) <= min(2 * len(group), self._maxTileBlock):
+                blocks.append(((xmin, ymin, xmax, ymax), group))
+            else:
+                for idx in sorted(group, key=lambda idx: (tileList[idx][1], tileList[idx][0])):
+                    x, y = tileList[idx][:2]
+                    last = blocks[-1][0] if blocks and blocks[-1][0][1] == y else None
+                    if last and x < last[2]:
+                        # duplicate request within the current run
+                        blocks[-1][1].append(idx)
+                    elif last and x == last[2] and x - last[0] < self._maxTileBlock:
+                        blocks[-1] = ((last[0], y, x + 1, y + 1), blocks[-1][1] + [idx])
+                    else:
+                        blocks.append(((x, y, x + 1, y + 1), [idx]))
+            for (bx0, by0, bx1, by1), blockGroup in blocks:
+                if len(blockGroup) == 1:
+                    remaining.extend(blockGroup)
+                    continue
+                try:
+                    block = self._getTileBlock(  # type: ignore[attr-defined]
+                        bx0, by0, bx1, by1, z, self._getFrame(frame=frame))
+                except exceptions.TileSourceError:
+                    block = None
+                if block is None:
+                    remaining.extend(blockGroup)
+                    continue
+                for idx in blockGroup:
+                    x, y = tileList[idx][:2]
+                    tile = block[(y - by0) * self.tileHeight:(y - by0 + 1) * self.tileHeight,
+                                 (x - bx0) * self.tileWidth:(x - bx0 + 1) * self.tileWidth].copy()
+                    tile = self._outputTile(
+                        tile, TILE_FORMAT_NUMPY, x, y, z,
+                        tileKwargs[idx].get('pilImageAllowed', False),
+                        tileKwargs[idx].get('numpyAllowed', False), frame=frame)
+                    results[idx] = tile
+                    toCache[methodcacheKey(self, None, x, y, z, **tileKwargs[idx])] = tile
+        cacheSetMany(self.cache, toCache, self.cache_lock)
+        return remaining
+
     def getTileMimeType(self) -> str:
         """
         Return the default mimetype for image tiles.
@@ -1850,7 +2373,8 @@ class TileSource(IPyLeafletMixin):
                 del targetRegion[key]
         return targetRegion
 
-    def getRegion(self, format: str | tuple[str] = (TILE_FORMAT_IMAGE, ), **kwargs) -> tuple[
+    def getRegion(
+            self, format: str | tuple[str] = (TILE_FORMAT_IMAGE, ), **kwargs) -> tuple[
             np.ndarray | PIL.Image.Image | ImageBytes | bytes | pathlib.Path, str]:
         """
         Get a rectangular region from the current tile source.  Aspect ratio is
@@ -1864,22 +2388,20 @@ class TileSource(IPyLeafletMixin):
             specified.
         :param kwargs: optional arguments.  Some options are region, output,
             encoding, jpegQuality, jpegSubsampling, tiffCompression, fill.  See
-            tileIterator.
+            tileIterator.  Additionally, max_workers can be specified.  If
+            None, 0, or 1, tiles are read sequentially.  Otherwise, this is the
+            maximum number of threads used to read tiles in parallel.  If
+            negative, use the minimum of the absolute value of this number or
+            multiprocessing.cpu_count().  Parallel reads are not used for
+            TILED encodings.
         :returns: regionData, formatOrRegionMime: the image data and either the
             mime type, if the format is TILE_FORMAT_IMAGE, or the format.
         """
         if not isinstance(format, (tuple, set, list)):
             format = (format, )
-        if 'tile_position' in kwargs:
-            kwargs = kwargs.copy()
-            kwargs.pop('tile_position', None)
         tiled = TILE_FORMAT_IMAGE in format and kwargs.get('encoding') == 'TILED'
-        if not tiled and 'tile_offset' not in kwargs and 'tile_size' not in kwargs:
-            kwargs = kwargs.copy()
-            kwargs['tile_size'] = {
-                'width': max(self.tileWidth, 4096),
-                'height': max(self.tileHeight, 4096)}
-            kwargs['tile_offset'] = {'auto': True}
+        kwargs, max_workers = self._getRegionReadOptions(tiled, **kwargs)
+        parallel = bool(max_workers)
         resample = True
         if 'resample' in kwargs:
             kwargs = kwargs.copy()
@@ -1897,19 +2419,23 @@ class TileSource(IPyLeafletMixin):
         outHeight = tileIter.info['output']['height']
         image: np.ndarray | PIL.Image.Image | ImageBytes | bytes | None = None
         tiledimage = None
-        for tile in tileIter:
-            # Add each tile to the image
-            subimage, _ = _imageToNumpy(tile['tile'])
-            x0, y0 = tile['x'] - left, tile['y'] - top
-            if tiled:
-                tiledimage = utilities._addRegionTileToTiled(
-                    tiledimage, subimage, x0, y0, regionWidth, regionHeight, tile, **kwargs)
-            else:
-                image = utilities._addSubimageToImage(
-                    cast(Optional[np.ndarray], image), subimage, x0, y0, regionWidth, regionHeight)
-            # Somehow discarding the tile here speeds things up.
-            del tile
-            del subimage
+        if parallel and cast(int, len(tileIter)) > 1:
+            image = self._getRegionTilesParallel(tileIter, max_workers)
+        else:
+            for tile in tileIter:
+                # Add each tile to the image
+                subimage, _ = _imageToNumpy(tile['tile'])
+                x0, y0 = tile['x'] - left, tile['y'] - top
+                if tiled:
+                    tiledimage = utilities._addRegionTileToTiled(
+                        tiledimage, subimage, x0, y0, regionWidth, regionHeight, tile, **kwargs)
+                else:
+                    image = utilities._addSubimageToImage(
+                        cast(Optional[np.ndarray], image), subimage, x0, y0,
+                        regionWidth, regionHeight)
+                # Somehow discarding the tile here speeds things up.
+                del tile
+                del subimage
         # Scale if we need to
         outWidth = int(math.floor(outWidth))
         outHeight = int(math.floor(outHeight))
@@ -1940,6 +2466,62 @@ class TileSource(IPyLeafletMixin):
                 _imageToPIL(cast(np.ndarray, image), mode), maxWidth, maxHeight, kwargs['fill'])
         return utilities._encodeImage(cast(np.ndarray, image), format=format, **kwargs)
 
+    def _getRegionReadOptions(self, tiled: bool, **kwargs) -> tuple[dict[str, Any], int]:
+        """
+        Determine how getRegion reads tiles.  When reading sequentially, large
+        tiles reduce the per-tile overhead.  When reading in parallel, native
+        tiles spread the work across the workers.
+
+        :param tiled: True if the output is a TILED encoding, which is never
+            read in parallel.
+        :param kwargs: the getRegion parameters.
+        :returns: the parameters to use for the tile iterator and the number
+            of threads used to read tiles, or 0 to read sequentially.
+        """
+        max_workers = None
+        if 'tile_position' in kwargs or 'max_workers' in kwargs:
+            kwargs.pop('tile_position', None)
+            max_workers = kwargs.pop('max_workers', None)
+            if max_workers is not None and max_workers < 0:
+                max_workers = min(-max_workers, config.cpu_count(False))
+        if tiled or not max_workers or max_workers <= 1:
+            max_workers = 0
+            if not tiled and 'tile_offset' not in kwargs and 'tile_size' not in kwargs:
+                kwargs['tile_size'] = {
+                    'width': max(self.tileWidth, 4096),
+                    'height': max(self.tileHeight, 4096)}
+                kwargs['tile_offset'] = {'auto': True}
+        return kwargs, max_workers
+
+    def _getRegionTilesParallel(
+            self, tileIter: TileIterator, max_workers: int) -> np.ndarray:
+        """
+        Read the tiles of a tile iterator using a pool of threads and add them
+        to a single numpy array.  The threads decode the tiles; they are added
+        to the image in the calling thread as they finish, so compositing
+        doesn't need a lock.
+
+        :param tileIter: a tile iterator that yields numpy tiles.
+        :param max_workers: the maximum number of threads to use.
+        :returns: the region as a numpy array.
+        """
+        info = cast(dict[str, Any], tileIter.info)
+        regionWidth = info['region']['width']
+        regionHeight = info['region']['height']
+        top = info['region']['top']
+        left = info['region']['left']
+
+        def decodeTile(tile: LazyTileDict) -> tuple[int, int, np.ndarray]:
+            subimage, _ = _imageToNumpy(tile['tile'])
+            tile.release()
+            return tile['x'] - left, tile['y'] - top, subimage
+
+        image = None
+        for x0, y0, subimage in self._mapTilesParallel(decodeTile, tileIter, max_workers):
+            image = utilities._addSubimageToImage(
+                image, subimage, x0, y0, regionWidth, regionHeight)
+        return cast(np.ndarray, image)
+
     def _encodeTiledImage(
             self, image: dict[str, Any], outWidth: int, outHeight: int,
             iterInfo: dict[str, Any], **kwargs) -> tuple[pathlib.Path, str]:
@@ -2385,7 +2967,8 @@ class TileSource(IPyLeafletMixin):
             region, scale, tile_size, region_size, source_scale, dtype, chunk_mult,
             edge, pad_mode, pad_fill_mode, nchw, batch, prefetch, workers, tiles,
             regions, transform, randomize_chunks, seed, area_threshold, threshold_mask,
-            transform_save_mode, and transform_scale.
+            transform_save_mode, transform_scale, reuse_buffers, rank, world_size,
+            pad_shards, executor, chunk_alignment, batch_transform, and profile.
         :returns: An EagerIterator. Each iteration returns a dictionary with 'tile' as a
             SharedArray plus tile metadata including format, gx, gy, level_x, level_y,
             tile_position, width, height, level, magnification, mm_x, mm_y, gwidth, and
@@ -2511,7 +3094,8 @@ class TileSource(IPyLeafletMixin):
             yield that tile, where 0, 0 is the first tile yielded, and
             xmax - xmin - 1, ymax - ymin - 1 is the last tile yielded, or a
             dictionary of {level_x, level_y} to yield that specific tile if it
-            is in the region.
+            is in the region, or a list of numbers to only yield those tiles
+            in position order.
         :param tile_size: if present, retile the output to the specified tile
             size.  If only width or only height is specified, the resultant
             tiles will be square.  This is a dictionary containing at least
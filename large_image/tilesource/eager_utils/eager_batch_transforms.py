@@ -0,0 +1,326 @@
+"""Vectorized transforms applied to whole batches of tiles in eager workers.
+
+Each transform is called with a numpy array of shape (N, H, W, C) and returns a
+numpy array with N entries.  Transforms are applied to all of the tiles of a read
+chunk at once, so they avoid the per-tile Python overhead of tile transforms.
+"""
+
+import os
+import threading
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+# Reference H&E stain vectors and 99th percentile stain concentrations commonly
+# used for Macenko normalization, as columns of hematoxylin and eosin.
+MACENKO_REFERENCE_STAINS = np.array([
+    [0.5626, 0.2159],
+    [0.7201, 0.8012],
+    [0.4062, 0.5581],
+])
+MACENKO_REFERENCE_MAX_CONCENTRATIONS = np.array([1.9705, 1.0308])
+
+# Reinhard's RGB to LMS and log LMS to l-alpha-beta conversions
+_RGB_TO_LMS = np.array([
+    [0.3811, 0.5783, 0.0402],
+    [0.1967, 0.7244, 0.0782],
+    [0.0241, 0.1288, 0.8444],
+])
+_LOG_LMS_TO_LAB = np.diag([1 / np.sqrt(3), 1 / np.sqrt(6), 1 / np.sqrt(2)]) @ np.array([
+    [1, 1, 1],
+    [1, 1, -2],
+    [1, -1, 0],
+])
+
+
+def _restore_dtype(batch: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Cast a float batch back to the data type of the input batch.
+
+    :param batch: Float batch in the value range of the input.
+    :param dtype: Data type of the input batch.
+    :returns: The batch in the input data type.
+    """
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return np.clip(np.rint(batch), info.min, info.max).astype(dtype)
+    return batch.astype(dtype)
+
+
+class BatchCompose:
+    """Apply a sequence of batch transforms in order."""
+
+    def __init__(self, transforms: Sequence[Callable[[np.ndarray], np.ndarray]]):
+        """Create a composed batch transform.
+
+        :param transforms: Batch transforms to apply in order.
+        """
+        self.transforms = list(transforms)
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Apply each transform to a batch.
+
+        :param batch: An (N, H, W, C) numpy array.
+        :returns: The transformed batch.
+        """
+        for transform in self.transforms:
+            batch = transform(batch)
+        return batch
+
+
+class ToDtype:
+    """Convert a batch to another data type, optionally scaling its values."""
+
+    def __init__(self, dtype: np.typing.DTypeLike, scale: float | None = None):
+        """Create a data type conversion.
+
+        :param dtype: The output numpy data type.
+        :param scale: If not None, values are multiplied by this after conversion,
+            such as 1 / 255 to convert uint8 images to the range [0, 1].
+        """
+        self.dtype = np.dtype(dtype)
+        self.scale = scale
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Convert a batch.
+
+        :param batch: An (N, H, W, C) numpy array.
+        :returns: The converted batch.
+        """
+        batch = batch.astype(self.dtype)
+        if self.scale is not None:
+            batch *= self.dtype.type(self.scale)
+        return batch
+
+
+class Normalize:
+    """Subtract a mean and divide by a standard deviation for each channel."""
+
+    def __init__(self, mean: Sequence[float], std: Sequence[float]):
+        """Create a channel normalization.
+
+        :param mean: The mean of each channel.
+        :param std: The standard deviation of each channel.
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Normalize a batch.
+
+        :param batch: An (N, H, W, C) numpy array.
+        :returns: A float32 batch.
+        """
+        return (batch.astype(np.float32) - self.mean) / self.std
+
+
+class RandomFlipRotate:
+    """Randomly flip and rotate each tile of a batch by multiples of 90 degrees.
+
+    Tiles that are not square are only rotated by 0 or 180 degrees so that every
+    tile keeps its shape.
+    """
+
+    def __init__(self, flip: bool = True, rotate: bool = True, seed: int | None = None):
+        """Create a random flip and rotation.
+
+        :param flip: If True, tiles are mirrored horizontally half of the time.
+        :param rotate: If True, tiles are rotated by a random multiple of 90 degrees.
+        :param seed: Optional seed.  Each worker process or thread uses a generator
+            derived from the seed and its process and thread ids, so workers do not
+            repeat each other.
+        """
+        self.flip = flip
+        self.rotate = rotate
+        self.seed = seed
+        # Generators keyed by process and thread id; generators are not thread safe
+        self._rngs: dict[tuple[int, int], np.random.Generator] = {}
+
+    def _generator(self) -> np.random.Generator:
+        """Return the random generator of the current process and thread.
+
+        :returns: A numpy random generator.
+        """
+        key = (os.getpid(), threading.get_ident())
+        rng = self._rngs.get(key)
+        if rng is None:
+            rng = self._rngs[key] = np.random.default_rng(
+                None if self.seed is None else [self.seed, *key])
+        return rng
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Flip and rotate the tiles of a batch.
+
+        :param batch: An (N, H, W, C) numpy array.
+        :returns: The transformed batch.
+        """
+        rng = self._generator()
+        count = batch.shape[0]
+        flips = rng.integers(0, 2, count) if self.flip else np.zeros(count, dtype=int)
+        if not self.rotate:
+            turns = np.zeros(count, dtype=int)
+        elif batch.shape[1] == batch.shape[2]:
+            turns = rng.integers(0, 4, count)
+        else:
+            turns = rng.integers(0, 2, count) * 2
+        out = np.empty_like(batch)
+        # Apply each distinct operation to all of the tiles that use it
+        for op in np.unique(flips * 4 + turns):
+            idx = np.flatnonzero(flips * 4 + turns == op)
+            tiles = np.rot90(batch[idx], op % 4, axes=(1, 2))
+            out[idx] = tiles[:, :, ::-1] if op >= 4 else tiles
+        return out
+
+
+class ReinhardNormalize:
+    """Match the color statistics of each tile to target statistics.
+
+    Each tile is converted to Reinhard's l-alpha-beta color space, and each channel
+    is shifted and scaled so its mean and standard deviation match the target.
+    """
+
+    def __init__(self, target_mean: Sequence[float], target_std: Sequence[float]):
+        """Create a Reinhard color normalization.
+
+        :param target_mean: The target mean of the l, alpha, and beta channels.
+        :param target_std: The target standard deviation of the l, alpha, and beta
+            channels.
+        """
+        self.target_mean = np.asarray(target_mean, dtype=np.float64)
+        self.target_std = np.asarray(target_std, dtype=np.float64)
+
+    @staticmethod
+    def to_lab(batch: np.ndarray) -> np.ndarray:
+        """Convert RGB values in the range [0, 255] to l-alpha-beta.
+
+        :param batch: An array whose last axis has red, green, and blue.
+        :returns: A float64 array whose last axis has l, alpha, and beta.
+        """
+        lms = np.maximum(batch[..., :3].astype(np.float64) @ _RGB_TO_LMS.T, 1)
+        return np.log10(lms) @ _LOG_LMS_TO_LAB.T
+
+    @staticmethod
+    def from_lab(lab: np.ndarray) -> np.ndarray:
+        """Convert l-alpha-beta values back to RGB.
+
+        :param lab: An array whose last axis has l, alpha, and beta.
+        :returns: A float64 array whose last axis has red, green, and blue.
+        """
+        lms = 10 ** (lab @ np.linalg.inv(_LOG_LMS_TO_LAB).T)
+        return lms @ np.linalg.inv(_RGB_TO_LMS).T
+
+    @classmethod
+    def fit(cls, reference: np.ndarray) -> 'ReinhardNormalize':
+        """Create a normalization that matches the statistics of a reference image.
+
+        :param reference: An (H, W, C) RGB image with values in the range [0, 255].
+        :returns: A ReinhardNormalize instance.
+        """
+        lab = cls.to_lab(reference).reshape(-1, 3)
+        return cls(lab.mean(axis=0), lab.std(axis=0))
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Normalize the colors of a batch.
+
+        :param batch: An (N, H, W, C) RGB numpy array with values in the range
+            [0, 255].  Channels after the third are unchanged.
+        :returns: The normalized batch with the data type of the input.
+        """
+        lab = self.to_lab(batch)
+        mean = lab.mean(axis=(1, 2), keepdims=True)
+        std = np.maximum(lab.std(axis=(1, 2), keepdims=True), 1e-6)
+        rgb = self.from_lab((lab - mean) / std * self.target_std + self.target_mean)
+        out = batch.copy()
+        out[..., :3] = _restore_dtype(rgb, batch.dtype)
+        return out
+
+
+class MacenkoNormalize:
+    """Normalize the H&E stains of each tile with Macenko's method.
+
+    The hematoxylin and eosin stain vectors of each tile are estimated from the
+    extreme angles of its optical densities in the plane of their two main
+    components.  The stain concentrations are then rescaled and recombined with
+    reference stain vectors.  All tiles of a batch are processed together.
+    """
+
+    def __init__(
+        self,
+        stains: np.ndarray | None = None,
+        max_concentrations: np.ndarray | None = None,
+        intensity: float = 240,
+        alpha: float = 1,
+        beta: float = 0.15,
+        min_pixels: int = 16,
+    ):
+        """Create a Macenko stain normalization.
+
+        :param stains: Reference stain vectors as a 3x2 array with hematoxylin and eosin
+            columns.  Defaults to MACENKO_REFERENCE_STAINS.
+        :param max_concentrations: Reference 99th percentile concentrations of the
+            two stains.  Defaults to MACENKO_REFERENCE_MAX_CONCENTRATIONS.
+        :param intensity: Transmitted light intensity of the background.
+        :param alpha: Percentile of the angles used as the extreme stain directions.
+        :param beta: Minimum optical density of pixels used to estimate the stains.
+        :param min_pixels: Tiles with fewer stained pixels than this are unchanged.
+        """
+        self.stains = np.asarray(
+            MACENKO_REFERENCE_STAINS if stains is None else stains, dtype=np.float64)
+        self.max_concentrations = np.asarray(
+            MACENKO_REFERENCE_MAX_CONCENTRATIONS if max_concentrations is None
+            else max_concentrations, dtype=np.float64)
+        self.intensity = intensity
+        self.alpha = alpha
+        self.beta = beta
+        self.min_pixels = min_pixels
+
+    def _stain_vectors(self, od: np.ndarray, stained: np.ndarray) -> np.ndarray:
+        """Estimate the stain vectors of each tile.
+
+        :param od: An (N, P, 3) array of optical densities.
+        :param stained: An (N, P) boolean array of pixels used for the estimate.
+        :returns: An (N, 3, 2) array of hematoxylin and eosin stain vectors.
+        """
+        counts = stained.sum(axis=1)[:, None, None]
+        mean = np.where(stained[..., None], od, 0).sum(axis=1, keepdims=True) / counts
+        centered = np.where(stained[..., None], od - mean, 0)
+        cov = np.einsum('npi,npj->nij', centered, centered) / np.maximum(counts - 1, 1)
+        _, vectors = np.linalg.eigh(cov)
+        plane = vectors[:, :, 1:]
+        # Eigenvectors have an arbitrary sign; point them toward positive density
+        plane = plane * np.where(plane.sum(axis=1, keepdims=True) < 0, -1, 1)
+        projected = od @ plane
+        angles = np.where(stained, np.arctan2(projected[..., 1], projected[..., 0]), np.nan)
+        low, high = np.nanpercentile(angles, [self.alpha, 100 - self.alpha], axis=1)
+        v_low = np.einsum('nij,nj->ni', plane, np.stack([np.cos(low), np.sin(low)], axis=1))
+        v_high = np.einsum('nij,nj->ni', plane, np.stack([np.cos(high), np.sin(high)], axis=1))
+        # Hematoxylin has the larger red optical density
+        low_first = (v_low[:, 0] > v_high[:, 0])[:, None]
+        return np.stack([
+            np.where(low_first, v_low, v_high), np.where(low_first, v_high, v_low),
+        ], axis=2)
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        """Normalize the stains of a batch.
+
+        :param batch: An (N, H, W, C) RGB numpy array with values in the range
+            [0, 255].  Channels after the third are unchanged.
+        :returns: The normalized batch with the data type of the input.
+        """
+        count, height, width = batch.shape[:3]
+        rgb = batch[..., :3].reshape(count, -1, 3).astype(np.float64)
+        od = -np.log((rgb + 1) / self.intensity)
+        stained = np.all(od >= self.beta, axis=2)
+        valid = stained.sum(axis=1) >= self.min_pixels
+        out = batch.copy()
+        if not np.any(valid):
+            return out
+        od, stained = od[valid], stained[valid]
+        stains = self._stain_vectors(od, stained)
+        concentrations = np.linalg.pinv(stains) @ od.transpose(0, 2, 1)
+        max_concentrations = np.maximum(np.percentile(concentrations, 99, axis=2), 1e-6)
+        concentrations *= (self.max_concentrations / max_concentrations)[:, :, None]
+        normalized = self.intensity * np.exp(-self.stains @ concentrations)
+        out[valid, ..., :3] = _restore_dtype(
+            normalized.transpose(0, 2, 1).reshape(-1, height, width, 3), batch.dtype)
+        return out
+
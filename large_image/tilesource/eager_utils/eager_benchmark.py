@@ -0,0 +1,215 @@
+"""Throughput benchmark for the eager iterator.
+
+Run ``python -m large_image.tilesource.eager_utils.eager_benchmark`` to sweep
+worker, batch, prefetch, and chunk options over a synthetic source or image
+files and report tiles per second, worker utilization, queue starvation, and
+where the worker time was spent.
+"""
+
+import argparse
+import functools
+import itertools
+import json
+import sys
+import time
+from typing import Any
+
+from ..eageriterator import READ_PHASES, EagerIterator
+
+# Pixel size reported by synthetic sources, equivalent to 20x magnification
+SYNTHETIC_MM_PER_PIXEL = 0.0005
+
+
+@functools.cache
+def _synthetic_source_class():
+    """Create a test tile source class that reports a pixel size.
+
+    :returns: A subclass of the test tile source.
+    """
+    try:
+        import large_image_source_test
+    except ImportError:
+        msg = 'The synthetic benchmark source requires large-image-source-test'
+        raise ImportError(msg) from None
+
+    class SyntheticTileSource(large_image_source_test.TestTileSource):
+        """Test tile source with a fixed pixel size, as eager reads require one."""
+
+        cacheName = 'tilesource'
+        name = 'eager_benchmark'
+
+        def getNativeMagnification(self):
+            return {
+                'magnification': 0.01 / SYNTHETIC_MM_PER_PIXEL,
+                'mm_x': SYNTHETIC_MM_PER_PIXEL,
+                'mm_y': SYNTHETIC_MM_PER_PIXEL,
+            }
+
+    return SyntheticTileSource
+
+
+def synthetic_source(size: int = 8192, tile_size: int = 256, fractal: bool = True):
+    """Create a synthetic tile source for benchmarking.
+
+    Tiles are generated and PNG encoded on request, so reads include decoding.
+
+    :param size: Width and height of the image in pixels.
+    :param tile_size: Width and height of the native tiles.
+    :param fractal: If True, tiles contain a fractal pattern rather than a solid color.
+    :returns: A tile source.
+    """
+    return _synthetic_source_class()(
+        sizeX=size, sizeY=size, tileWidth=tile_size, tileHeight=tile_size, fractal=fractal)
+
+
+def benchmark_eager_iterator(
+    source, max_batches: int | None = None, **kwargs,
+) -> dict[str, Any]:
+    """Measure the throughput of one eager iterator configuration.
+
+    :param source: The tile source to read.
+    :param max_batches: If not None, stop after this many batches.
+    :param kwargs: EagerIterator options.  profile is always enabled.
+    :returns: A dictionary with the options, batches, tiles, startup seconds (to
+        create the iterator and queue the first reads), seconds (to iterate), tiles
+        per second, the fraction of batches that were requested before their reads
+        had finished, the total seconds waited for reads, the worker utilization
+        (busy worker seconds divided by workers times elapsed seconds), and the
+        fraction of worker time spent in each read phase.
+    """
+    start = time.perf_counter()
+    iterator = EagerIterator(source, profile=True, **kwargs)
+    startup = time.perf_counter() - start
+    totals: dict[str, Any] = dict.fromkeys(READ_PHASES, 0.0)
+    batches = tiles = starved = 0
+    waited = 0.0
+    start = time.perf_counter()
+    try:
+        for batch in iterator:
+            timing = batch['timing']
+            batches += 1
+            tiles += batch['tile'].shape[0]
+            starved += int(timing['starved'])
+            waited += timing['wait']
+            for phase in READ_PHASES:
+                totals[phase] += timing[phase]
+            batch['tile'].close()
+            if max_batches is not None and batches >= max_batches:
+                break
+    finally:
+        iterator.cleanup()
+    seconds = time.perf_counter() - start
+    busy = sum(totals.values())
+    workers = kwargs.get('workers', 16)
+    return {
+        **{key: value for key, value in kwargs.items() if not callable(value)},
+        'batches': batches,
+        'tiles': tiles,
+        'startup': startup,
+        'seconds': seconds,
+        'tiles_per_second': tiles / seconds if seconds else 0.0,
+        'starved': starved / batches if batches else 0.0,
+        'wait': waited,
+        'utilization': busy / (workers * (startup + seconds)),
+        **{f'{phase}_fraction': totals[phase] / busy if busy else 0.0
+           for phase in READ_PHASES},
+    }
+
+
+def sweep_eager_iterator(
+    source,
+    workers: list[int] | tuple[int, ...] = (4,),
+    batch: list[int] | tuple[int, ...] = (64,),
+    prefetch: list[int] | tuple[int, ...] = (4,),
+    chunk_mult: list[int] | tuple[int, ...] = (2,),
+    max_batches: int | None = None,
+    **kwargs,
+) -> list[dict[str, Any]]:
+    """Benchmark every combination of worker, batch, prefetch, and chunk options.
+
+    :param source: The tile source to read.
+    :param workers: Worker counts to test.
+    :param batch: Batch sizes to test.
+    :param prefetch: Prefetch depths to test.
+    :param chunk_mult: Chunk multipliers to test.
+    :param max_batches: If not None, stop each run after this many batches.
+    :param kwargs: Other EagerIterator options used for every run.
+    :returns: A list with the result of benchmark_eager_iterator for each run.
+    """
+    return [
+        benchmark_eager_iterator(
+            source, max_batches=max_batches, workers=run_workers, batch=run_batch,
+            prefetch=run_prefetch, chunk_mult=run_chunk_mult, **kwargs)
+        for run_workers, run_batch, run_prefetch, run_chunk_mult in itertools.product(
+            workers, batch, prefetch, chunk_mult)
+    ]
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="""
+Benchmark the eager iterator.  Every combination of the worker, batch,
+prefetch, and chunk multiplier values is run against each source.  If no
+sources are given, a synthetic source is used.
+""")
+    parser.add_argument(
+        'source', nargs='*', help='Paths of images to read')
+    parser.add_argument(
+        '--workers', type=int, nargs='+', default=[2, 4, 8],
+        help='Worker counts to test')
+    parser.add_argument(
+        '--batch', type=int, nargs='+', default=[64], help='Batch sizes to test')
+    parser.add_argument(
+        '--prefetch', type=int, nargs='+', default=[4], help='Prefetch depths to test')
+    parser.add_argument(
+        '--chunk-mult', type=int, nargs='+', default=[2], dest='chunk_mult',
+        help='Chunk multipliers to test')
+    parser.add_argument(
+        '--executor', choices=['process', 'thread', 'auto'], default='process',
+        help='Worker pool used for reads')
+    parser.add_argument(
+        '--tile-size', type=int, default=256, dest='tile_size', help='Output tile size')
+    parser.add_argument(
+        '--max-batches', type=int, dest='max_batches',
+        help='Stop each run after this many batches')
+    parser.add_argument(
+        '--synthetic-size', type=int, default=8192, dest='synthetic_size',
+        help='Width and height of the synthetic source')
+    parser.add_argument(
+        '--json', action='store_true', help='Output one JSON record per run')
+    return parser
+
+
+def main(args: list[str] | None = None) -> int:
+    """Run the benchmark from the command line.
+
+    :param args: Command line arguments.  Defaults to sys.argv.
+    :returns: A process exit code.
+    """
+    import large_image
+
+    opts = get_parser().parse_args(args)
+    sources = [(path, large_image.open(path)) for path in opts.source] or [
+        (f'synthetic {opts.synthetic_size}', synthetic_source(opts.synthetic_size))]
+    columns = ('workers', 'batch', 'prefetch', 'chunk_mult', 'tiles_per_second',
+               'utilization', 'starved') + tuple(f'{phase}_fraction' for phase in READ_PHASES)
+    if not opts.json:
+        sys.stdout.write('source\t' + '\t'.join(columns) + '\n')
+    for name, source in sources:
+        results = sweep_eager_iterator(
+            source, workers=opts.workers, batch=opts.batch, prefetch=opts.prefetch,
+            chunk_mult=opts.chunk_mult, max_batches=opts.max_batches,
+            executor=opts.executor,
+            tile_size={'width': opts.tile_size, 'height': opts.tile_size})
+        for result in results:
+            if opts.json:
+                sys.stdout.write(json.dumps({'source': name, **result}, default=str) + '\n')
+            else:
+                sys.stdout.write(name + '\t' + '\t'.join(
+                    f'{result[key]:.3f}' if isinstance(result[key], float) else str(result[key])
+                    for key in columns) + '\n')
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,16 @@
 """Share eager iterator callables with worker processes."""
 
 from collections.abc import Callable
+from typing import Any
 
 _eager_fns: dict[str, Callable | None] = {
     'transform': None,
     'transform_scale': None,
 }
 
+# Read arguments that are the same for every task of a worker process
+_worker_read_args: dict[str, Any] = {}
+
 
 def set_transform(fn: Callable) -> None:
     """Store the process-local eager transform callable.
@@ -51,3 +55,29 @@ def get_transform_scale() -> Callable | None:
     :returns: The callable set by set_transform_scale, or None if unset.
     """
     return _eager_fns['transform_scale']
+
+
+def set_worker_read_args(read_args: dict[str, Any]) -> None:
+    """Store the process-local arguments shared by every eager read task.
+
+    This is used as a process pool initializer so that the tile source,
+    transform, and slide dimensions are sent to each worker once rather than
+    with every task.
+
+    :param read_args: keyword arguments for EagerIterator.read other than
+        read_kwargs, sharrs, and offset.
+    :returns: None.
+    """
+    _worker_read_args.clear()
+    _worker_read_args.update(read_args)
+
+
+def get_worker_read_args() -> dict[str, Any]:
+    """Return the process-local arguments shared by every eager read task.
+
+    :returns: The arguments set by set_worker_read_args.
+    """
+    if not _worker_read_args:
+        msg = 'Eager worker read arguments not set in eager_utils.eager_fn'
+        raise ValueError(msg)
+    return _worker_read_args
@@ -1,5 +1,6 @@
 """Read argument planning helpers for eager tile and region batches."""
 
+from collections.abc import Callable, Iterator
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
@@ -36,6 +37,110 @@ def gen_read_args_complete_grid(sorted_tiles: np.ndarray, chunk_mult: int):
     return chunks
 
 
+def native_aligned_cuts(starts: np.ndarray, native_size: float, chunk_mult: int) -> np.ndarray:
+    """Choose where to cut chunks along one axis of the native tile grid.
+
+    A chunk boundary only avoids decoding a native tile twice if it falls on an
+    output tile edge that is also a native tile edge.  Each chunk spans at least
+    chunk_mult native tiles and is extended to the next such shared edge if one is
+    within four times that width; otherwise it is cut at the first output tile edge
+    past chunk_mult native tiles, and the last chunk takes the remaining tiles if
+    they fit in that width.
+
+    :param starts: Sorted, distinct output tile start positions in base pixels.
+    :param native_size: Native tile size of the read level in base pixels.
+    :param chunk_mult: Minimum chunk width, in native tiles.
+    :returns: The start position of each chunk.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    remainder = np.mod(starts, native_size)
+    aligned = np.minimum(remainder, native_size - remainder) < 0.5
+    target = native_size * chunk_mult
+    limit = target * 4
+    cuts = [0]
+    while True:
+        first = int(np.searchsorted(starts, starts[cuts[-1]] + target - 0.5))
+        if first >= len(starts):
+            break
+        within = aligned[first:] & (starts[first:] - starts[cuts[-1]] <= limit + 0.5)
+        if within.any():
+            cuts.append(first + int(np.argmax(within)))
+        elif starts[-1] - starts[cuts[-1]] <= limit:
+            break
+        else:
+            cuts.append(first)
+    return starts[cuts]
+
+
+def gen_read_args_native_grid(sorted_tiles: np.ndarray, slide_dimensions: dict, chunk_mult: int):
+    """Group tile read arguments into chunks aligned to the native tile grid.
+
+    Chunks are cut between output tiles where possible at edges shared with the
+    native tiles of the pyramid level chosen for reads, so adjacent chunks do not
+    decode the same native tiles.  See native_aligned_cuts.
+
+    :param sorted_tiles: Tile read argument array sorted by tile row and column.
+    :param slide_dimensions: Slide dimension metadata from calculate_slide_dimensions.
+    :param chunk_mult: Minimum width and height, in native tiles, of each chunk.
+    :returns: A list of numpy arrays, one per read chunk.
+    """
+    top = sorted_tiles[:, 4].astype(np.float64)
+    left = sorted_tiles[:, 6].astype(np.float64)
+    row_cuts = native_aligned_cuts(
+        np.unique(top), slide_dimensions['native_tile_height'], chunk_mult)
+    col_cuts = native_aligned_cuts(
+        np.unique(left), slide_dimensions['native_tile_width'], chunk_mult)
+    group_rows = np.searchsorted(row_cuts, top, side='right') - 1
+    group_cols = np.searchsorted(col_cuts, left, side='right') - 1
+    group_ids = group_rows * len(col_cuts) + group_cols
+
+    sort_idx = np.lexsort((sorted_tiles[:, 3], sorted_tiles[:, 2], group_ids))
+    sorted_tiles = sorted_tiles[sort_idx]
+    group_ids = group_ids[sort_idx]
+
+    split_indices = np.where(np.diff(group_ids) != 0)[0] + 1
+    return [np.array(chunk) for chunk in np.split(sorted_tiles, split_indices)]
+
+
+def count_native_tile_decodes(chunks: list, slide_dimensions: dict) -> tuple[int, int]:
+    """Count the native tiles decoded to read a list of chunks.
+
+    Each chunk is read as one region, so every native tile of the chosen level
+    that intersects the bounding box of the chunk is decoded.
+
+    :param chunks: Read argument chunks.
+    :param slide_dimensions: Slide dimension metadata from calculate_slide_dimensions.
+    :returns: The total number of native tile decodes and the number of distinct
+        native tiles decoded.
+    """
+    chunks = [chunk for chunk in chunks if len(chunk)]
+    if not chunks:
+        return 0, 0
+    rows = np.concatenate(chunks).astype(np.float64)
+    starts = np.cumsum([0] + [len(chunk) for chunk in chunks[:-1]])
+    tile_w = slide_dimensions['native_tile_width']
+    tile_h = slide_dimensions['native_tile_height']
+    grid_w = -(-slide_dimensions['base_size_x'] // tile_w)
+    grid_h = -(-slide_dimensions['base_size_y'] // tile_h)
+    left = np.clip(np.floor(np.minimum.reduceat(rows[:, 6], starts) / tile_w), 0, grid_w)
+    right = np.clip(np.ceil(np.maximum.reduceat(rows[:, 7], starts) / tile_w), 0, grid_w)
+    top = np.clip(np.floor(np.minimum.reduceat(rows[:, 4], starts) / tile_h), 0, grid_h)
+    bottom = np.clip(np.ceil(np.maximum.reduceat(rows[:, 5], starts) / tile_h), 0, grid_h)
+    valid = (right > left) & (bottom > top)
+    left, right, top, bottom = (
+        arr[valid].astype(np.int64) for arr in (left, right, top, bottom))
+    decodes = int(np.sum((right - left) * (bottom - top)))
+    # Mark the union of the chunk rectangles with a two dimensional difference
+    # array so the distinct tiles are counted without a loop over chunks
+    coverage = np.zeros((grid_h + 1, grid_w + 1), dtype=np.int64)
+    np.add.at(coverage, (top, left), 1)
+    np.add.at(coverage, (top, right), -1)
+    np.add.at(coverage, (bottom, left), -1)
+    np.add.at(coverage, (bottom, right), 1)
+    coverage = coverage.cumsum(axis=0).cumsum(axis=1)
+    return decodes, int(np.count_nonzero(coverage[:grid_h, :grid_w]))
+
+
 def sparse_chunks(
     sorted_in: np.ndarray,
     used: np.ndarray,
@@ -264,6 +369,7 @@ def gen_read_args_for_tiles(
     edge: bool = False,
     chunk_mult: int = 2,
     region: dict[str, Any] | None = None,
+    native_alignment: bool = False,
 ):
     """Generate grouped read arguments for output tiles.
 
@@ -273,6 +379,9 @@ def gen_read_args_for_tiles(
     :param edge: If True, discard tiles that extend beyond the base image.
     :param chunk_mult: Chunk side length multiplier; chunk size is chunk_mult squared.
     :param region: Optional region used to clip tile coordinates to region bounds.
+    :param native_alignment: If True, chunk boundaries are aligned to the native tile
+        grid of the chosen level so adjacent chunks do not decode the same native
+        tiles.  See gen_read_args_native_grid.
     :returns: A list of numpy arrays containing grouped tile read arguments.
     """
     chunk_size = chunk_mult**2
@@ -326,6 +435,11 @@ def gen_read_args_for_tiles(
         slide_dimensions['base_size_x'], slide_dimensions['base_size_y'], sorted_tiles, edge,
     )
 
+    if native_alignment:
+        if not sorted_tiles.shape[0]:
+            return []
+        return gen_read_args_native_grid(sorted_tiles, slide_dimensions, chunk_mult)
+
     # Determine if the grid is complete or incomplete even in the case of edges being removed
     if (sorted_tiles.shape[0] + diff_from_edge) == n_possible_tiles:
         chunks = gen_read_args_complete_grid(sorted_tiles, chunk_mult)
@@ -390,3 +504,159 @@ def default_region_coords_and_target_scale_from_read_args(
         slide_dimensions['conv_mm_x'],
         slide_dimensions['conv_mm_y'],
     )
+
+
+def interleave_slide_chunks(
+    chunk_counts: list[int] | Callable[[int], int],
+    policy: str = 'round_robin',
+    weights: list[float] | np.ndarray | None = None,
+    seed: int = 42,
+    window: int | None = None,
+    slides: int | None = None,
+) -> Iterator[tuple[int, int]]:
+    """Order the read chunks of several slides so batches mix slides.
+
+    The chunks of each slide keep their relative order.  Slides are started in
+    order, and at most window slides are interleaved at a time; when a slide has
+    no more chunks, the next slide is started.  The chunk count of a slide is
+    only requested when it is started, so slides can be planned lazily.
+
+    :param chunk_counts: Number of read chunks of each slide, or a function that
+        is called with a slide index and returns its number of chunks.
+    :param policy: 'round_robin' takes one chunk from each started slide in
+        turn.  'random' picks each chunk uniformly from the remaining chunks of
+        the started slides.  'weighted' picks the slide of each chunk with a
+        probability proportional to its weight among the started slides; slides
+        with a weight of zero are not started.
+    :param weights: Relative weight of each slide for the weighted policy.
+    :param seed: Random seed used by the random and weighted policies.
+    :param window: Maximum number of slides interleaved at once.  None
+        interleaves all slides.
+    :param slides: Number of slides.  This is required if chunk_counts is a
+        function.
+    :returns: An iterator of slide index and chunk index for each chunk.
+    """
+    if slides is None:
+        if callable(chunk_counts):
+            msg = 'slides must be provided if chunk_counts is a function'
+            raise ValueError(msg)
+        slides = len(chunk_counts)
+    rates = None
+    if policy == 'weighted':
+        if weights is None or len(weights) != slides:
+            msg = 'weights must be provided for each slide with the weighted policy'
+            raise ValueError(msg)
+        rates = np.asarray(weights, dtype=float)
+        if np.any(rates < 0) or not np.all(np.isfinite(rates)):
+            msg = 'weights must be finite and not negative'
+            raise ValueError(msg)
+    elif policy not in {'round_robin', 'random'}:
+        msg = "policy must be one of 'round_robin', 'random', or 'weighted'"
+        raise ValueError(msg)
+    if window is not None and window < 1:
+        msg = 'window must be at least 1'
+        raise ValueError(msg)
+    count = chunk_counts if callable(chunk_counts) else chunk_counts.__getitem__
+    return _interleave_slide_chunks(
+        count, slides, policy, rates, np.random.default_rng(seed), window or slides)
+
+
+def _interleave_slide_chunks(
+    count: Callable[[int], int],
+    slides: int,
+    policy: str,
+    rates: np.ndarray | None,
+    rng: np.random.Generator,
+    window: int,
+) -> Iterator[tuple[int, int]]:
+    """Yield the interleaved chunks of slides.  See interleave_slide_chunks.
+
+    :param count: A function returning the number of chunks of a slide.
+    :param slides: Number of slides.
+    :param policy: 'round_robin', 'random', or 'weighted'.
+    :param rates: Weight of each slide for the weighted policy.
+    :param rng: Random generator used by the random and weighted policies.
+    :param window: Maximum number of slides interleaved at once.
+    :returns: An iterator of slide index and chunk index for each chunk.
+    """
+    pending = iter(range(slides))
+    # Each entry is the slide, the index of its next chunk, and its chunk count
+    active: list[list[int]] = []
+
+    def start() -> None:
+        for slide in pending:
+            if rates is not None and not rates[slide]:
+                continue
+            chunks = count(slide)
+            if chunks > 0:
+                active.append([slide, 0, chunks])
+                return
+
+    while len(active) < window:
+        started = len(active)
+        start()
+        if len(active) == started:
+            break
+    turn = 0
+    while active:
+        if policy == 'round_robin':
+            idx = turn % len(active)
+        else:
+            if policy == 'random':
+                odds = np.array([entry[2] - entry[1] for entry in active], dtype=float)
+            else:
+                odds = np.array([rates[entry[0]] for entry in active])
+            idx = min(int(np.searchsorted(
+                np.cumsum(odds), rng.random() * odds.sum(), side='right')), len(active) - 1)
+        entry = active[idx]
+        yield entry[0], entry[1]
+        entry[1] += 1
+        if entry[1] < entry[2]:
+            turn = idx + 1
+        else:
+            # The following slide takes this turn; a new slide is added last
+            active.pop(idx)
+            turn = idx
+            start()
+
+
+def shard_read_args(
+    read_args: list, rank: int, world_size: int, pad: bool = False,
+) -> list:
+    """Select the read chunks for one of several distributed readers.
+
+    Chunks are split into contiguous runs with about the same number of rows,
+    so each reader keeps the spatial grouping of the chunks.  Every reader must
+    use the same chunk order.
+
+    :param read_args: Read argument chunks, as from gen_read_args_for_tiles.
+    :param rank: Index of this reader, from 0 to world_size - 1.
+    :param world_size: Number of readers.
+    :param pad: If True, repeat rows at the end of the shard so that every reader
+        has the same number of rows as the largest shard.
+    :returns: The read argument chunks for this reader.
+    """
+    if world_size < 1 or not 0 <= rank < world_size:
+        msg = 'rank must be at least 0 and less than world_size'
+        raise ValueError(msg)
+    if world_size == 1:
+        return read_args
+    lengths = np.array([len(reads) for reads in read_args], dtype=np.int64)
+    # Assign each chunk by the position of its middle row
+    middles = 2 * np.cumsum(lengths) - lengths
+    owners = middles * world_size // max(2 * int(lengths.sum()), 1)
+    shard = [reads for reads, owner in zip(read_args, owners, strict=True) if owner == rank]
+    if not pad or not len(read_args):
+        return shard
+    rows = int(lengths[owners == rank].sum())
+    missing = int(np.bincount(owners, weights=lengths, minlength=world_size).max()) - rows
+    # Repeat this shard's chunks, then the other chunks, as needed
+    candidates = shard + [reads for reads, owner in zip(read_args, owners, strict=True)
+                          if owner != rank]
+    idx = 0
+    while missing > 0:
+        reads = candidates[idx % len(candidates)][:missing]
+        shard.append(reads)
+        missing -= len(reads)
+        idx += 1
+    return shard
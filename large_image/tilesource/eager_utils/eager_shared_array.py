@@ -4,6 +4,7 @@ import contextlib
 import functools
 import multiprocessing.shared_memory
 import operator
+import threading
 import weakref
 from typing import TYPE_CHECKING, Any, Union, cast
 
@@ -23,6 +24,7 @@ class SharedArray:
         dtype: Any,
         is_torch: bool = False,
         enable_mm: bool = False,
+        shared: bool = True,
     ):
         """Create a shared-memory array.
 
@@ -30,6 +32,9 @@ class SharedArray:
         :param dtype: Numpy or torch dtype stored by the buffer.
         :param is_torch: If True, expose the buffer as a torch tensor.
         :param enable_mm: If True, create a second shared buffer for mm scale metadata.
+        :param shared: If False, the buffers are ordinary process memory.  These
+            arrays can only be filled by threads of the same process and cannot be
+            pickled.
         :returns: None.
         """
         self.shape = shape
@@ -37,11 +42,14 @@ class SharedArray:
         self.dtype = dtype
         self.buf: Any
         self.enable_mm = enable_mm
+        self.shared = shared
         self.mm_dtype = np.float32
         # Per-item runtime scale metadata in [mm_y, mm_x] order
         self.mm_shape = (shape[0], 2)
 
-        if is_torch:
+        if not shared:
+            self._create_local_buffers()
+        elif is_torch:
             import torch.multiprocessing
 
             self.shm_size = functools.reduce(operator.mul, shape, 1) * self.dtype.itemsize
@@ -61,7 +69,7 @@ class SharedArray:
             )
             self.buf = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm_array.buf)
 
-        if self.enable_mm:
+        if self.enable_mm and shared:
             # Shared 2D buffer aligned with batch index for runtime scale metadata
             mm_size = (
                 functools.reduce(operator.mul, self.mm_shape, 1) * np.dtype(self.mm_dtype).itemsize
@@ -75,12 +83,57 @@ class SharedArray:
 
         self.created = True
         self._closed = False
+        self._pool: SharedArrayPool | None = None
+
+    def _create_local_buffers(self) -> None:
+        """Allocate the buffers in process memory rather than shared memory.
+
+        The image buffer is kept flat so views can use a smaller logical shape.
+
+        :returns: None.
+        """
+        size = functools.reduce(operator.mul, self.shape, 1)
+        if self.is_torch:
+            import torch
+
+            self._local_buf = torch.empty(size, dtype=self.dtype)
+        else:
+            self._local_buf = np.empty(size, dtype=self.dtype)
+        self.shm_size = size * self._local_buf.itemsize
+        self.buf = self._local_buf.reshape(self.shape)
+        if self.enable_mm:
+            self.mm_buf = np.empty(self.mm_shape, dtype=self.mm_dtype)
+
+    def release(self) -> None:
+        """Return this array to the pool it came from so a later batch can reuse it.
+
+        Arrays that are not from a pool are closed.  After release, the contents of the
+        array can be overwritten at any time.
+
+        :returns: None.
+        """
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            self.close()
 
     def close(self) -> None:
         """Release the shared-memory resources owned by this array.
 
+        Arrays that belong to a pool are returned to the pool instead; the pool closes
+        them when it is closed.
+
         :returns: None.
         """
+        if getattr(self, '_pool', None) is not None:
+            self.release()
+            return
+        if not getattr(self, 'shared', True):
+            self._release_buffer('buf')
+            self._release_buffer('mm_buf')
+            self._release_buffer('_local_buf')
+            self._closed = True
+            return
         if self._closed or not hasattr(self, 'shm_array'):
             return
 
@@ -181,6 +234,15 @@ class SharedArray:
         """
         self.buf[i] = arr
 
+    def insert_batch(self, arr: np.ndarray, i: int):
+        """Insert consecutive items into the batch starting at a slot.
+
+        :param arr: Numpy array with one entry per item to insert.
+        :param i: Batch index of the first item.
+        :returns: None.
+        """
+        self.buf[i:i + len(arr)] = arr
+
     def insert_mm(self, mm_x: float, mm_y: float, i: int):
         """Insert per-item mm scale metadata into a batch slot.
 
@@ -202,7 +264,10 @@ class SharedArray:
         :returns: None.
         """
         self.shape = arr.shape
-        if self.is_torch:
+        if not self.shared:
+            self.buf = self._local_buf[:functools.reduce(operator.mul, self.shape, 1)].reshape(
+                self.shape)
+        elif self.is_torch:
             import torch
 
             self.buf = torch.frombuffer(self.shm_array.buf, dtype=self.dtype).reshape(self.shape)
@@ -222,6 +287,9 @@ class SharedArray:
 
         :returns: A numpy array or torch tensor backed by shared memory.
         """
+        if not self.shared:
+            return self._local_buf[:functools.reduce(operator.mul, self.shape, 1)].reshape(
+                self.shape)
         if self.is_torch:
             import torch
 
@@ -242,6 +310,8 @@ class SharedArray:
         if not self.enable_mm:
             msg = 'SharedArray mm metadata not enabled for this iterator.'
             raise RuntimeError(msg)
+        if not self.shared:
+            return self.mm_buf[:self.mm_shape[0]]
         return np.ndarray(self.mm_shape, self.mm_dtype, buffer=self.mm_shm_array.buf)
 
     # If we want easier interoperability, we could, instead, forward a
@@ -268,7 +338,11 @@ class SharedArray:
 
         :returns: A state dictionary with shared-memory names instead of buffer views.
         """
+        if not self.shared:
+            msg = 'SharedArray buffers in process memory cannot be pickled'
+            raise TypeError(msg)
         state = self.__dict__.copy()
+        state.pop('_pool', None)
         state.pop('shm', None)
         state.pop('buf', None)
         state.pop('mm_buf', None)
@@ -287,6 +361,7 @@ class SharedArray:
         shm_name = state.pop('shm_name')
         mm_shm_name = state.pop('mm_shm_name')
         self.__dict__.update(state)
+        self._pool = None
         self._closed = False  # Reset closed state when unpickling
         self._exported_refs: weakref.WeakSet[Any] = weakref.WeakSet()
         self.shm_array = multiprocessing.shared_memory.SharedMemory(shm_name)
@@ -311,3 +386,109 @@ class SharedArray:
         """
         with contextlib.suppress(Exception):
             self.close()
+
+
+class SharedArrayPool:
+    """A bounded set of reusable shared-memory arrays with the same shape and dtype."""
+
+    def __init__(
+        self,
+        shape: tuple | list,
+        dtype: Any,
+        is_torch: bool = False,
+        enable_mm: bool = False,
+        size: int = 0,
+        shared: bool = True,
+        maxsize: int | None = None,
+    ):
+        """Create a pool and preallocate its arrays.
+
+        :param shape: Shape of each image batch buffer.
+        :param dtype: Numpy or torch dtype stored by the buffers.
+        :param is_torch: If True, expose the buffers as torch tensors.
+        :param enable_mm: If True, the buffers also hold mm scale metadata.
+        :param size: Number of arrays to preallocate.
+        :param shared: If False, the buffers are ordinary process memory.
+        :param maxsize: Maximum number of arrays the pool keeps.  When every array is in
+            use, further arrays are allocated outside of the pool and freed when they are
+            released.  If None, this is the same as size.
+        :returns: None.
+        """
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.is_torch = is_torch
+        self.enable_mm = enable_mm
+        self.shared = shared
+        self.maxsize = max(size, maxsize if maxsize is not None else size, 1)
+        # Number of arrays allocated outside of the pool because it was exhausted
+        self.overflow = 0
+        self._lock = threading.Lock()
+        self._arrays: list[SharedArray] = []
+        self._free: list[SharedArray] = []
+        for _ in range(size):
+            self._free.append(self._create())
+
+    def _create(self) -> SharedArray:
+        """Allocate a new array that belongs to this pool.
+
+        :returns: The new SharedArray.
+        """
+        arr = SharedArray(
+            self.shape, self.dtype, self.is_torch, enable_mm=self.enable_mm, shared=self.shared)
+        arr._pool = self
+        self._arrays.append(arr)
+        return arr
+
+    @property
+    def allocated(self) -> int:
+        """Return the number of arrays that have been allocated by the pool.
+
+        :returns: The number of arrays.
+        """
+        return len(self._arrays)
+
+    def acquire(self) -> SharedArray:
+        """Get an unused array from the pool.
+
+        If every array is in use, a new one is added to the pool until the pool has
+        maxsize arrays.  After that, an array that is not part of the pool is allocated;
+        it is freed rather than kept when it is released, so a slow consumer can't grow
+        the pool's shared memory without limit.
+
+        :returns: A SharedArray with the pool's shape.
+        """
+        with self._lock:
+            if self._free:
+                arr = self._free.pop()
+            elif len(self._arrays) < self.maxsize:
+                arr = self._create()
+            else:
+                self.overflow += 1
+                return SharedArray(
+                    self.shape, self.dtype, self.is_torch, enable_mm=self.enable_mm,
+                    shared=self.shared)
+        if tuple(arr.shape) != self.shape:
+            arr.resize_shm(self.shape)
+        return arr
+
+    def release(self, arr: SharedArray) -> None:
+        """Return an array to the pool.  Releasing an array more than once is ignored.
+
+        :param arr: An array that was acquired from this pool.
+        :returns: None.
+        """
+        with self._lock:
+            if arr._pool is self and not any(free is arr for free in self._free):
+                self._free.append(arr)
+
+    def close(self) -> None:
+        """Close and unlink all of the arrays of the pool.
+
+        :returns: None.
+        """
+        with self._lock:
+            arrays, self._arrays, self._free = self._arrays, [], []
+        for arr in arrays:
+            arr._pool = None
+            with contextlib.suppress(Exception):
+                arr.close()
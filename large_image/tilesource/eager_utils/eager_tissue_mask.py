@@ -0,0 +1,103 @@
+"""Low-resolution tissue masks used to skip background tiles in eager reads."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import cachetools
+import numpy as np
+
+from ...constants import TILE_FORMAT_NUMPY
+
+if TYPE_CHECKING:
+    from ..base import TileSource
+
+# Thresholds below these are treated as noise on glass rather than tissue
+MIN_SATURATION_THRESHOLD = 0.15
+MIN_OPTICAL_DENSITY_THRESHOLD = 0.15
+
+_tissue_mask_cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=32)
+_tissue_mask_lock = threading.Lock()
+
+
+def otsu_threshold(values: np.ndarray, bins: int = 256) -> float:
+    """Compute the threshold that best separates values into two classes.
+
+    :param values: Array of values.
+    :param bins: Number of histogram bins used to search for the threshold.
+    :returns: The threshold; values above it are in the upper class.
+    """
+    hist, edges = np.histogram(values, bins=bins)
+    hist = hist.astype(float)
+    centers = (edges[:-1] + edges[1:]) / 2
+    weight_low = np.cumsum(hist)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(hist * centers)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_low = sum_low / weight_low
+        mean_high = (sum_low[-1] - sum_low) / weight_high
+        variance = weight_low * weight_high * (mean_low - mean_high) ** 2
+    variance = np.nan_to_num(variance[:-1])
+    if not len(variance) or not variance.max():
+        return float(edges[0])
+    return float(edges[int(np.argmax(variance)) + 1])
+
+
+def compute_tissue_mask(image: np.ndarray) -> np.ndarray:
+    """Find tissue in a low-resolution image of a slide.
+
+    A pixel is tissue if its saturation or its optical density is above the Otsu
+    threshold of that measure.  Glass is bright and unsaturated, so it is below
+    both thresholds.
+
+    :param image: Image with one to four bands.  Alpha is ignored and values are
+        scaled to the range of the image's data type.
+    :returns: A uint8 mask with 255 for tissue and 0 for background.
+    """
+    if image.ndim == 2:
+        image = image[:, :, np.newaxis]
+    if image.shape[2] in {2, 4}:
+        image = image[:, :, :-1]
+    if image.dtype == np.uint8:
+        rgb = image.astype(np.float32) / 255
+    elif np.issubdtype(image.dtype, np.integer):
+        rgb = image.astype(np.float32) / np.iinfo(image.dtype).max
+    else:
+        rgb = np.clip(image.astype(np.float32), 0, 1)
+    maxval = rgb.max(axis=2)
+    saturation = np.where(maxval > 0, (maxval - rgb.min(axis=2)) / np.maximum(maxval, 1e-6), 0)
+    optical_density = -np.log(np.clip(rgb, 1.0 / 255, 1)).mean(axis=2)
+    mask = optical_density > max(
+        otsu_threshold(optical_density), MIN_OPTICAL_DENSITY_THRESHOLD)
+    if rgb.shape[2] >= 3:
+        mask |= saturation > max(otsu_threshold(saturation), MIN_SATURATION_THRESHOLD)
+    return mask.astype(np.uint8) * 255
+
+
+def get_tissue_mask(source: TileSource, max_size: int = 1024) -> np.ndarray:
+    """Get a tissue mask for a whole slide from a low-resolution image.
+
+    Masks are cached per source and size, so tile lists can be filtered
+    repeatedly without reading the image again.
+
+    :param source: Tile source to analyze.
+    :param max_size: Maximum width and height of the image used for the mask.
+    :returns: A uint8 mask covering the whole slide with 255 for tissue and 0 for
+        background.
+    """
+    key = getattr(source, '_classkey', None)
+    if key is not None:
+        with _tissue_mask_lock:
+            mask = _tissue_mask_cache.get((key, max_size))
+        if mask is not None:
+            return mask
+    image, _ = source.getRegion(
+        output=dict(maxWidth=max_size, maxHeight=max_size), format=TILE_FORMAT_NUMPY,
+    )
+    mask = compute_tissue_mask(image)
+    mask.flags.writeable = False
+    if key is not None:
+        with _tissue_mask_lock:
+            _tissue_mask_cache[(key, max_size)] = mask
+    return mask
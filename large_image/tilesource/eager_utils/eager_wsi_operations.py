@@ -546,6 +546,21 @@ def _add_level(source: TileSource, slide_dimensions: dict[str, Any]) -> None:
     raise ValueError(msg)
 
 
+def _add_native_tile_grid(slide_dimensions: dict[str, Any], source_meta: dict[str, Any]) -> None:
+    """Populate the size of the native tiles of the chosen level in base pixels.
+
+    :param slide_dimensions: Slide dimension metadata with the chosen level.
+    :param source_meta: Tile-source metadata.
+    :returns: None.
+    """
+    level = slide_dimensions.get('level')
+    if level is None:
+        level = source_meta['levels'] - 1
+    scale = 2 ** max(0, source_meta['levels'] - 1 - int(level))
+    slide_dimensions['native_tile_width'] = source_meta['tileWidth'] * scale
+    slide_dimensions['native_tile_height'] = source_meta['tileHeight'] * scale
+
+
 def _add_output_dimensions(
     slide_dimensions: dict[str, Any],
     convert_scale_px: dict[str, Any],
@@ -609,6 +624,7 @@ def calculate_slide_dimensions(
         source, slide_dimensions, source_scale,
     )
     _add_level(source, slide_dimensions)
+    _add_native_tile_grid(slide_dimensions, source_meta)
     _add_output_dimensions(
         slide_dimensions, convert_scale_px, convert_scale_mm, base_scale_px,
     )
@@ -7,6 +7,7 @@ import multiprocessing
 import os
 import pickle
 import random
+import threading
 import time
 from collections import deque
 from collections.abc import Callable
@@ -21,16 +22,22 @@ from .. import tilesource
 from .eager_utils import eager_fn
 from .eager_utils.eager_image_modifications import pad_chunk_if_necessary, pad_tile, rgba2rgb
 from .eager_utils.eager_pytorch_threading_context import _PyTorchThreadingContext
-from .eager_utils.eager_read_args import (default_region_coords_and_target_scale_from_read_args,
+from .eager_utils.eager_read_args import (count_native_tile_decodes,
+                                          default_region_coords_and_target_scale_from_read_args,
                                           gen_read_args_for_regions,
-                                          gen_read_args_for_tiles)
-from .eager_utils.eager_shared_array import SharedArray
+                                          gen_read_args_for_tiles, shard_read_args)
+from .eager_utils.eager_shared_array import SharedArray, SharedArrayPool
+from .eager_utils.eager_tissue_mask import get_tissue_mask
 from .eager_utils.eager_wsi_operations import (calculate_slide_dimensions,
                                                return_relevant_tile_indexes_for_slide_dim,
                                                return_tile_slides_meeting_area_threshold)
 
 _EAGER_FN_TRANSFORM_SENTINEL = '__large_image_eager_fn__'
 _EAGER_FN_TRANSFORM_SCALE_SENTINEL = '__large_image_eager_fn_transform_scale__'
+# Parts of a worker read reported when profiling: computing read coordinates,
+# decoding and scaling in the tile source, slicing and padding tiles, applying
+# transforms, and copying into the batch
+READ_PHASES = ('plan', 'read', 'extract', 'transform', 'copy')
 
 
 class EagerIterator:
@@ -65,6 +72,14 @@ class EagerIterator:
         threshold_mask: float = 100,
         transform_save_mode: str | None = 'tile_x_y',
         transform_scale: Callable | None = None,
+        reuse_buffers: bool = False,
+        rank: int = 0,
+        world_size: int = 1,
+        pad_shards: bool = False,
+        executor: str = 'process',
+        chunk_alignment: str = 'output',
+        batch_transform: Callable | None = None,
+        profile: bool = False,
     ):
         """Initialize an eager iterator for batched tile or region reads.
 
@@ -72,6 +87,7 @@ class EagerIterator:
         :param output_mode: Output mode, either 'tiles' or 'regions'.
         :param tile_overlap: Optional x and y tile overlap as pixels or fractions.
         :param mask: Optional whole-slide mask array or mask image path used to filter tiles.
+            If 'auto', a tissue mask is computed from a low-resolution image of the slide.
         :param region: Optional source region with left, top, width, height, and units.
         :param scale: Optional target scale using magnification or mm_x and mm_y.
         :param tile_size: Optional output tile size with width and height in pixels.
@@ -95,9 +111,101 @@ class EagerIterator:
         :param threshold_mask: Minimum mask pixel value considered signal.
         :param transform_save_mode: Coordinate mode passed to three-argument transforms.
         :param transform_scale: Optional callable that customizes read coordinates and scale.
+        :param reuse_buffers: If True, batches are read into a fixed pool of shared arrays
+            rather than allocating new shared memory for each batch.  A batch's array is
+            returned to the pool when its release or close method is called or when the
+            next batch is requested, so its data must be copied before then.
+        :param rank: Index of this reader when world_size readers each read part of the
+            planned chunks, such as the ranks of distributed training.
+        :param world_size: Number of readers that share the planned chunks.  Every reader
+            must use the same options, including seed.
+        :param pad_shards: If True, repeat reads so every reader has the same number of
+            tiles or regions and therefore the same number of batches.
+        :param executor: 'process' reads in forked worker processes that fill shared
+            memory.  'thread' reads in threads of this process that fill batch buffers in
+            process memory; this avoids fork and shared-memory costs for sources that
+            decode without holding the GIL.  'auto' uses threads if the source is known
+            to release the GIL and processes otherwise.
+        :param chunk_alignment: 'output' groups tiles into chunks of chunk_mult by
+            chunk_mult output tiles and, for partial tile lists, by proximity.
+            'native' cuts chunks at output tile edges that are also edges of the
+            native tiles of the pyramid level used for reads, so adjacent chunks do not
+            decode the same native tiles; chunk_mult is then the minimum chunk width in
+            native tiles, and chunks may be up to four times wider to reach a shared
+            edge.  Region reads are always grouped by proximity.  The
+            decode_amplification attribute reports how many times, on average, each
+            native tile is decoded.
+        :param batch_transform: Optional callable applied in the workers to all of the
+            tiles or regions of a read chunk at once.  It is called with a numpy array
+            of shape (N, H, W, C), after transform if that is also given, and must
+            return a numpy array with N entries, which is written directly into the
+            batch.  See eager_utils.eager_batch_transforms for vectorized flips,
+            rotations, color normalization, and data type conversion.  The output is
+            transposed to channel-first order as it is written if nchw is True.
+        :param profile: If True, each batch has a 'timing' entry with how long the
+            iterator waited for the batch, whether its reads were still running when it
+            was requested, how many batches were queued, and the worker seconds spent
+            in each part of its reads.  See _batch_timing.
         :returns: None. Iteration yields dictionaries containing image data and metadata.
         """
         logging.getLogger('tifftools').setLevel(logging.WARNING)
+        self.executor = self._resolve_executor(executor, [source])
+        self.read_kwargs = self._plan_reads(
+            source, output_mode=output_mode, tile_overlap=tile_overlap, mask=mask,
+            region=region, scale=scale, tile_size=tile_size, region_size=region_size,
+            source_scale=source_scale, dtype=dtype, chunk_mult=chunk_mult, edge=edge,
+            pad_mode=pad_mode, pad_fill_mode=pad_fill_mode, nchw=nchw, batch=batch,
+            workers=workers, tiles=tiles, regions=regions, transform=transform,
+            randomize_chunks=randomize_chunks, seed=seed, area_threshold=area_threshold,
+            threshold_mask=threshold_mask, transform_save_mode=transform_save_mode,
+            transform_scale=transform_scale, chunk_alignment=chunk_alignment,
+            batch_transform=batch_transform, profile=profile,
+        )
+        self.read_kwargs = shard_read_args(self.read_kwargs, rank, world_size, pad_shards)
+        self._start(workers, batch, prefetch, reuse_buffers)
+
+    def _plan_reads(
+        self,
+        source: 'tilesource.TileSource',
+        *,
+        output_mode: str = 'tiles',
+        tile_overlap: dict[str, int] | dict[str, float] | None = None,
+        mask: np.ndarray | str | os.PathLike | None = None,
+        region: dict[str, Any] | None = None,
+        scale: dict[str, Any] | None = None,
+        tile_size: dict[str, int] | None = None,
+        region_size: dict[str, int] | None = None,
+        source_scale: dict[str, Any] | None = None,
+        dtype: np.typing.DTypeLike = np.uint8,
+        chunk_mult: int = 2,
+        edge: bool = False,
+        pad_mode: str = 'wsi_edge',
+        pad_fill_mode: str = 'default',
+        nchw: bool = False,
+        batch: int = 64,
+        workers: int = 16,
+        tiles: list | np.ndarray | None = None,
+        regions: list | np.ndarray | None = None,
+        transform: Callable | None = None,
+        randomize_chunks: bool = False,
+        seed: int = 42,
+        area_threshold: float = 0.25,
+        threshold_mask: float = 100,
+        transform_save_mode: str | None = 'tile_x_y',
+        transform_scale: Callable | None = None,
+        chunk_alignment: str = 'output',
+        batch_transform: Callable | None = None,
+        profile: bool = False,
+    ) -> list:
+        """Plan the reads of a source without starting workers.
+
+        This sets the source, slide dimensions, output shape, and other read
+        options on this iterator.  The executor must already be set.  See the
+        constructor for the parameters.
+
+        :param source: Tile source used to read image data.
+        :returns: Read argument chunks for worker submission.
+        """
         self.source = source
         self._validate_init_args(
             output_mode, regions, scale, tile_size, tile_overlap, pad_mode, workers,
@@ -116,20 +224,63 @@ class EagerIterator:
         self._worker_transform = self._prepare_worker_transform(self.transform)
         self._worker_transform_scale = self._prepare_worker_transform_scale(self.transform_scale)
         self._enable_dynamic_mm = self._worker_transform_scale is not None
-        self.read_kwargs = self._build_read_kwargs(output_mode, tiles, regions, edge, chunk_mult)
+        read_kwargs = self._build_read_kwargs(
+            output_mode, tiles, regions, edge, chunk_mult, chunk_alignment,
+        )
+        self.native_tile_decodes, self.native_tiles = count_native_tile_decodes(
+            read_kwargs, self.slide_dimensions,
+        )
 
         if randomize_chunks:
             random.seed(seed)
-            random.shuffle(self.read_kwargs)
+            random.shuffle(read_kwargs)
 
-        self._configure_transform_scale(transform_scale)
+        self._configure_transform_scale(transform_scale, read_kwargs)
+        self.batch_transform = batch_transform
+        self.profile = profile
         self._setup_out_dims()
+        return read_kwargs
 
-        from concurrent.futures import ProcessPoolExecutor
+    @staticmethod
+    def _resolve_executor(executor: str, sources: list) -> str:
+        """Pick the kind of worker pool used for reads.
 
-        self.pool = ProcessPoolExecutor(
-            max_workers=workers, mp_context=multiprocessing.get_context('fork'),
-        )
+        :param executor: 'process', 'thread', or 'auto'.
+        :param sources: The tile sources that will be read.
+        :returns: 'process' or 'thread'.
+        """
+        if executor not in {'process', 'thread', 'auto'}:
+            msg = "executor must be one of 'process', 'thread', or 'auto'"
+            raise ValueError(msg)
+        if executor == 'auto':
+            return 'thread' if all(
+                getattr(source, '_releasesGIL', False) for source in sources) else 'process'
+        return executor
+
+    def _start(self, workers: int, batch: int, prefetch: int, reuse_buffers: bool) -> None:
+        """Start the worker processes and prefetch the first reads.
+
+        :param workers: Number of worker processes used for image reads.
+        :param batch: Number of tiles or regions returned in each batch.
+        :param prefetch: Number of batches to keep queued ahead of iteration.
+        :param reuse_buffers: If True, read batches into a pool of shared arrays.
+        :returns: None.
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        self._local_read_args: dict[str, Any] | None = None
+        if self.executor == 'thread':
+            self._local_read_args = self._worker_read_args()
+            self.pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Each worker gets the source and other per-iterator arguments once
+            # when it starts; tasks only send their read arguments and buffers.
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                initializer=eager_fn.set_worker_read_args,
+                initargs=(self._worker_read_args(),),
+            )
+        self.reuse_buffers = reuse_buffers
         self._initialize(batch, prefetch)
 
     def _validate_init_args(
@@ -153,20 +304,24 @@ class EagerIterator:
         :param workers: Number of worker processes used for image reads.
         :returns: None.
         """
-        self._validate_worker_count(workers)
+        self._validate_worker_count(workers, getattr(self, 'executor', 'process'))
         self._validate_output_mode(output_mode, regions, pad_mode)
         self._validate_scale(scale)
         self._validate_tile_size(tile_size)
         self._validate_tile_overlap(tile_overlap)
 
     @staticmethod
-    def _validate_worker_count(workers: int) -> None:
+    def _validate_worker_count(workers: int, executor: str = 'process') -> None:
         """Validate the worker count.
 
         :param workers: Number of worker processes used for image reads.
+        :param executor: 'process' or 'thread'.
         :returns: None.
         """
-        if workers <= 1:
+        if executor == 'thread' and workers < 1:
+            msg = 'Eager iterator requires at least 1 worker thread'
+            raise ValueError(msg)
+        if executor != 'thread' and workers <= 1:
             msg = 'Eager iterator requires at least 2 workers'
             raise ValueError(msg)
 
@@ -368,7 +523,9 @@ class EagerIterator:
 
         :returns: Tile indexes that pass the mask threshold, or the original tile indexes.
         """
-        if isinstance(mask, (str, os.PathLike)) and os.path.exists(mask):
+        if isinstance(mask, str) and mask == 'auto':
+            mask = get_tissue_mask(self.source)
+        elif isinstance(mask, (str, os.PathLike)) and os.path.exists(mask):
             mask = np.array(Image.open(os.fspath(mask)).convert('L'))
         if isinstance(mask, np.ndarray):
             return return_tile_slides_meeting_area_threshold(
@@ -460,11 +617,15 @@ class EagerIterator:
         regions: list | np.ndarray | None,
         edge: bool,
         chunk_mult: int,
+        chunk_alignment: str = 'output',
     ) -> list:
         """Build worker read argument chunks for the selected output mode.
 
         :returns: Read argument chunks for worker submission.
         """
+        if chunk_alignment not in {'native', 'output'}:
+            msg = "chunk_alignment must be either 'native' or 'output'"
+            raise ValueError(msg)
         if output_mode == 'regions':
             assert isinstance(regions, (list, np.ndarray)), 'Regions must be a list or numpy array'
             return gen_read_args_for_regions(
@@ -479,26 +640,31 @@ class EagerIterator:
             return gen_read_args_for_tiles(
                 n_possible_tiles, self.slide_dimensions, tiles, edge=edge,
                 chunk_mult=chunk_mult, region=self.region,
+                native_alignment=chunk_alignment == 'native',
             )
         msg = 'Supplied output mode must be either tiles or regions'
         raise ValueError(msg)
 
-    def _configure_transform_scale(self, transform_scale: Callable | None) -> None:
+    def _configure_transform_scale(
+        self, transform_scale: Callable | None, read_kwargs: list,
+    ) -> None:
         """Validate and register a transform-scale callable.
 
         :param transform_scale: Optional callable that customizes read coordinates and scale.
+        :param read_kwargs: The planned read argument chunks.
         :returns: None.
         """
         if transform_scale is None:
             return
-        transform_scale_result = self._call_transform_scale_probe(transform_scale)
+        transform_scale_result = self._call_transform_scale_probe(transform_scale, read_kwargs)
         self._validate_transform_scale_result(transform_scale_result)
         eager_fn.set_transform_scale(transform_scale)
 
-    def _call_transform_scale_probe(self, transform_scale: Callable) -> tuple:
+    def _call_transform_scale_probe(self, transform_scale: Callable, read_kwargs: list) -> tuple:
         """Call transform_scale once to validate its signature and output.
 
         :param transform_scale: Callable that computes custom read coordinates and scale.
+        :param read_kwargs: The planned read argument chunks; the first is used.
         :returns: The transform_scale probe result.
         """
         import inspect
@@ -510,7 +676,7 @@ class EagerIterator:
             )
             raise ValueError(msg)
         try:
-            return transform_scale(self.read_kwargs[0], self.slide_dimensions)
+            return transform_scale(read_kwargs[0], self.slide_dimensions)
         except Exception as e:
             msg = f'Provided transform_scale test call failed.  Error: {e}'
             raise ValueError(msg) from e
@@ -599,6 +765,9 @@ class EagerIterator:
                 raise ValueError(msg)
             self._setup_out_dims_for_transform()
 
+        if self.batch_transform is not None:
+            self._setup_out_dims_for_batch_transform()
+
         if self.nchw:
             self.out_dims = (self.out_dims[0], self.out_dims[3], self.out_dims[1], self.out_dims[2])
 
@@ -704,6 +873,28 @@ class EagerIterator:
             )
             raise ValueError(msg)
 
+    def _setup_out_dims_for_batch_transform(self):
+        """Infer output shape and dtype after applying a batch transform.
+
+        :returns: None.
+        """
+        if self.is_torch:
+            msg = 'batch_transform requires transform to return numpy arrays'
+            raise ValueError(msg)
+        if not callable(self.batch_transform):
+            msg = 'batch_transform must be a callable'
+            raise ValueError(msg)
+        dtype = self.dtype if self.transform is not None else self.source.dtype
+        test_out = self.batch_transform(np.zeros((1, *self.out_dims[1:]), dtype=dtype))
+        if not isinstance(test_out, np.ndarray) or test_out.ndim != 4 or len(test_out) != 1:
+            msg = (
+                'batch_transform must return a numpy array with an (H, W, C) entry for '
+                'each input tile'
+            )
+            raise ValueError(msg)
+        self.dtype = test_out.dtype
+        self.out_dims = (self.out_dims[0], *test_out.shape[1:])
+
     def _initialize(self, batch: int, prefetch: int):
         """Initialize queue state and prefetch the first reads.
 
@@ -716,6 +907,21 @@ class EagerIterator:
         self.queue: deque[Any] = deque([])  # hold futures defining read operations
         self.overflow = 0  # count of tile overrun for latest batch
         self.pos = 0  # position in read_kwargs
+        self.batch_index = 0  # index of the next batch returned by __next__
+        # The planned chunk order, used to record the current order in state_dict
+        self._planned_read_kwargs = list(self.read_kwargs)
+        # The most recently returned batch, released when the next one is requested
+        self._last_tiles: SharedArray | None = None
+        # Reads of the previous batch, so reads that span batches are profiled once
+        self._profiled_futures: set = set()
+        self.buffer_pool: SharedArrayPool | None = None
+        if getattr(self, 'reuse_buffers', False):
+            # Queued batches, the batch held by the caller, and a batch that a
+            # read spanning a batch boundary can add
+            self.buffer_pool = SharedArrayPool(
+                self.out_dims, self.dtype, self.is_torch, enable_mm=self._enable_dynamic_mm,
+                size=prefetch + 2, maxsize=prefetch + 2, shared=self.executor != 'thread',
+            )
         self._fill()
 
     def __iter__(self):
@@ -760,13 +966,22 @@ class EagerIterator:
         """
         if hasattr(self, 'pool'):
             self.pool.shutdown(wait=wait, cancel_futures=True)
-        # Clear any remaining shared arrays in the queue
+        self._clear_queue()
+        if getattr(self, 'buffer_pool', None) is not None:
+            self.buffer_pool.close()
+
+    def _clear_queue(self, timeout: float | None = 5) -> None:
+        """Wait for queued reads and release their shared-memory buffers.
+
+        :param timeout: Maximum seconds to wait for the reads of each batch.
+        :returns: None.
+        """
         while self.queue:
             try:
                 futures, tiles, batch_kwargs = self.queue.pop()
                 # Wait for futures to complete before cleanup
                 if futures:
-                    wait_futures(futures, timeout=5, return_when=ALL_COMPLETED)
+                    wait_futures(futures, timeout=timeout, return_when=ALL_COMPLETED)
                 try:
                     # Prefer explicit close to avoid BufferError on shutdown
                     if hasattr(tiles, 'close'):
@@ -775,6 +990,10 @@ class EagerIterator:
                     del tiles
             except Exception:
                 pass  # Ignore cleanup errors
+        if self._last_tiles is not None:
+            with contextlib.suppress(Exception):
+                self._last_tiles.release()
+        self._last_tiles = None
 
     def __del__(self):
         """Clean up worker resources during object destruction.
@@ -786,6 +1005,144 @@ class EagerIterator:
         with contextlib.suppress(Exception):
             self.cleanup(wait=False)
 
+    def __len__(self) -> int:
+        """Return the number of batches in one pass over the planned reads.
+
+        :returns: The number of batches.
+        """
+        return math.ceil(self.get_output_image_count() / self.batch)
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        """Read one batch independently of the iteration position.
+
+        The batch contains the same tiles or regions that iteration returns at
+        this position in the current chunk order.  Only the chunks that overlap
+        the batch are read.
+
+        :param index: Index of the batch; negative values count from the end.
+        :returns: A dictionary like those returned by iteration.  The caller
+            should close the SharedArray under 'tile' when done with it.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = 'batch index out of range'
+            raise IndexError(msg)
+        tiles = SharedArray(
+            self.out_dims, self.dtype, self.is_torch, enable_mm=self._enable_dynamic_mm,
+            shared=self.executor != 'thread',
+        )
+        try:
+            with _PyTorchThreadingContext() if self.is_torch else contextlib.nullcontext():
+                futures, _, _, read_kwargs = self._submit_batch_reads(index, [tiles])
+            wait_futures(futures, timeout=None, return_when=ALL_COMPLETED)
+            for future in futures:
+                future.result()
+        except Exception:
+            tiles.close()
+            raise
+        batch_read_kwargs = read_kwargs[:self.batch]
+        if len(batch_read_kwargs) < self.batch:
+            tiles.resize_shm([len(batch_read_kwargs), *tiles.shape[1:]])
+        return self._tiles_and_read_kwargs_to_dict(tiles, batch_read_kwargs)
+
+    def state_dict(self) -> dict[str, Any]:
+        """Return a cursor that can resume iteration with load_state_dict.
+
+        :returns: A JSON-serializable dictionary with the index of the next batch,
+            the batch size, and the current order of the planned read chunks.
+        """
+        planned = {id(reads): idx for idx, reads in enumerate(self._planned_read_kwargs)}
+        return {
+            'batch_index': self.batch_index,
+            'batch': self.batch,
+            'order': [planned[id(reads)] for reads in self.read_kwargs],
+        }
+
+    def load_state_dict(self, state: dict[str, Any]) -> None:
+        """Resume iteration from a cursor returned by state_dict.
+
+        Queued reads are discarded and reading restarts at the recorded batch, so
+        batches that were already consumed are not read again.  The iterator must
+        have been created with the same options as the one that made the cursor.
+
+        :param state: A dictionary returned by state_dict.
+        :returns: None.
+        """
+        if state['batch'] != self.batch or sorted(state['order']) != list(
+                range(len(self._planned_read_kwargs))):
+            msg = 'The state does not match the batch size and reads of this iterator'
+            raise ValueError(msg)
+        self._clear_queue(timeout=None)
+        self.read_kwargs = [self._planned_read_kwargs[idx] for idx in state['order']]
+        self._seek(state['batch_index'])
+
+    def _chunk_starts(self) -> np.ndarray:
+        """Return the first output row of each read chunk.
+
+        :returns: An array with the first row of each chunk followed by the total
+            number of rows.
+        """
+        return np.concatenate([[0], np.cumsum([len(reads) for reads in self.read_kwargs])])
+
+    def _submit_batch_reads(
+        self, index: int, tiles: list, span: bool = False,
+    ) -> tuple[list, list, int, np.ndarray]:
+        """Submit the reads of the chunks that overlap one batch.
+
+        Rows of the chunks that fall before the batch are discarded.
+
+        :param index: Index of the batch.
+        :param tiles: A list with the SharedArray for the batch.  This is modified.
+        :param span: If True and the last chunk extends past the batch, arrays are
+            added to tiles for the batches it spans.  Otherwise, rows after the
+            batch are discarded.
+        :returns: The submitted futures, the arrays, the index of the first chunk
+            after the submitted chunks, and the read arguments of the rows from the
+            start of the batch to the end of the last submitted chunk.
+        """
+        starts = self._chunk_starts()
+        first_row = index * self.batch
+        end_row = min(first_row + self.batch, int(starts[-1]))
+        first_chunk = int(np.searchsorted(starts, first_row, side='right')) - 1
+        end_chunk = int(np.searchsorted(starts, end_row, side='left'))
+        futures = []
+        for chunk in range(first_chunk, end_chunk):
+            reads = self.read_kwargs[chunk]
+            offset = int(starts[chunk]) - first_row
+            # Skip whole batches before this one; their rows are not stored
+            lead = -(offset // self.batch)
+            spanned = math.ceil((len(reads) + offset) / self.batch)
+            while span and len(tiles) < spanned:
+                tiles.append(self._new_shared_array())
+            sharrs = [None] * lead + [
+                tiles[idx] if idx < len(tiles) else None for idx in range(spanned)]
+            futures.append(self._submitfn(reads, sharrs, offset + lead * self.batch))
+        read_kwargs = np.concatenate(self.read_kwargs[first_chunk:end_chunk], axis=0)
+        read_kwargs = read_kwargs[first_row - int(starts[first_chunk]):]
+        return futures, tiles, end_chunk, read_kwargs
+
+    def _seek(self, index: int) -> None:
+        """Restart queued reads so that the next batch has a specific index.
+
+        :param index: Index of the next batch to return.
+        :returns: None.
+        """
+        self.batch_index = index
+        self.pos = len(self.read_kwargs)
+        self.overflow = 0
+        if index < len(self):
+            with _PyTorchThreadingContext() if self.is_torch else contextlib.nullcontext():
+                futures, tiles, self.pos, batch_kwargs = self._submit_batch_reads(
+                    index, [self._new_shared_array()], span=True)
+            self.overflow = len(batch_kwargs) % self.batch
+            # As in _fill, later batches spanned by the last read wait on its future
+            futures = [futures] + (len(tiles) - 1) * [[futures[-1]]]
+            for f, t, start in zip(futures, tiles, range(0, len(batch_kwargs), self.batch),
+                                   strict=True):
+                self.queue.appendleft((f, t, batch_kwargs[start: start + self.batch]))
+        self._fill()
+
     def get_output_image_count(self):
         """Return the number of output images planned by this iterator.
 
@@ -796,12 +1153,28 @@ class EagerIterator:
             count += len(read_kwargs)
         return count
 
+    @property
+    def decode_amplification(self) -> float:
+        """Return the average number of times each native tile is decoded.
+
+        A value of 1 means that no native tile of the read level is decoded for
+        more than one chunk.
+
+        :returns: Native tile decodes of the planned chunks divided by the number of
+            distinct native tiles they cover.
+        """
+        if not self.native_tiles:
+            return 1.0
+        return self.native_tile_decodes / self.native_tiles
+
     def __next__(self):
         """Return the next eager batch.
 
         :returns: A dictionary containing a SharedArray under 'tile' and read metadata arrays.
         """
-        # TODO: develop method for random batch retrieval
+        if self._last_tiles is not None:
+            self._last_tiles.release()
+            self._last_tiles = None
         if self.pos >= len(self.read_kwargs) and not len(self.queue):
             if self.randomize_chunks:
                 random.shuffle(self.read_kwargs)
@@ -824,10 +1197,13 @@ class EagerIterator:
                         futures_flat.append(future_list)
             else:
                 futures_flat = futures if isinstance(futures, list) else [futures]
+            ready = all(future.done() for future in futures_flat)
+            wait_start = time.perf_counter()
             wait_futures(futures_flat, timeout=None, return_when=ALL_COMPLETED)
+            waited = time.perf_counter() - wait_start
             # Check for exceptions in futures - this will raise if any future had an exception
-            for future in futures_flat:
-                future.result()  # This will raise any exception that occurred in the worker process
+            results = [future.result() for future in futures_flat]
+            queued = len(self.queue)
             self._fill()
         except Exception as e:
             # Add exception for read operation in multiprocessing pool to allow user to be aware
@@ -842,7 +1218,45 @@ class EagerIterator:
             # issues if using pytorch tensors
             tiles.resize_shm([len(batch_read_kwargs), *tiles.shape[1:]])
 
-        return self._tiles_and_read_kwargs_to_dict(tiles, batch_read_kwargs)
+        if self.buffer_pool is not None:
+            self._last_tiles = tiles
+        self.batch_index += 1
+        result = self._tiles_and_read_kwargs_to_dict(tiles, batch_read_kwargs)
+        if self.profile:
+            result['timing'] = self._batch_timing(futures_flat, results, waited, ready, queued)
+        return result
+
+    def _batch_timing(
+        self, futures: list, results: list, waited: float, ready: bool, queued: int,
+    ) -> dict[str, Any]:
+        """Summarize the profiled reads of a batch.
+
+        :param futures: The futures of the reads of the batch.
+        :param results: The timing dictionary returned by each read.
+        :param waited: Seconds that __next__ waited for the reads.
+        :param ready: True if every read had finished when the batch was requested.
+        :param queued: Number of other batches in the queue when the batch was requested.
+        :returns: A dictionary with wait, starved, queued, reads, tiles, workers, and
+            the worker seconds of each read phase: plan, read (decoding and scaling by
+            the tile source), extract (slicing and padding), transform, and copy.  A
+            read that spans batches is only counted in the first of them.
+        """
+        timing: dict[str, Any] = {
+            'wait': waited, 'starved': not ready, 'queued': queued, 'reads': 0, 'tiles': 0,
+        }
+        timing.update(dict.fromkeys(READ_PHASES, 0.0))
+        workers = set()
+        for future, read_timing in zip(futures, results, strict=True):
+            if read_timing is None or future in self._profiled_futures:
+                continue
+            timing['reads'] += 1
+            timing['tiles'] += read_timing['tiles']
+            for phase in READ_PHASES:
+                timing[phase] += read_timing[phase]
+            workers.add(read_timing['worker'])
+        timing['workers'] = len(workers)
+        self._profiled_futures = set(futures)
+        return timing
 
     def _tiles_and_read_kwargs_to_dict(self, tiles: SharedArray, read_kwargs: np.ndarray):
         """Convert batch tiles and read arguments into iterator output metadata.
@@ -894,6 +1308,8 @@ class EagerIterator:
         callable_arg_num: int | None = None,
         transform_save_mode: str | None = 'tile_x_y',
         worker_transform_scale: Callable | str | None = None,
+        batch_transform: Callable | None = None,
+        profile: bool = False,
     ):
         """Read one eager chunk into shared-memory output buffers.
 
@@ -913,8 +1329,13 @@ class EagerIterator:
         :param callable_arg_num: Number of positional arguments expected by transform.
         :param transform_save_mode: Coordinate mode passed to three-argument transforms.
         :param worker_transform_scale: Optional worker-safe transform-scale callable.
-        :returns: None. The shared arrays are filled in place.
+        :param batch_transform: Optional callable applied to all tiles of the chunk at once.
+        :param profile: If True, return how long each part of the read took.
+        :returns: None, or a timing dictionary if profile is True.  The shared arrays
+            are filled in place.
         """
+        started = time.monotonic()
+        marks = [time.perf_counter()]
         read_kwargs_array = np.asarray(read_kwargs)
         scale_data = EagerIterator._resolve_worker_scale_data(
             read_kwargs_array, slide_dimensions, worker_transform_scale,
@@ -931,18 +1352,35 @@ class EagerIterator:
         xlo, yto, ho, wo = EagerIterator._output_slices(
             output_mode, xlt, ytt, xrt, ybt, bounds['xr'], bounds['yr'], conv_mm_x, conv_mm_y,
         )
+        marks.append(time.perf_counter())
         chunk = EagerIterator._read_chunk(source, slide_dimensions, target_scale, bounds)
+        marks.append(time.perf_counter())
         tiles = EagerIterator._extract_worker_tiles(
             output_mode, chunk, slide_dimensions, xlt, xrt, ytt, ybt, xlo, wo, yto, ho,
             tile_size_dict, region, pad_mode, pad_fill_mode,
         )
+        marks.append(time.perf_counter())
         tiles = EagerIterator._apply_worker_transform(
             tiles, transform, dtype, callable_arg_num, transform_save_mode,
             tile_x, tile_y, xlt, ytt,
         )
+        if batch_transform is not None:
+            tiles = EagerIterator._apply_worker_batch_transform(tiles, batch_transform)
+        marks.append(time.perf_counter())
         EagerIterator._insert_worker_tiles(
             sharrs, tiles, offset, batch, nchw, worker_transform_scale, mm_x, mm_y,
         )
+        if not profile:
+            return None
+        marks.append(time.perf_counter())
+        timing = dict(zip(READ_PHASES, np.diff(marks).tolist(), strict=True))
+        timing.update({
+            'tiles': len(read_kwargs_array),
+            'worker': (os.getpid(), threading.get_ident()),
+            'start': started,
+            'end': time.monotonic(),
+        })
+        return timing
 
     @staticmethod
     def _resolve_worker_scale_data(
@@ -1221,6 +1659,18 @@ class EagerIterator:
             tile_x, tile_y, xlt, ytt,
         )
 
+    @staticmethod
+    def _apply_worker_batch_transform(tiles: list, batch_transform: Callable) -> np.ndarray:
+        """Apply a batch transform to all of the worker tile outputs at once.
+
+        :returns: A numpy array with the transformed tiles.
+        """
+        tiles_out = batch_transform(np.stack(tiles))
+        if not isinstance(tiles_out, np.ndarray) or len(tiles_out) != len(tiles):
+            msg = 'batch_transform must return a numpy array with an entry for each tile'
+            raise ValueError(msg)
+        return tiles_out
+
     @staticmethod
     def _resolve_worker_transform(transform: Callable | str) -> Callable:
         """Resolve a sentinel transform into the process-local callable.
@@ -1296,7 +1746,7 @@ class EagerIterator:
     @staticmethod
     def _insert_worker_tiles(
         sharrs: list,
-        tiles: list,
+        tiles: list | np.ndarray,
         offset: int,
         batch: int,
         nchw: bool,
@@ -1308,8 +1758,16 @@ class EagerIterator:
 
         :returns: None.
         """
+        if isinstance(tiles, np.ndarray):
+            EagerIterator._insert_worker_batch(
+                sharrs, tiles, offset, batch, nchw, worker_transform_scale, mm_x, mm_y,
+            )
+            return
         for i, tile in enumerate(tiles):
             sharr_index, slice_index = divmod(offset + i, batch)
+            if sharr_index >= len(sharrs) or sharrs[sharr_index] is None:
+                # This output is not part of the requested batches
+                continue
             if nchw and isinstance(tile, np.ndarray):
                 sharrs[sharr_index].insert(np.transpose(tile, [2, 0, 1]), slice_index)
             else:
@@ -1317,6 +1775,82 @@ class EagerIterator:
             if worker_transform_scale is not None:
                 sharrs[sharr_index].insert_mm(mm_x[i], mm_y[i], slice_index)
 
+    @staticmethod
+    def _insert_worker_batch(
+        sharrs: list,
+        tiles: np.ndarray,
+        offset: int,
+        batch: int,
+        nchw: bool,
+        worker_transform_scale: Callable | str | None,
+        mm_x,
+        mm_y,
+    ) -> None:
+        """Insert a stacked array of worker outputs into shared arrays.
+
+        Consecutive outputs that go to the same shared array are written with one
+        assignment, transposing to channel-first order as they are copied.
+
+        :returns: None.
+        """
+        start = 0
+        while start < len(tiles):
+            sharr_index, slice_index = divmod(offset + start, batch)
+            end = start + min(len(tiles) - start, batch - slice_index)
+            if sharr_index < len(sharrs) and sharrs[sharr_index] is not None:
+                block = tiles[start:end]
+                if nchw:
+                    block = block.transpose(0, 3, 1, 2)
+                sharrs[sharr_index].insert_batch(block, slice_index)
+                if worker_transform_scale is not None:
+                    for i in range(start, end):
+                        sharrs[sharr_index].insert_mm(mm_x[i], mm_y[i], slice_index + i - start)
+            start = end
+
+    def _worker_read_args(self) -> dict[str, Any]:
+        """Return the read arguments that are the same for every worker task.
+
+        Worker processes are forked, so these are not pickled.  The transform
+        is resolved here so workers do not look it up for each task.
+
+        :returns: Keyword arguments for read other than read_kwargs, sharrs, and offset.
+        """
+        transform = self._worker_transform
+        if transform == _EAGER_FN_TRANSFORM_SENTINEL:
+            transform = EagerIterator._resolve_worker_transform(transform)
+        return {
+            'source': self.source,
+            'dtype': self.dtype,
+            'nchw': self.nchw,
+            'output_mode': self.output_mode,
+            'batch': self.batch,
+            'slide_dimensions': self.slide_dimensions,
+            'region': self.region,
+            'transform': transform,
+            'pad_mode': self.pad_mode,
+            'pad_fill_mode': self.pad_fill_mode,
+            'callable_arg_num': self.callable_arg_num,
+            'transform_save_mode': self.transform_save_mode,
+            'worker_transform_scale': self._worker_transform_scale,
+            'batch_transform': self.batch_transform,
+            'profile': self.profile,
+        }
+
+    @staticmethod
+    def _read_in_worker(read_kwargs: list, sharrs: list, offset: int):
+        """Read one eager chunk using the arguments stored when the worker started.
+
+        :param read_kwargs: Read argument rows for this worker task.
+        :param sharrs: SharedArray buffers filled by this worker task.
+        :param offset: Batch offset for the first output tile in this task.
+        :returns: None, or a timing dictionary if the iterator is profiled.  The shared
+            arrays are filled in place.
+        """
+        return EagerIterator.read(
+            read_kwargs=read_kwargs, sharrs=sharrs, offset=offset,
+            **eager_fn.get_worker_read_args(),
+        )
+
     def _submitfn(self, read_kwargs: list, sharrs: list, offset: int):
         """Submit one eager read task to the process pool.
 
@@ -1325,24 +1859,23 @@ class EagerIterator:
         :param offset: Batch offset for the first output tile in this task.
         :returns: A Future for the submitted worker task.
         """
-        return self.pool.submit(
-            EagerIterator.read,
-            self.source,
-            self.dtype,
-            self.nchw,
-            read_kwargs,
-            sharrs,
-            offset,
-            self.output_mode,
-            self.batch,
-            self.slide_dimensions,
-            self.region,
-            self._worker_transform,
-            self.pad_mode,
-            self.pad_fill_mode,
-            self.callable_arg_num,
-            self.transform_save_mode,
-            self._worker_transform_scale,
+        if self._local_read_args is not None:
+            return self.pool.submit(
+                EagerIterator.read, read_kwargs=read_kwargs, sharrs=sharrs, offset=offset,
+                **self._local_read_args,
+            )
+        return self.pool.submit(EagerIterator._read_in_worker, read_kwargs, sharrs, offset)
+
+    def _new_shared_array(self) -> SharedArray:
+        """Get a shared array for a batch, reusing one from the pool if enabled.
+
+        :returns: A SharedArray with the batch output dimensions.
+        """
+        if self.buffer_pool is not None:
+            return self.buffer_pool.acquire()
+        return SharedArray(
+            self.out_dims, self.dtype, self.is_torch, enable_mm=self._enable_dynamic_mm,
+            shared=self.executor != 'thread',
         )
 
     def _fill(self):
@@ -1368,9 +1901,7 @@ class EagerIterator:
                     """last read aligned with batch boundary, create new shared array,
                     and read_kwargs, futures containers
                     """
-                    tiles = SharedArray(
-                        self.out_dims, self.dtype, self.is_torch, enable_mm=self._enable_dynamic_mm,
-                    )
+                    tiles = self._new_shared_array()
                     futures = []
                     # batch_kwargs = []
                     batch_kwargs = np.empty((0, self.read_kwargs[0].shape[1]))
@@ -1399,15 +1930,7 @@ class EagerIterator:
                     # create additional arrays if this read spans multiple batches
                     sharrs = [
                         *tiles,
-                        *[
-                            SharedArray(
-                                self.out_dims,
-                                self.dtype,
-                                self.is_torch,
-                                enable_mm=self._enable_dynamic_mm,
-                            )
-                            for _ in range(batches - 1)
-                        ],
+                        *[self._new_shared_array() for _ in range(batches - 1)],
                     ]
 
                     """submit job - read into first array in `tiles` at slice `offset`.
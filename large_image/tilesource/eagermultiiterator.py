@@ -0,0 +1,413 @@
+"""Eager iterator that interleaves batched reads from multiple tile sources."""
+
+import contextlib
+import os
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+
+from .. import tilesource
+from .eager_utils import eager_fn
+from .eager_utils.eager_read_args import interleave_slide_chunks
+from .eageriterator import EagerIterator
+
+
+class MultiEagerIterator(EagerIterator):
+    """Iterator that prefetches batched reads interleaved from multiple tile sources.
+
+    All slides share one worker pool and one prefetch queue, so batches can mix
+    tiles or regions from different slides.  Slides are opened and planned as
+    iteration reaches them, and workers open the sources they read, so only a
+    bounded number of slides is planned at once.
+    """
+
+    def __init__(
+        self,
+        sources: list,
+        masks: list | str | None = None,
+        source_regions: list | None = None,
+        tiles: list | None = None,
+        regions: list | None = None,
+        policy: str = 'round_robin',
+        weights: list[float] | np.ndarray | None = None,
+        seed: int = 42,
+        batch: int = 64,
+        prefetch: int = 16,
+        workers: int = 16,
+        reuse_buffers: bool = False,
+        rank: int = 0,
+        world_size: int = 1,
+        pad_shards: bool = False,
+        executor: str = 'process',
+        open_slides: int = 8,
+        **kwargs,
+    ):
+        """Initialize an eager iterator over multiple tile sources.
+
+        :param sources: A list of paths that can be opened with large_image.open
+            or of tile sources.  Tile sources are reopened with the same class and
+            options when they are read.
+        :param masks: Optional list with a mask for each slide.  See the mask
+            parameter of EagerIterator.  If 'auto', a tissue mask is computed for
+            each slide when it is planned.
+        :param source_regions: Optional list with the source region of each slide.
+            See the region parameter of EagerIterator.
+        :param tiles: Optional list with the tile indexes of each slide.
+        :param regions: Optional list with the regions of each slide for regions
+            output mode.
+        :param policy: How chunks of the slides are interleaved: 'round_robin',
+            'random', or 'weighted'.  See interleave_slide_chunks.
+        :param weights: Relative weight of each slide for the weighted policy.
+        :param seed: Random seed used by the policy and for randomize_chunks.
+        :param batch: Number of tiles or regions returned in each batch.
+        :param prefetch: Number of batches to keep queued ahead of iteration.
+        :param workers: Number of worker processes used for image reads.
+        :param reuse_buffers: If True, batches are read into a pool of shared arrays.
+            See EagerIterator.
+        :param rank: Index of this reader when world_size readers each read part of the
+            interleaved chunks.
+        :param world_size: Number of readers that share the interleaved chunks.  Each
+            chunk is read by the reader that has been assigned the fewest rows.
+        :param pad_shards: If True, repeat reads so every reader has the same number of
+            batches.
+        :param executor: 'process', 'thread', or 'auto'.  See EagerIterator; 'auto'
+            uses threads if the source of the first slide is known to release the GIL.
+        :param open_slides: Maximum number of slides whose chunks are interleaved at
+            once.  A slide is planned when it joins the interleave and is dropped
+            when its last chunk is queued.
+        :param kwargs: Other EagerIterator options, used for every slide.  The output
+            shape and dtype must be the same for every slide.
+        :returns: None. Iteration yields dictionaries containing image data and
+            metadata.  The 'slide' entry has the index of the source of each tile
+            or region, and the per-slide metadata are arrays with a value for each
+            tile or region.
+        """
+        self.slides = [self._slide_spec(source) for source in sources]
+        if not self.slides:
+            msg = 'At least one source must be provided'
+            raise ValueError(msg)
+        if isinstance(masks, str):
+            masks = [masks] * len(self.slides)
+        self._slide_options = {
+            'mask': masks, 'region': source_regions, 'tiles': tiles, 'regions': regions}
+        for key, values in self._slide_options.items():
+            if values is not None and len(values) != len(self.slides):
+                msg = f'{key} must have an entry for each source'
+                raise ValueError(msg)
+        if world_size < 1 or not 0 <= rank < world_size:
+            msg = 'rank must be at least 0 and less than world_size'
+            raise ValueError(msg)
+        self.policy = policy
+        self.weights = weights
+        self.open_slides = open_slides
+        self.rank = rank
+        self.world_size = world_size
+        self.pad_shards = pad_shards
+        self._plan_options = dict(seed=seed, batch=batch, workers=workers, **kwargs)
+        # Worker read arguments and native tile counts of each planned slide
+        self._slide_read_args: dict[int, dict[str, Any]] = {}
+        self._slide_native_tiles: dict[int, tuple[int, int]] = {}
+        self._output_image_count: int | None = None
+
+        # The first slide determines the output shape and dtype of every batch
+        first = self._open_slide(self.slides[0])
+        self.executor = self._resolve_executor(executor, [first])
+        self._first_reads = {0: self._plan_slide(0, first)}
+        self._output_options = (self.out_dims, np.dtype(self.dtype), self.is_torch)
+        self._chunks = self._reader_chunks(self._slide_chunks())
+        self.read_kwargs = []
+        self._start(workers, batch, prefetch, reuse_buffers)
+
+    @staticmethod
+    def _slide_spec(source: Any) -> str | tuple:
+        """Get what is needed to open a slide.
+
+        :param source: A path or a tile source.
+        :returns: The path, or a tuple of the tile source class, its arguments, and
+            its keyword arguments.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            return os.fspath(source)
+        if not hasattr(source, '_initValues') or hasattr(source, '_unpickleable'):
+            msg = 'Sources must be paths or tile sources that can be reopened'
+            raise ValueError(msg)
+        return (type(source), *source._initValues)
+
+    @staticmethod
+    def _open_slide(spec: str | tuple) -> 'tilesource.TileSource':
+        """Open the tile source of a slide.  Tile sources are cached, so this
+        usually returns an already open source.
+
+        :param spec: A value returned by _slide_spec.
+        :returns: The tile source.
+        """
+        if isinstance(spec, tuple):
+            cls, args, kwargs = spec
+            return cls(*args, **kwargs)
+        return tilesource.open(spec)
+
+    def _plan_slide(self, slide: int, source: 'tilesource.TileSource | None' = None) -> list:
+        """Plan the reads of one slide.
+
+        The worker read arguments and native tile counts of the slide are kept;
+        the source is not.  A slide given by path is afterwards reopened by the
+        class of its source.
+
+        :param slide: The index of the slide.
+        :param source: The opened source of the slide, if available.
+        :returns: The read argument chunks of the slide.
+        """
+        if source is None:
+            source = self._open_slide(self.slides[slide])
+        if isinstance(self.slides[slide], str):
+            # Workers reopen the source by its class, so tasks don't repeat the
+            # format detection of tilesource.open
+            with contextlib.suppress(ValueError):
+                self.slides[slide] = self._slide_spec(source)
+        reads = self._plan_reads(source, **self._plan_options, **{
+            key: values[slide] for key, values in self._slide_options.items()
+            if values is not None})
+        self.source = None
+        output = getattr(self, '_output_options', None)
+        if output is not None and output != (self.out_dims, np.dtype(self.dtype), self.is_torch):
+            msg = (
+                'All sources must produce the same output shape and dtype; got '
+                f'{output[0]} {output[1]} and {self.out_dims} {self.dtype}'
+            )
+            raise ValueError(msg)
+        self._slide_read_args[slide] = {
+            'slide_dimensions': self.slide_dimensions, 'region': self.region}
+        self._slide_native_tiles[slide] = (self.native_tile_decodes, self.native_tiles)
+        return reads
+
+    def _slide_chunks(self) -> Iterator[np.ndarray]:
+        """Plan slides as they join the interleave and return their chunks in order.
+
+        :returns: An iterator of read argument chunks.  Each chunk has an extra last
+            column with the index of its slide.
+        """
+        plans: dict[int, list] = {}
+
+        def count(slide: int) -> int:
+            reads = self._first_reads.pop(slide, None)
+            plans[slide] = reads if reads is not None else self._plan_slide(slide)
+            return len(plans[slide])
+
+        order = interleave_slide_chunks(
+            count, self.policy, self.weights, self._plan_options['seed'],
+            window=self.open_slides, slides=len(self.slides))
+        return self._tag_slide_chunks(order, plans)
+
+    @staticmethod
+    def _tag_slide_chunks(order: Iterator[tuple[int, int]], plans: dict[int, list]):
+        """Add the slide index to chunks, dropping the plan of a slide after its
+        last chunk.
+
+        :param order: An iterator of slide and chunk indices.
+        :param plans: The read argument chunks of each started slide.  This is
+            modified.
+        :returns: An iterator of read argument chunks with a final slide column.
+        """
+        for slide, chunk in order:
+            reads = np.asarray(plans[slide][chunk])
+            if chunk == len(plans[slide]) - 1:
+                del plans[slide]
+            yield np.concatenate(
+                [reads, np.full((len(reads), 1), slide, dtype=reads.dtype)], axis=1)
+
+    def _reader_chunks(self, chunks: Iterator[np.ndarray]):
+        """Select the chunks read by this reader.
+
+        Each chunk is assigned to the reader that has been assigned the fewest
+        rows so far, so every reader makes the same assignment without knowing
+        how many chunks there are.
+
+        :param chunks: An iterator of all read argument chunks.
+        :returns: An iterator of the read argument chunks of this reader.
+        """
+        rows = np.zeros(self.world_size, dtype=np.int64)
+        last = None
+        for reads in chunks:
+            owner = int(np.argmin(rows))
+            rows[owner] += len(reads)
+            if owner == self.rank or last is None:
+                last = reads
+            if owner == self.rank:
+                yield reads
+        if not self.pad_shards or last is None:
+            return
+        # Repeat the last chunk of this reader, if any, as needed
+        missing = int(rows.max() - rows[self.rank])
+        while missing > 0:
+            yield last[:missing]
+            missing -= len(last[:missing])
+
+    def _plan_ahead(self) -> None:
+        """Plan enough chunks to fill the prefetch queue.
+
+        Chunks that were already submitted are dropped.
+
+        :returns: None.
+        """
+        del self.read_kwargs[:self.pos]
+        self.pos = 0
+        rows = sum(len(reads) for reads in self.read_kwargs)
+        while rows < (self.prefetch + 1) * self.batch:
+            reads = next(self._chunks, None)
+            if reads is None:
+                break
+            self.read_kwargs.append(reads)
+            rows += len(reads)
+
+    def _fill(self):
+        """Plan more chunks as needed and fill the prefetch queue.
+
+        :returns: None.
+        """
+        self._plan_ahead()
+        super()._fill()
+
+    def get_output_image_count(self):
+        """Return the number of output images planned by this iterator.
+
+        This plans every slide to count its reads, so it can be slow with many
+        slides.
+
+        :returns: Number of tiles or regions available from the iterator.
+        """
+        if self._output_image_count is None:
+            self._output_image_count = sum(
+                len(reads) for reads in self._reader_chunks(self._slide_chunks()))
+        return self._output_image_count
+
+    @property
+    def decode_amplification(self) -> float:
+        """Return the average number of times each native tile is decoded for the
+        slides planned so far.
+
+        :returns: Native tile decodes of the planned chunks divided by the number of
+            distinct native tiles they cover.
+        """
+        decodes = sum(value[0] for value in self._slide_native_tiles.values())
+        tiles = sum(value[1] for value in self._slide_native_tiles.values())
+        return decodes / tiles if tiles else 1.0
+
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        """Batches of multiple slides are planned as they are read, so they can
+        only be read in order.
+
+        :raises TypeError: always.
+        """
+        msg = 'MultiEagerIterator batches can only be read in order'
+        raise TypeError(msg)
+
+    def state_dict(self) -> dict[str, Any]:
+        """Return a cursor that can resume iteration with load_state_dict.
+
+        :returns: A JSON-serializable dictionary with the index of the next batch
+            and the batch size.
+        """
+        return {'batch_index': self.batch_index, 'batch': self.batch}
+
+    def load_state_dict(self, state: dict[str, Any]) -> None:
+        """Resume iteration from a cursor returned by state_dict.
+
+        Queued reads are discarded and the slides are planned again up to the
+        recorded batch without reading them.  The iterator must have been created
+        with the same options as the one that made the cursor.
+
+        :param state: A dictionary returned by state_dict.
+        :returns: None.
+        """
+        if state['batch'] != self.batch:
+            msg = 'The state does not match the batch size of this iterator'
+            raise ValueError(msg)
+        self._clear_queue(timeout=None)
+        self._chunks = self._reader_chunks(self._slide_chunks())
+        self.read_kwargs = []
+        self.pos = 0
+        self.overflow = 0
+        self.batch_index = state['batch_index']
+        skip = self.batch_index * self.batch
+        while skip > 0:
+            reads = next(self._chunks, None)
+            if reads is None:
+                break
+            if len(reads) > skip:
+                self.read_kwargs.append(reads[skip:])
+            skip -= len(reads)
+        self._fill()
+
+    def _worker_read_args(self) -> dict[str, Any]:
+        """Return the read arguments that are the same for every slide.
+
+        :returns: Keyword arguments for read other than the source, slide
+            dimensions, region, read_kwargs, sharrs, and offset.
+        """
+        args = super()._worker_read_args()
+        for key in ('source', 'slide_dimensions', 'region'):
+            args.pop(key)
+        return args
+
+    @staticmethod
+    def _read_slide(
+        read_kwargs: np.ndarray, sharrs: list, offset: int, slide_args: dict[str, Any],
+        read_args: dict[str, Any] | None = None,
+    ):
+        """Read one chunk of a slide, opening its source.
+
+        :param read_kwargs: Read argument rows for this task.
+        :param sharrs: SharedArray buffers filled by this task.
+        :param offset: Batch offset for the first output tile in this task.
+        :param slide_args: The slide's source, as from _slide_spec, slide
+            dimensions, and region.
+        :param read_args: The read arguments shared by every slide.  If None,
+            those stored when the worker process started are used.
+        :returns: None, or a timing dictionary if the iterator is profiled.
+        """
+        args = dict(read_args if read_args is not None else eager_fn.get_worker_read_args())
+        args.update(slide_args)
+        args['source'] = MultiEagerIterator._open_slide(slide_args['source'])
+        return EagerIterator.read(read_kwargs=read_kwargs, sharrs=sharrs, offset=offset, **args)
+
+    def _submitfn(self, read_kwargs: list, sharrs: list, offset: int):
+        """Submit one eager read task for the slide of a chunk to the worker pool.
+
+        Only the slide's path and dimensions are sent with the task; the worker
+        opens the source.
+
+        :param read_kwargs: Read argument rows with a final slide index column.
+        :param sharrs: SharedArray buffers filled by the worker task.
+        :param offset: Batch offset for the first output tile in this task.
+        :returns: A Future for the submitted worker task.
+        """
+        reads = np.asarray(read_kwargs)
+        slide = int(reads[0, -1])
+        slide_args = {'source': self.slides[slide], **self._slide_read_args[slide]}
+        return self.pool.submit(
+            MultiEagerIterator._read_slide, reads[:, :-1], sharrs, offset, slide_args,
+            self._local_read_args)
+
+    def _tiles_and_read_kwargs_to_dict(self, tiles, read_kwargs: np.ndarray):
+        """Convert batch tiles and read arguments into iterator output metadata.
+
+        :param tiles: SharedArray containing the image batch.
+        :param read_kwargs: Read argument rows with a final slide index column.
+        :returns: A dictionary with tile data and metadata arrays for the batch.
+        """
+        slides = read_kwargs[:, -1].astype(int)
+        result = super()._tiles_and_read_kwargs_to_dict(tiles, read_kwargs[:, :-1])
+        dims = [self._slide_read_args[slide]['slide_dimensions'] for slide in slides]
+        result.update({
+            'slide': slides,
+            'width': np.array([dim['tile_size'][0] for dim in dims]),
+            'height': np.array([dim['tile_size'][1] for dim in dims]),
+            'level': np.array([dim['level'] for dim in dims]),
+            'magnification': np.array([dim['target_magnification'] for dim in dims]),
+            'mm_x': np.array([dim['target_mm_x'] for dim in dims]),
+            'mm_y': np.array([dim['target_mm_y'] for dim in dims]),
+            'gwidth': np.array([dim['tile_width_before_scaling'] for dim in dims]),
+            'gheight': np.array([dim['tile_height_before_scaling'] for dim in dims]),
+        })
+        return result
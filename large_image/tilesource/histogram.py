@@ -0,0 +1,218 @@
+import math
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+# Integer data types with at most this many possible values are analyzed by
+# counting every value.  The counts give the minimum, maximum, mean, standard
+# deviation, and histogram in a single pass.
+MaxCountedValues = 65536
+
+
+def countedValueRange(dtype: npt.DTypeLike) -> tuple[int, int] | None:
+    """
+    Determine if every possible value of a data type can be counted.
+
+    :param dtype: a numpy data type.
+    :returns: None if the data type has too many possible values, otherwise a
+        tuple of the smallest possible value and the number of possible
+        values.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'b':
+        return (0, 2)
+    if dtype.kind not in {'u', 'i'} or 2 ** (dtype.itemsize * 8) > MaxCountedValues:
+        return None
+    return (int(np.iinfo(dtype).min), 2 ** (dtype.itemsize * 8))
+
+
+def tileStatistics(
+        tile: np.ndarray, valueRange: tuple[int, int] | None = None,
+        histSpecs: list[tuple[int, tuple[float, float]]] | None = None) -> dict[str, Any]:
+    """
+    Compute statistics for each band of a tile.
+
+    :param tile: a three dimensional numpy array.
+    :param valueRange: if not None, a tuple of the smallest value and the
+        number of possible values.  Each value is counted per band rather than
+        computing the minimum, maximum, sum, and sum of squares.
+    :param histSpecs: if not None, a list with the number of bins and the
+        range of a histogram for each band.
+    :returns: a dictionary with count and either min, max, sum, and sum2 or
+        counts (an array of the number of each value per band), offset, and
+        dtype.  If requested, this also has hist and binEdges (lists of
+        histograms and bin edges per band).
+    """
+    bands = tile.shape[2]
+    stats: dict[str, Any] = {'count': tile.shape[0] * tile.shape[1]}
+    if valueRange is not None:
+        offset, size = valueRange
+        # Count every band at once by giving each band its own range of codes
+        codes = np.subtract(
+            tile.reshape(-1, bands), offset - np.arange(bands) * size, dtype=np.intp)
+        counts = np.bincount(codes.ravel(), minlength=bands * size).reshape(bands, size)
+        stats.update({'counts': counts, 'offset': offset, 'dtype': tile.dtype})
+    else:
+        # Reducing each band separately is much faster in numpy than reducing
+        # along the first axis of a (pixels, bands) array.
+        stats.update({
+            'min': np.array([tile[:, :, idx].min() for idx in range(bands)], tile.dtype),
+            'max': np.array([tile[:, :, idx].max() for idx in range(bands)], tile.dtype),
+            'sum': np.array([tile[:, :, idx].sum(dtype=float) for idx in range(bands)]),
+            'sum2': np.zeros(bands),
+        })
+        for idx in range(bands):
+            band = tile[:, :, idx].astype(float).ravel()
+            stats['sum2'][idx] = np.dot(band, band)
+    if histSpecs is not None:
+        hists = [np.histogram(tile[:, :, idx], bins, (float(rng[0]), float(rng[1])))
+                 for idx, (bins, rng) in enumerate(histSpecs[:bands])]
+        stats['hist'] = [hist for hist, _ in hists]
+        stats['binEdges'] = [binEdges for _, binEdges in hists]
+    return stats
+
+
+def summarizeCounts(stats: dict[str, Any]) -> dict[str, Any]:
+    """
+    Add the minimum, maximum, sum, and sum of squares to statistics that were
+    computed by counting values.
+
+    :param stats: statistics from tileStatistics or mergeStatistics.  This is
+        modified.
+    :returns: the statistics.
+    """
+    if 'counts' not in stats or 'min' in stats:
+        return stats
+    counts = stats['counts']
+    values = np.arange(stats['offset'], stats['offset'] + counts.shape[1])
+    used = [np.flatnonzero(bandCounts) for bandCounts in counts]
+    stats['min'] = np.array([values[nz[0]] for nz in used], stats['dtype'])
+    stats['max'] = np.array([values[nz[-1]] for nz in used], stats['dtype'])
+    fvalues = values.astype(float)
+    stats['sum'] = counts @ fvalues
+    stats['sum2'] = counts @ (fvalues * fvalues)
+    return stats
+
+
+def mergeStatistics(results: dict[str, Any] | None, stats: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merge the statistics of a tile into accumulated results.  Tiles with more
+    bands than the accumulated results are truncated.
+
+    :param results: the accumulated results or None if this is the first tile.
+    :param stats: the statistics of a tile from tileStatistics.
+    :returns: the accumulated results.
+    """
+    if results is None:
+        return stats
+    bands = len(results['min'] if 'min' in results else results['counts'])
+    if ('counts' in results and 'counts' in stats and
+            results['counts'].shape[1] == stats['counts'].shape[1] and
+            results['offset'] == stats['offset']):
+        results['counts'] += stats['counts'][:bands]
+    else:
+        if 'counts' in results:
+            summarizeCounts(results).pop('counts')
+        summarizeCounts(stats)
+        results['min'] = np.minimum(results['min'], stats['min'][:bands])
+        results['max'] = np.maximum(results['max'], stats['max'][:bands])
+        results['sum'] += stats['sum'][:bands]
+        results['sum2'] += stats['sum2'][:bands]
+    results['count'] += stats['count']
+    if 'hist' in results:
+        for idx in range(min(bands, len(stats['hist']))):
+            results['hist'][idx] += stats['hist'][idx]
+    return results
+
+
+def statisticsMean(stats: dict[str, Any]) -> np.ndarray:
+    """
+    Compute the mean of each band from tile statistics without modifying
+    them.
+
+    :param stats: statistics from tileStatistics.
+    :returns: a numpy array with the mean of each band.
+    """
+    if 'sum' in stats:
+        return stats['sum'] / stats['count']
+    values = np.arange(
+        stats['offset'], stats['offset'] + stats['counts'].shape[1], dtype=float)
+    return (stats['counts'] @ values) / stats['count']
+
+
+def sampleTilePositions(totalTiles: int, sampleTiles: int, seed: int = 0) -> set[int]:
+    """
+    Pick a stratified random sample of tiles.  The tiles are divided into
+    groups of consecutive tiles and one tile is picked from each group, so
+    the sample covers the whole image.  The same tiles are picked for the
+    same parameters.
+
+    :param totalTiles: the number of tiles that could be sampled.
+    :param sampleTiles: the number of tiles to pick.
+    :param seed: a seed for the random number generator.
+    :returns: a set of tile positions in the range [0, totalTiles).
+    """
+    if sampleTiles >= totalTiles:
+        return set(range(totalTiles))
+    edges = np.linspace(0, totalTiles, sampleTiles + 1).astype(int)
+    rng = np.random.default_rng(seed)
+    picks = edges[:-1] + (rng.random(sampleTiles) * (edges[1:] - edges[:-1])).astype(int)
+    return {int(pos) for pos in picks}
+
+
+def sampleMeanError(
+        tileMeans: list[np.ndarray], totalTiles: int, bands: int) -> np.ndarray | None:
+    """
+    Estimate the standard error of the mean of each band when only some of
+    the tiles were analyzed.  This uses the variation of the means of the
+    sampled tiles with a finite population correction.
+
+    :param tileMeans: a list with the mean of each band for each sampled
+        tile.
+    :param totalTiles: the number of tiles that could have been sampled.
+    :param bands: the number of bands to report.
+    :returns: a numpy array with the standard error of the mean of each band,
+        or None if too few tiles were sampled to estimate it.
+    """
+    count = len(tileMeans)
+    if count >= totalTiles:
+        return np.zeros(bands)
+    if count < 2:
+        return None
+    means = np.array([tileMean[:bands] for tileMean in tileMeans])
+    return np.sqrt((1 - count / totalTiles) * means.var(axis=0, ddof=1) / count)
+
+
+def histogramFromCounts(
+        counts: np.ndarray, offset: int, bins: int,
+        histRange: tuple[float, float]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute a histogram from the number of times each value occurs.  This
+    matches numpy.histogram on the original values.
+
+    :param counts: the number of times each value occurs.
+    :param offset: the value of the first entry in counts.
+    :param bins: the number of bins.
+    :param histRange: the range of the histogram.
+    :returns: the histogram and the bin edges.
+    """
+    values = np.arange(offset, offset + len(counts))
+    used = counts != 0
+    return np.histogram(
+        values[used], bins, (float(histRange[0]), float(histRange[1])), weights=counts[used])
+
+
+def roundHistogramRange(record: dict[str, Any], bins: int) -> None:
+    """
+    Adjust the range and number of bins of a histogram of integer data so
+    that the bins have integer widths.
+
+    :param record: a dictionary with range and bins.  This is modified.
+    :param bins: the maximum number of bins.
+    """
+    if (record['range'][1] - record['range'][0]) < bins * 10:
+        step = int(math.ceil((record['range'][1] - record['range'][0]) / bins))
+        rbins = int(math.ceil((record['range'][1] - record['range'][0]) / step))
+        record['range'] = (record['range'][0], record['range'][0] + step * rbins)
+        record['bins'] = rbins
@@ -0,0 +1,201 @@
+import math
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from .. import config
+
+
+class TilePrewarmer:
+    """
+    Render tiles of a tile source in background threads so that they are in
+    the tile cache before they are requested.  The coarsest levels are
+    rendered first.  Prewarming stops when all requested tiles have been
+    rendered, when it is cancelled, when its time budget is used, or when the
+    rendered tiles fill a fraction of the tile cache.
+    """
+
+    def __init__(
+            self, source: Any, levels: int | list[int] | None = None,
+            frames: list[int | None] | None = None,
+            budget_seconds: float | None = None, max_workers: int | None = -4,
+            cacheFraction: float | None = None, maxTiles: int | None = None,
+            **kwargs) -> None:
+        """
+        Prepare to prewarm a tile source.  Call start to begin.
+
+        :param source: the tile source.
+        :param levels: if an integer, prewarm this many of the coarsest levels.
+            If a list, prewarm these levels.  If None, prewarm the coarsest
+            levels that have no more than maxTiles tiles in total.
+        :param frames: a list of frames to prewarm.  None prewarms the default
+            frame.
+        :param budget_seconds: if not None, stop after this many seconds.
+        :param max_workers: the number of threads used to render tiles.  If
+            negative, use the minimum of the absolute value of this number or
+            the number of cpus.
+        :param cacheFraction: stop when the rendered tiles would take more
+            than this fraction of the tile cache.  None uses the
+            prewarm_cache_fraction config value.
+        :param maxTiles: the maximum number of tiles per frame when levels is
+            None.  None uses the prewarm_max_tiles config value.
+        :param kwargs: parameters passed to getTile.  These must match the
+            parameters used when tiles are requested for the cached tiles to
+            be used.
+        """
+        self.source = source
+        self.frames = list(frames) if frames else [None]
+        self.budgetSeconds = budget_seconds
+        if max_workers is not None and max_workers < 0:
+            max_workers = min(-max_workers, config.cpu_count(False))
+        self.maxWorkers = max(1, max_workers or 1)
+        if cacheFraction is None:
+            cacheFraction = float(config.getConfig('prewarm_cache_fraction', 0.25))
+        self.cacheFraction = cacheFraction
+        if maxTiles is None:
+            maxTiles = int(config.getConfig('prewarm_max_tiles', 1024))
+        self.levels = self._pickLevels(levels, maxTiles)
+        self.tileKwargs = kwargs
+        self.tiles = 0
+        self.errors = 0
+        self.cacheUsed = 0
+        self.stopReason: str | None = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._tileIterator: Iterator[tuple[int, int, int, int | None]] = self._iterateTiles()
+
+    def _pickLevels(self, levels: int | list[int] | None, maxTiles: int) -> list[int]:
+        """
+        Determine which levels to prewarm.
+
+        :param levels: see __init__.
+        :param maxTiles: see __init__.
+        :returns: a sorted list of levels.
+        """
+        if isinstance(levels, int):
+            return list(range(min(levels, self.source.levels)))
+        if levels is not None:
+            return sorted({level for level in levels if 0 <= level < self.source.levels})
+        result = []
+        total = 0
+        for level in range(self.source.levels):
+            scale = 2 ** (self.source.levels - 1 - level)
+            total += (math.ceil(self.source.sizeX / scale / self.source.tileWidth) *
+                      math.ceil(self.source.sizeY / scale / self.source.tileHeight))
+            if result and total > maxTiles:
+                break
+            result.append(level)
+        return result
+
+    def _iterateTiles(self) -> Iterator[tuple[int, int, int, int | None]]:
+        """
+        Yield the tiles to prewarm, coarsest level first.
+
+        :yields: (x, y, z, frame) tuples.
+        """
+        for z in self.levels:
+            scale = 2 ** (self.source.levels - 1 - z)
+            tilesAcross = math.ceil(self.source.sizeX / scale / self.source.tileWidth)
+            tilesDown = math.ceil(self.source.sizeY / scale / self.source.tileHeight)
+            for frame in self.frames:
+                for y in range(tilesDown):
+                    for x in range(tilesAcross):
+                        yield x, y, z, frame
+
+    def _cacheBudget(self) -> tuple[Any, float | None]:
+        """
+        Get the tile cache and how much of it prewarmed tiles may use.
+
+        :returns: the cache used to measure tiles and the budget in the units
+            of the cache's maxsize, or None if the cache size isn't known.
+        """
+        cache = getattr(self.source, 'cache', None)
+        # Measure against the in-memory tier of a tiered cache
+        cache = getattr(cache, 'primary', cache)
+        maxsize = getattr(cache, 'maxsize', None)
+        if not maxsize or not math.isfinite(maxsize) or not hasattr(cache, 'getsizeof'):
+            return cache, None
+        return cache, maxsize * self.cacheFraction
+
+    def _stop(self, reason: str) -> None:
+        if self.stopReason is None:
+            self.stopReason = reason
+        self._cancel.set()
+
+    def _work(self, deadline: float | None) -> None:
+        """
+        Render tiles until there are none left or prewarming is stopped.
+
+        :param deadline: if not None, the time.monotonic value at which to stop.
+        """
+        cache, budget = self._cacheBudget()
+        while not self._cancel.is_set():
+            if deadline is not None and time.monotonic() >= deadline:
+                self._stop('budget_seconds')
+                return
+            with self._lock:
+                if budget is not None and self.cacheUsed >= budget:
+                    self._stop('cache')
+                    return
+                try:
+                    x, y, z, frame = next(self._tileIterator)
+                except StopIteration:
+                    self._stop('complete')
+                    return
+            kwargs = self.tileKwargs.copy()
+            if frame is not None:
+                kwargs['frame'] = frame
+            try:
+                tile = self.source.getTile(x, y, z, **kwargs)
+            except Exception as exc:
+                self.source.logger.debug('Failed to prewarm tile %d, %d, %d: %r', x, y, z, exc)
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                self.tiles += 1
+                if budget is not None:
+                    self.cacheUsed += cache.getsizeof(tile)
+
+    def start(self) -> 'TilePrewarmer':
+        """
+        Start rendering tiles in background threads.
+
+        :returns: this prewarmer.
+        """
+        deadline = (time.monotonic() + self.budgetSeconds
+                    if self.budgetSeconds is not None else None)
+        with self._lock:
+            if self._threads:
+                return self
+            self._threads = [
+                threading.Thread(
+                    target=self._work, args=(deadline, ), daemon=True,
+                    name='large_image_prewarm')
+                for _ in range(self.maxWorkers)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def cancel(self) -> None:
+        """Stop prewarming.  Tiles that are being rendered are finished."""
+        self._stop('cancelled')
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait for prewarming to stop.
+
+        :param timeout: the maximum number of seconds to wait.
+        :returns: True if prewarming has stopped.
+        """
+        end = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            thread.join(None if end is None else max(0, end - time.monotonic()))
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        """True if prewarming was started and has stopped."""
+        return bool(self._threads) and not any(thread.is_alive() for thread in self._threads)
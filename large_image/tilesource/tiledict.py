@@ -134,29 +134,28 @@ class LazyTileDict(dict):
         xmax = int((tx + width - 1) // tileWidth + 1)
         ymin = int(max(0, ty // tileHeight))
         ymax = int((ty + height - 1) // tileHeight + 1)
-        for y in range(ymin, ymax):
-            for x in range(xmin, xmax):
-                tileData = self.source.getTile(
-                    x, y, level,
-                    numpyAllowed='always', sparseFallback=True, frame=frame)
-                if not isinstance(tileData, np.ndarray) or len(tileData.shape) != 3:
-                    tileData, _ = _imageToNumpy(tileData)
-                x0 = int(x * tileWidth - tx)
-                y0 = int(y * tileHeight - ty)
-                if x0 < 0:
-                    tileData = tileData[:, -x0:]
-                    x0 = 0
-                if y0 < 0:
-                    tileData = tileData[-y0:, :]
-                    y0 = 0
-                tw = min(tileData.shape[1], width - x0)
-                th = min(tileData.shape[0], height - y0)
-                if retile is None:
-                    retile = np.empty((height, width, tileData.shape[2]), dtype=tileData.dtype)
-                elif tileData.shape[2] < retile.shape[2]:
-                    retile = retile[:, :, :tileData.shape[2]]
-                retile[y0:y0 + th, x0:x0 + tw] = tileData[
-                    :th, :tw, :retile.shape[2]]
+        tileList = [(x, y, level, frame)
+                    for y in range(ymin, ymax) for x in range(xmin, xmax)]
+        tiles = self.source.getTiles(tileList, numpyAllowed='always', sparseFallback=True)
+        for (x, y, _, _), tileData in zip(tileList, tiles, strict=True):
+            if not isinstance(tileData, np.ndarray) or len(tileData.shape) != 3:
+                tileData, _ = _imageToNumpy(tileData)
+            x0 = int(x * tileWidth - tx)
+            y0 = int(y * tileHeight - ty)
+            if x0 < 0:
+                tileData = tileData[:, -x0:]
+                x0 = 0
+            if y0 < 0:
+                tileData = tileData[-y0:, :]
+                y0 = 0
+            tw = min(tileData.shape[1], width - x0)
+            th = min(tileData.shape[0], height - y0)
+            if retile is None:
+                retile = np.empty((height, width, tileData.shape[2]), dtype=tileData.dtype)
+            elif tileData.shape[2] < retile.shape[2]:
+                retile = retile[:, :, :tileData.shape[2]]
+            retile[y0:y0 + th, x0:x0 + tw] = tileData[
+                :th, :tw, :retile.shape[2]]
         return cast(np.ndarray, retile)
 
     def _resample(self, tileData: ImageBytes | PIL.Image.Image | bytes | np.ndarray) -> tuple[
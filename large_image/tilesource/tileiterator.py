@@ -71,6 +71,8 @@ class TileIterator:
             return None
         iterlen = ((cast(int, self.info['xmax']) - cast(int, self.info['xmin'])) *
                    (cast(int, self.info['ymax']) - cast(int, self.info['ymin'])))
+        if isinstance(self.info.get('tile_position'), (list, tuple, set)):
+            return len({pos for pos in self.info['tile_position'] if 0 <= pos < iterlen})
         if self.info.get('tile_position') is not None:
             return 1 if cast(int, self.info['tile_position']) < iterlen else 0
         return iterlen
@@ -132,7 +134,8 @@ class TileIterator:
             yield that tile, where 0, 0 is the first tile yielded, and
             xmax - xmin - 1, ymax - ymin - 1 is the last tile yielded, or a
             dictionary of {level_x, level_y} to yield that specific tile if it
-            is in the region.
+            is in the region, or a list of numbers to only yield those tiles
+            in position order.
         :param tile_size: if present, retile the output to the specified tile
             size.  If only width or only height is specified, the resultant
             tiles will be square.  This is a dictionary containing at least
@@ -363,7 +366,7 @@ class TileIterator:
         }
         return info
 
-    def _tileIterator(self, iterInfo: dict[str, Any]) -> Iterator[LazyTileDict]:
+    def _tileIterator(self, iterInfo: dict[str, Any]) -> Iterator[LazyTileDict]:  # noqa
         """
         Given tile iterator information, iterate through the tiles.
         Each tile is returned as part of a dictionary that includes
@@ -440,8 +443,17 @@ class TileIterator:
             regionWidth, regionHeight, (xmax - xmin) * (ymax - ymin),
             '' if (xmax - xmin) * (ymax - ymin) == 1 else 's')
 
+        # Each row of tiles and the columns to yield in that row
+        rows: dict[int, Any] = {y: range(xmin, xmax) for y in range(ymin, ymax)}
+        # If a list of tiles is specified, only yield those tiles
+        if isinstance(iterInfo.get('tile_position'), (list, tuple, set)):
+            rows = {}
+            for tilePos in sorted(set(iterInfo['tile_position'])):
+                if 0 <= tilePos < (ymax - ymin) * (xmax - xmin):
+                    rows.setdefault(ymin + tilePos // (xmax - xmin), []).append(
+                        xmin + tilePos % (xmax - xmin))
         # If tile is specified, return at most one tile
-        if iterInfo.get('tile_position') is not None:
+        elif iterInfo.get('tile_position') is not None:
             tilePos: int = cast(int, iterInfo.get('tile_position'))
             if isinstance(tilePos, dict):
                 if tilePos.get('position') is not None:
@@ -459,13 +471,14 @@ class TileIterator:
                 ymax = ymin + 1
                 xmin += int(tilePos % (xmax - xmin))
                 xmax = xmin + 1
+            rows = {y: range(xmin, xmax) for y in range(ymin, ymax)}
         mag = source.getMagnificationForLevel(level)
         scale = mag.get('scale', 1.0)
         retile = (tileSize['width'] != metadata['tileWidth'] or
                   tileSize['height'] != metadata['tileHeight'] or
                   tileOverlap['x'] or tileOverlap['y'])
-        for y in range(ymin, ymax):
-            for x in range(xmin, xmax):
+        for y, columns in rows.items():
+            for x in columns:
                 crop = None
                 posX = int(x * tileSize['width'] - tileOverlap['x'] // 2 +
                            tileOverlap['offset_x'] - left)
@@ -625,6 +625,35 @@ def _arrayToPalette(palette: list[str | float | tuple[float, ...]]) -> np.ndarra
     return np.array(arr)
 
 
+def _interpolatePalette(
+        values: np.ndarray, stops: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """
+    Linearly interpolate values through the colors of a palette for all
+    channels at once.  For each channel, this gives the same results as
+    np.interp(values, stops, palette[:, channel]).
+
+    :param values: an array of values.
+    :param stops: a monotonically increasing array of the value of each entry
+        in the palette.
+    :param palette: an array with one row per stop and a column per channel.
+    :returns: an array with the shape of the values plus a channel axis.
+    """
+    stops = np.asarray(stops, dtype=float)
+    palette = np.asarray(palette, dtype=float)
+    if len(stops) == 1:
+        return np.broadcast_to(palette[0], values.shape + palette.shape[1:]).copy()
+    idx = (np.searchsorted(stops, values, side='right') - 1).clip(0, len(stops) - 2)
+    slopes = (palette[1:] - palette[:-1]) / (stops[1:] - stops[:-1])[:, np.newaxis]
+    # Match np.interp, which uses a palette color exactly when the palette
+    # doesn't change between adjacent stops.
+    slopes[palette[1:] == palette[:-1]] = 0
+    result = slopes[idx] * (values - stops[idx])[..., np.newaxis] + palette[idx]
+    result[values <= stops[0]] = palette[0]
+    result[values >= stops[-1]] = palette[-1]
+    result[np.isnan(values)] = np.nan
+    return result
+
+
 def _mpl_lsc_to_palette(cmap: Any) -> list[str]:
     """
     Convert a matplotlib colormap to a palette of hexcolors.
@@ -42,6 +42,7 @@ class OpenslideFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
 
     cacheName = 'tilesource'
     name = 'openslide'
+    _releasesGIL = True
     extensions = {
         None: SourcePriority.MEDIUM,
         'bif': SourcePriority.LOW,  # Ventana
@@ -55,6 +55,7 @@ class TiffFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
 
     cacheName = 'tilesource'
     name = 'tiff'
+    _releasesGIL = True
     extensions = {
         None: SourcePriority.HIGH,
         'tif': SourcePriority.PREFERRED,
@@ -715,6 +716,81 @@ class TiffFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
                 numpyAllowed=numpyAllowed, sparseFallback=sparseFallback,
                 exception=e, **kwargs)
 
+    def _getReducedTile(self, x, y, z, reduction, frame=None):
+        """
+        Get a JPEG tile decoded at a reduced size using libjpeg's DCT scaling.
+
+        :param x: the 0-based x position of the tile on the level.
+        :param y: the 0-based y position of the tile on the level.
+        :param z: the level of the tile.
+        :param reduction: the power of two by which to reduce the tile.
+        :param frame: the frame number.
+        :returns: a PIL image or None if the tile isn't stored as a JPEG.
+        """
+        frame = self._getFrame(frame=frame)
+        if frame > 0:
+            if not hasattr(self, '_frames') or self._frames[frame]['dirs'][z] is None:
+                return None
+            dir = self._getDirFromCache(*self._frames[frame]['dirs'][z])
+        else:
+            dir = self._tiffDirectories[z]
+        if dir is None:
+            return None
+        try:
+            tile = dir.getTile(x, y)
+        except (InvalidOperationTiffError, IOTiffError):
+            return None
+        if not isinstance(tile, bytes):
+            return None
+        image = PIL.Image.open(io.BytesIO(tile))
+        image.draft(image.mode, (
+            (self.tileWidth + reduction - 1) // reduction,
+            (self.tileHeight + reduction - 1) // reduction))
+        return image
+
+    def getTiles(self, tiles, *args, **kwargs):
+        """
+        Get multiple tiles from the tile source.  See the base class for
+        parameters.  Tiles that need to be read are requested in the order
+        they are stored in the file to reduce seeking.
+
+        :returns: a list of tiles in the same order as requested.
+        """
+        offsets = [self._tileFileOffset(*entry[:3], entry[3] if len(entry) > 3 else None)
+                   for entry in tiles]
+        order = sorted(range(len(tiles)), key=lambda idx: (
+            offsets[idx] is None, offsets[idx] or 0, idx))
+        results = super().getTiles([tiles[idx] for idx in order], *args, **kwargs)
+        ordered = [None] * len(tiles)
+        for pos, idx in enumerate(order):
+            ordered[idx] = results[pos]
+        return ordered
+
+    def _tileFileOffset(self, x, y, z, frame=None):
+        """
+        Get the location within the file of the data for a tile.
+
+        :param x: the tile x value.
+        :param y: the tile y value.
+        :param z: the tile level.
+        :param frame: the frame number or None.
+        :returns: the byte offset of the tile data in the file or None if it
+            cannot be determined.
+        """
+        try:
+            frame = self._getFrame(frame=frame)
+            if frame > 0:
+                if not hasattr(self, '_frames') or self._frames[frame]['dirs'][z] is None:
+                    return None
+                dir = self._getDirFromCache(*self._frames[frame]['dirs'][z])
+            else:
+                dir = self._tiffDirectories[z]
+            if dir is None:
+                return None
+            return int(dir._getRawTileLocations()[0][dir._toTileNum(x, y)])
+        except (KeyError, IndexError, TypeError, TiffError):
+            return None
+
     def _getDirFromCache(self, dirnum, subdir=None):
         if not hasattr(self, '_directoryCache') or not hasattr(self, '_directoryCacheMaxSize'):
             self._directoryCache = {}
@@ -21,6 +21,7 @@ import json
 import math
 import os
 import threading
+import zlib
 from functools import partial
 from xml.etree import ElementTree
 
@@ -68,6 +69,52 @@ _ctypesFormattbl = {
     (64, libtiff_ctypes.SAMPLEFORMAT_IEEEFP): np.float64,
 }
 
+# Read-only file descriptors used to pread raw tile data, keyed by file path.
+# Each entry is a list of the descriptor and the number of directories using
+# it, so all directories of a file share a single descriptor.
+_sharedFileDescriptors = {}
+_sharedFileDescriptorsLock = threading.Lock()
+
+
+def _acquireFileDescriptor(filePath):
+    """
+    Get a shared read-only file descriptor for a file, opening it if needed.
+    Each successful call must be matched by a call to _releaseFileDescriptor.
+
+    :param filePath: A path to a file on disk.
+    :returns: the key used to release the descriptor and the descriptor, or
+        None, None if it could not be opened.
+    """
+    key = os.path.realpath(filePath)
+    with _sharedFileDescriptorsLock:
+        entry = _sharedFileDescriptors.get(key)
+        if entry is None:
+            try:
+                entry = [os.open(key, os.O_RDONLY), 0]
+            except OSError:
+                return None, None
+            _sharedFileDescriptors[key] = entry
+        entry[1] += 1
+        return key, entry[0]
+
+
+def _releaseFileDescriptor(key):
+    """
+    Release a file descriptor acquired with _acquireFileDescriptor.  The
+    descriptor is closed when it is no longer used.
+
+    :param key: the key returned by _acquireFileDescriptor.
+    """
+    with _sharedFileDescriptorsLock:
+        entry = _sharedFileDescriptors.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _sharedFileDescriptors[key]
+            with contextlib.suppress(OSError):
+                os.close(entry[0])
+
 
 def patchLibtiff():
     libtiff_ctypes.libtiff.TIFFFieldWithTag.restype = \
@@ -83,6 +130,15 @@ def patchLibtiff():
     libtiff_ctypes.TIFFDataType.TIFF_IFD8 = 18
     # Some versions of pylibtiff specify an argtypes where they shouldn't
     libtiff_ctypes.libtiff.TIFFGetField.argtypes = None
+    # Decoding raw tile data that was read without libtiff requires libtiff
+    # 4.0.10 or newer
+    if hasattr(libtiff_ctypes.libtiff, 'TIFFReadFromUserBuffer'):
+        libtiff_ctypes.libtiff.TIFFReadFromUserBuffer.restype = ctypes.c_int
+        libtiff_ctypes.libtiff.TIFFReadFromUserBuffer.argtypes = (
+            libtiff_ctypes.TIFF, ctypes.c_uint32, ctypes.c_void_p,
+            libtiff_ctypes.c_tsize_t, ctypes.c_void_p, libtiff_ctypes.c_tsize_t)
+    libtiff_ctypes.libtiff.TIFFVStripSize.restype = libtiff_ctypes.c_tsize_t
+    libtiff_ctypes.libtiff.TIFFVStripSize.argtypes = (libtiff_ctypes.TIFF, ctypes.c_uint32)
 
 
 patchLibtiff()
@@ -121,6 +177,10 @@ class TiledTiffDirectory:
         self._mustBeTiled = mustBeTiled
 
         self._tiffFile = None
+        self._fileDescriptor = None
+        self._fileDescriptorKey = None
+        self._rawTileLocations = None
+        self._decodeSizes = None
         self._tileLock = threading.RLock()
 
         self._open(filePath, directoryNum, subDirectoryNum)
@@ -176,9 +236,16 @@ class TiledTiffDirectory:
                 setattr(self._tiffFile, func, getattr(
                     self._tiffFile, func.lower()))
         self._setDirectory(directoryNum, subDirectoryNum)
+        # Raw tile data is read with pread on a descriptor shared by all
+        # directories of the file, so reads don't share the libtiff file
+        # position and don't need a lock.
+        if hasattr(os, 'pread'):
+            self._fileDescriptorKey, self._fileDescriptor = _acquireFileDescriptor(filePath)
 
     def _setDirectory(self, directoryNum, subDirectoryNum=0):
         self._directoryNum = directoryNum
+        self._rawTileLocations = None
+        self._decodeSizes = None
         if self._tiffFile.SetDirectory(self._directoryNum) != 1:
             self._tiffFile.close()
             raise IOTiffError(
@@ -200,6 +267,12 @@ class TiledTiffDirectory:
         if self._tiffFile:
             self._tiffFile.close()
             self._tiffFile = None
+        if getattr(self, '_fileDescriptorKey', None) is not None:
+            _releaseFileDescriptor(self._fileDescriptorKey)
+            self._fileDescriptorKey = None
+        self._fileDescriptor = None
+        self._rawTileLocations = None
+        self._decodeSizes = None
 
     def _validate(self):  # noqa
         """
@@ -444,46 +517,46 @@ class TiledTiffDirectory:
         :rtype: ctypes.c_uint64 or ctypes.c_uint16
         :raises: IOTiffError
         """
-        tileByteCountsFieldInfo = libtiff_ctypes.libtiff.TIFFFieldWithTag(
-            self._tiffFile, libtiff_ctypes.TIFFTAG_TILEBYTECOUNTS).contents
-        tileByteCountsLibtiffType = tileByteCountsFieldInfo.field_type
+        return self._getArrayFieldType(libtiff_ctypes.TIFFTAG_TILEBYTECOUNTS)
+
+    def _getArrayFieldType(self, tag):
+        """
+        Get data type of the elements in a tile or strip offset or byte count
+        array.
+
+        :param tag: The libtiff tag of the array.
+        :return: The element type of the array.
+        :rtype: ctypes.c_uint64 or ctypes.c_uint16
+        :raises: IOTiffError
+        """
+        fieldInfo = libtiff_ctypes.libtiff.TIFFFieldWithTag(self._tiffFile, tag).contents
+        libtiffType = fieldInfo.field_type
 
-        if tileByteCountsLibtiffType == libtiff_ctypes.TIFFDataType.TIFF_LONG8:
+        if libtiffType == libtiff_ctypes.TIFFDataType.TIFF_LONG8:
             return ctypes.c_uint64
-        if tileByteCountsLibtiffType == \
-                libtiff_ctypes.TIFFDataType.TIFF_SHORT:
+        if libtiffType == libtiff_ctypes.TIFFDataType.TIFF_SHORT:
             return ctypes.c_uint16
         raise IOTiffError(
-            'Invalid type for TIFFTAG_TILEBYTECOUNTS: %s' % tileByteCountsLibtiffType)
+            'Invalid type for tag %d: %s' % (tag, libtiffType))
 
-    def _getJpegFrameSize(self, tileNum):
+    def _getArrayField(self, tag, count):
         """
-        Get the file size in bytes of the raw encoded JPEG frame for a tile.
-
-        :param tileNum: The internal tile number of the desired tile.
-        :type tileNum: int
-        :return: The size in bytes of the raw tile data for the desired tile.
-        :rtype: int
-        :raises: InvalidOperationTiffError or IOTiffError
+        Get a tile or strip offset or byte count array.
+
+        pylibtiff treats these tags as a scalar uint32; libtiff's documentation
+        specifies that the output will be an array of uint32; in reality and
+        per the TIFF spec, the output is an array of either uint64 or unit16,
+        so we need to call the ctypes interface directly to get these tags.
+        http://www.awaresystems.be/imaging/tiff/tifftags/tilebytecounts.html
+
+        :param tag: The libtiff tag of the array.
+        :param count: The number of entries in the array.
+        :return: The array values.
+        :rtype: numpy.ndarray
+        :raises: IOTiffError
         """
-        # TODO: is it worth it to memoize this?
-
-        # TODO: remove this check, for additional speed
-        totalTileCount = libtiff_ctypes.libtiff.TIFFNumberOfTiles(
-            self._tiffFile).value
-        if tileNum >= totalTileCount:
-            msg = 'Tile number out of range'
-            raise InvalidOperationTiffError(msg)
-
-        # pylibtiff treats the output of TIFFTAG_TILEBYTECOUNTS as a scalar
-        # uint32; libtiff's documentation specifies that the output will be an
-        # array of uint32; in reality and per the TIFF spec, the output is an
-        # array of either uint64 or unit16, so we need to call the ctypes
-        # interface directly to get this tag
-        # http://www.awaresystems.be/imaging/tiff/tifftags/tilebytecounts.html
-
-        rawTileSizesType = self._getTileByteCountsType()
-        rawTileSizes = ctypes.POINTER(rawTileSizesType)()
+        arrayType = self._getArrayFieldType(tag)
+        arrayPointer = ctypes.POINTER(arrayType)()
 
         # Some versions of pylibtiff set an explicit list of argtypes for
         # TIFFGetField.  When this is done, we need to adjust them to match
@@ -493,41 +566,89 @@ class TiledTiffDirectory:
         if libtiff_ctypes.libtiff.TIFFGetField.argtypes:
             libtiff_ctypes.libtiff.TIFFGetField.argtypes = \
                 libtiff_ctypes.libtiff.TIFFGetField.argtypes[:2] + \
-                [ctypes.POINTER(ctypes.POINTER(rawTileSizesType))]
+                [ctypes.POINTER(ctypes.POINTER(arrayType))]
         if libtiff_ctypes.libtiff.TIFFGetField(
-                self._tiffFile,
-                libtiff_ctypes.TIFFTAG_TILEBYTECOUNTS,
-                ctypes.byref(rawTileSizes)) != 1:
-            msg = 'Could not get raw tile size'
-            raise IOTiffError(msg)
+                self._tiffFile, tag, ctypes.byref(arrayPointer)) != 1:
+            raise IOTiffError('Could not get tag %d' % tag)
+        return np.ctypeslib.as_array(arrayPointer, shape=(count, )).astype(np.int64)
 
+    def _getRawTileLocations(self):
+        """
+        Get the file offsets and sizes of the raw data of every tile or strip.
+        These are read from libtiff once, so that raw data can then be read
+        without using the libtiff file handle.
+
+        :return: A tuple of two numpy arrays with the offset and size in bytes
+            of each tile or strip.
+        :raises: IOTiffError
+        """
+        locations = self._rawTileLocations
+        if locations is None:
+            with self._tileLock:
+                if self._tiffInfo.get('istiled'):
+                    count = libtiff_ctypes.libtiff.TIFFNumberOfTiles(self._tiffFile).value
+                    tags = (libtiff_ctypes.TIFFTAG_TILEOFFSETS,
+                            libtiff_ctypes.TIFFTAG_TILEBYTECOUNTS)
+                else:
+                    count = libtiff_ctypes.libtiff.TIFFNumberOfStrips(self._tiffFile).value
+                    tags = (libtiff_ctypes.TIFFTAG_STRIPOFFSETS,
+                            libtiff_ctypes.TIFFTAG_STRIPBYTECOUNTS)
+                locations = tuple(self._getArrayField(tag, count) for tag in tags)
+            self._rawTileLocations = locations
+        return locations
+
+    def _getJpegFrameSize(self, tileNum):
+        """
+        Get the file size in bytes of the raw encoded JPEG frame for a tile.
+
+        :param tileNum: The internal tile number of the desired tile.
+        :type tileNum: int
+        :return: The size in bytes of the raw tile data for the desired tile.
+        :rtype: int
+        :raises: InvalidOperationTiffError or IOTiffError
+        """
+        rawTileSizes = self._getRawTileLocations()[1]
+        if tileNum >= len(rawTileSizes):
+            msg = 'Tile number out of range'
+            raise InvalidOperationTiffError(msg)
         # In practice, this will never overflow, and it's simpler to convert the
         # long to an int
         return int(rawTileSizes[tileNum])
 
-    def _getJpegFrame(self, tileNum, entire=False):  # noqa
+    def _readRawTile(self, tileNum):
         """
-        Get the raw encoded JPEG image frame from a tile.
+        Read the raw encoded data of a tile or strip.  When the platform
+        supports it, this uses pread on a file descriptor shared by all
+        threads, so it doesn't take the libtiff lock.
 
-        :param tileNum: The internal tile number of the desired tile.
+        :param tileNum: The internal tile or strip number.
         :type tileNum: int
-        :param entire: True to return the entire frame.  False to strip off
-            container information.
-        :return: The JPEG image frame, including a JPEG Start Of Frame marker.
+        :return: The raw data.
         :rtype: bytes
         :raises: InvalidOperationTiffError or IOTiffError
         """
-        # This raises an InvalidOperationTiffError if the tile doesn't exist
-        rawTileSize = self._getJpegFrameSize(tileNum)
+        offsets, rawTileSizes = self._getRawTileLocations()
+        if tileNum >= len(rawTileSizes):
+            msg = 'Tile number out of range'
+            raise InvalidOperationTiffError(msg)
+        rawTileSize = int(rawTileSizes[tileNum])
         if rawTileSize <= 0:
             msg = 'No raw tile data'
             raise IOTiffError(msg)
-
+        if self._fileDescriptor is not None:
+            try:
+                data = os.pread(self._fileDescriptor, rawTileSize, int(offsets[tileNum]))
+            except OSError as exc:
+                raise IOTiffError('Failed to read raw tile: %s' % exc)
+            if len(data) < rawTileSize:
+                msg = 'Buffer underflow when reading tile'
+                raise IOTiffError(msg)
+            return data
         frameBuffer = ctypes.create_string_buffer(rawTileSize)
-
-        bytesRead = libtiff_ctypes.libtiff.TIFFReadRawTile(
-            self._tiffFile, tileNum,
-            frameBuffer, rawTileSize).value
+        readRaw = (libtiff_ctypes.libtiff.TIFFReadRawTile if self._tiffInfo.get('istiled')
+                   else libtiff_ctypes.libtiff.TIFFReadRawStrip)
+        with self._tileLock:
+            bytesRead = readRaw(self._tiffFile, tileNum, frameBuffer, rawTileSize).value
         if bytesRead == -1:
             msg = 'Failed to read raw tile'
             raise IOTiffError(msg)
@@ -539,25 +660,156 @@ class TiledTiffDirectory:
             # be checked for by looking for the JPEG end marker
             msg = 'Buffer overflow when reading tile'
             raise IOTiffError(msg)
+        return frameBuffer.raw
+
+    def _readEncodedTile(self, tileNum, imageBuffer, size):
+        """
+        Read and decode a tile or strip into a buffer.  The raw data is read
+        without the libtiff lock.  Uncompressed and deflate data in native
+        byte order is decoded without the lock; other data is decoded by
+        libtiff, which requires the lock.
+
+        :param tileNum: The internal tile or strip number.
+        :type tileNum: int
+        :param imageBuffer: A ctypes pointer or reference to the output buffer.
+        :param size: The number of bytes to decode.
+        :type size: int
+        :return: The number of bytes decoded or -1 if decoding failed.
+        :rtype: int
+        """
+        if (self._fileDescriptor is None or
+                not hasattr(libtiff_ctypes.libtiff, 'TIFFReadFromUserBuffer')):
+            readEncoded = (libtiff_ctypes.libtiff.TIFFReadEncodedTile
+                           if self._tiffInfo.get('istiled')
+                           else libtiff_ctypes.libtiff.TIFFReadEncodedStrip)
+            with self._tileLock:
+                readSize = readEncoded(self._tiffFile, tileNum, imageBuffer, size)
+            # pylibtiff declares different return types for tiles and strips
+            return getattr(readSize, 'value', readSize)
+        try:
+            data = self._readRawTile(tileNum)
+        except IOTiffError:
+            return -1
+        decoded = self._decodeRawTile(data)
+        if decoded is not None:
+            size = min(size, len(decoded))
+            ctypes.memmove(imageBuffer, decoded, size)
+            return size
+        # libtiff may modify the input buffer, so it can't be an immutable
+        # bytes object
+        rawBuffer = (ctypes.c_char * len(data)).from_buffer_copy(data)
+        with self._tileLock:
+            if libtiff_ctypes.libtiff.TIFFReadFromUserBuffer(
+                    self._tiffFile, tileNum, rawBuffer, len(data), imageBuffer, size) != 1:
+                return -1
+        return size
+
+    def _decodeRawTile(self, data):
+        """
+        Decode the raw data of a tile or strip without libtiff when this can
+        be done without the libtiff handle.  This handles uncompressed and
+        deflate data in native byte order, without a predictor or with
+        horizontal differencing of integer samples.
+
+        :param data: The raw data of a tile or strip.
+        :type data: bytes
+        :return: The decoded data or None if libtiff must decode it.
+        :rtype: bytes or None
+        """
+        info = self._tiffInfo
+        bitsPerSample = info.get('bitspersample', 8)
+        if ((bitsPerSample != 8 and info.get('isbyteswapped')) or
+                info.get('fillorder', libtiff_ctypes.FILLORDER_MSB2LSB) !=
+                libtiff_ctypes.FILLORDER_MSB2LSB):
+            return None
+        compression = info.get('compression', libtiff_ctypes.COMPRESSION_NONE)
+        if compression == libtiff_ctypes.COMPRESSION_NONE:
+            return data
+        if compression not in {libtiff_ctypes.COMPRESSION_ADOBE_DEFLATE,
+                               libtiff_ctypes.COMPRESSION_DEFLATE}:
+            return None
+        predictor = info.get('predictor', libtiff_ctypes.PREDICTOR_NONE)
+        format = (bitsPerSample, info.get('sampleformat') or libtiff_ctypes.SAMPLEFORMAT_UINT)
+        if predictor != libtiff_ctypes.PREDICTOR_NONE and (
+                predictor != libtiff_ctypes.PREDICTOR_HORIZONTAL or
+                format not in _ctypesFormattbl or
+                format[1] == libtiff_ctypes.SAMPLEFORMAT_IEEEFP):
+            return None
+        try:
+            decoded = zlib.decompress(data)
+        except zlib.error:
+            return None
+        if predictor == libtiff_ctypes.PREDICTOR_HORIZONTAL:
+            samples = (info.get('samplesperpixel', 1)
+                       if info.get('planarconfig', 1) != libtiff_ctypes.PLANARCONFIG_SEPARATE
+                       else 1)
+            width = info.get('tilewidth') or info.get('imagewidth')
+            dtype = np.dtype(_ctypesFormattbl[format])
+            rowSize = width * samples * dtype.itemsize
+            rows = len(decoded) // rowSize
+            values = np.frombuffer(decoded, dtype=dtype, count=rows * width * samples)
+            values = np.cumsum(values.reshape(rows, width, samples), axis=1, dtype=dtype)
+            decoded = values.tobytes()
+        return decoded
+
+    def _getDecodeSizes(self):
+        """
+        Get the decoded sizes of tiles or strips.  These are read from libtiff
+        once, so that decoding doesn't need the libtiff lock to query them.
+
+        :return: A tuple of the decoded size of a full tile or strip and the
+            decoded size of the last strip.  For tiled images, the second
+            value is the same as the first.
+        :rtype: tuple
+        """
+        sizes = self._decodeSizes
+        if sizes is None:
+            with self._tileLock:
+                if self._tiffInfo.get('istiled'):
+                    size = libtiff_ctypes.libtiff.TIFFTileSize(self._tiffFile).value
+                    sizes = (size, size)
+                else:
+                    size = libtiff_ctypes.libtiff.TIFFStripSize(self._tiffFile).value
+                    rows = (self._tiffInfo['imagelength'] -
+                            (self._stripCount - 1) * self._stripHeight)
+                    sizes = (size, libtiff_ctypes.libtiff.TIFFVStripSize(
+                        self._tiffFile, rows).value if rows < self._stripHeight else size)
+            self._decodeSizes = sizes
+        return sizes
+
+    def _getJpegFrame(self, tileNum, entire=False):  # noqa
+        """
+        Get the raw encoded JPEG image frame from a tile.
+
+        :param tileNum: The internal tile number of the desired tile.
+        :type tileNum: int
+        :param entire: True to return the entire frame.  False to strip off
+            container information.
+        :return: The JPEG image frame, including a JPEG Start Of Frame marker.
+        :rtype: bytes
+        :raises: InvalidOperationTiffError or IOTiffError
+        """
+        # This raises an InvalidOperationTiffError if the tile doesn't exist
+        frameBuffer = bytearray(self._readRawTile(tileNum))
         if entire:
-            return frameBuffer.raw[:]
+            return bytes(frameBuffer)
 
-        if frameBuffer.raw[:2] != b'\xff\xd8':
+        if frameBuffer[:2] != b'\xff\xd8':
             msg = 'Missing JPEG Start Of Image marker in frame'
             raise IOTiffError(msg)
-        if frameBuffer.raw[-2:] != b'\xff\xd9':
+        if frameBuffer[-2:] != b'\xff\xd9':
             msg = 'Missing JPEG End Of Image marker in frame'
             raise IOTiffError(msg)
-        if frameBuffer.raw[2:4] in (b'\xff\xc0', b'\xff\xc2'):
+        if frameBuffer[2:4] in (b'\xff\xc0', b'\xff\xc2'):
             frameStartPos = 2
         else:
             # VIPS may encode TIFFs with the quantization (but not Huffman)
             # tables also at the start of every frame, so locate them for
             # removal
             # VIPS seems to prefer Baseline DCT, so search for that first
-            frameStartPos = frameBuffer.raw.find(b'\xff\xc0', 2, -2)
+            frameStartPos = frameBuffer.find(b'\xff\xc0', 2, -2)
             if frameStartPos == -1:
-                frameStartPos = frameBuffer.raw.find(b'\xff\xc2', 2, -2)
+                frameStartPos = frameBuffer.find(b'\xff\xc2', 2, -2)
                 if frameStartPos == -1:
                     msg = 'Missing JPEG Start Of Frame marker'
                     raise IOTiffError(msg)
@@ -565,10 +817,10 @@ class TiledTiffDirectory:
         # 0, 1, 2, change the component ids to R, G, B to ensure color space
         # information is preserved.
         if self._tiffInfo.get('photometric') == libtiff_ctypes.PHOTOMETRIC_RGB:
-            sof = frameBuffer.raw.find(b'\xff\xc0')
+            sof = frameBuffer.find(b'\xff\xc0')
             if sof == -1:
-                sof = frameBuffer.raw.find(b'\xff\xc2')
-            sos = frameBuffer.raw.find(b'\xff\xda')
+                sof = frameBuffer.find(b'\xff\xc2')
+            sos = frameBuffer.find(b'\xff\xda')
             if (sof >= frameStartPos and sos >= frameStartPos and
                     frameBuffer[sof + 2:sof + 4] == b'\x00\x11' and
                     frameBuffer[sof + 10:sof + 19:3] == b'\x00\x01\x02' and
@@ -577,9 +829,26 @@ class TiledTiffDirectory:
                     frameBuffer[sof + 10 + idx * 3] = val
                     frameBuffer[sos + 5 + idx * 2] = val
         # Strip the Start / End Of Image markers
-        tileData = frameBuffer.raw[frameStartPos:-2]
+        tileData = bytes(frameBuffer[frameStartPos:-2])
         return tileData
 
+    def _getStripSize(self, stripNum, stripSize):
+        """
+        Get the decoded size of a strip.  This is smaller than the full strip
+        size for the last strip of an image that isn't a multiple of the strip
+        height.
+
+        :param stripNum: The internal strip number.
+        :type stripNum: int
+        :param stripSize: The decoded size of a full strip.
+        :type stripSize: int
+        :return: The decoded size of the strip in bytes.
+        :rtype: int
+        """
+        if stripNum < self._stripCount - 1:
+            return stripSize
+        return self._getDecodeSizes()[1]
+
     def _getUncompressedTile(self, tileNum):
         """
         Get an uncompressed tile or strip.
@@ -592,15 +861,9 @@ class TiledTiffDirectory:
         :raises: IOTiffError
         """
         if self._tiffInfo.get('istiled'):
-            if not hasattr(self, '_uncompressedTileSize'):
-                with self._tileLock:
-                    self._uncompressedTileSize = libtiff_ctypes.libtiff.TIFFTileSize(
-                        self._tiffFile).value
-            tileSize = self._uncompressedTileSize
+            tileSize = self._getDecodeSizes()[0]
         else:
-            with self._tileLock:
-                stripSize = libtiff_ctypes.libtiff.TIFFStripSize(
-                    self._tiffFile).value
+            stripSize = self._getDecodeSizes()[0]
             stripsCount = min(self._stripsPerTile, self._stripCount - tileNum)
             tileSize = stripSize * self._stripsPerTile
         tw, th = self._tileWidth, self._tileHeight
@@ -618,19 +881,15 @@ class TiledTiffDirectory:
                          dtype=_ctypesFormattbl[format])
         imageBuffer = image.ctypes.data_as(ctypes.POINTER(ctypes.c_char))
         if self._tiffInfo.get('istiled'):
-            with self._tileLock:
-                readSize = libtiff_ctypes.libtiff.TIFFReadEncodedTile(
-                    self._tiffFile, tileNum, imageBuffer, tileSize)
+            readSize = self._readEncodedTile(tileNum, imageBuffer, tileSize)
         else:
             readSize = 0
             imageBuffer = ctypes.cast(imageBuffer, ctypes.POINTER(ctypes.c_char * 2)).contents
             for stripNum in range(stripsCount):
-                with self._tileLock:
-                    chunkSize = libtiff_ctypes.libtiff.TIFFReadEncodedStrip(
-                        self._tiffFile,
-                        tileNum + stripNum,
-                        ctypes.byref(imageBuffer, stripSize * stripNum),
-                        stripSize).value
+                chunkSize = self._readEncodedTile(
+                    tileNum + stripNum,
+                    ctypes.byref(imageBuffer, stripSize * stripNum),
+                    self._getStripSize(tileNum + stripNum, stripSize))
                 if chunkSize <= 0:
                     msg = 'Read an unexpected number of bytes from an encoded strip'
                     raise IOTiffError(msg)
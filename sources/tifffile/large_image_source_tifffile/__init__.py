@@ -77,6 +77,7 @@ class TifffileFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
 
     cacheName = 'tilesource'
     name = 'tifffile'
+    _releasesGIL = True
     extensions = {
         None: SourcePriority.LOW,
         'scn': SourcePriority.PREFERRED,
@@ -665,11 +666,23 @@ class TifffileFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
             za, hasgbs = self._zarrcache[sidx]
         return za, hasgbs
 
-    @methodcache()
-    def getTile(self, x, y, z, pilImageAllowed=False, numpyAllowed=False, **kwargs):
-        frame = self._getFrame(**kwargs)
-        self._xyzInRange(x, y, z, frame, self._framecount)
-        x0, y0, x1, y1, step = self._xyzToCorners(x, y, z)
+    def _getTileBlock(self, xmin, ymin, xmax, ymax, z, frame):
+        """
+        Read a rectangular block of tiles from a single level and frame.
+
+        :param xmin: the first tile column.
+        :param ymin: the first tile row.
+        :param xmax: one more than the last tile column.
+        :param ymax: one more than the last tile row.
+        :param z: the tile level.
+        :param frame: the frame number.
+        :returns: a numpy array with the pixels of the block or None if the
+            level needs to be synthesized from higher resolution data.
+        """
+        self._xyzInRange(xmin, ymin, z, frame, self._framecount)
+        self._xyzInRange(xmax - 1, ymax - 1, z, frame, self._framecount)
+        x0, y0, _, _, step = self._xyzToCorners(xmin, ymin, z)
+        _, _, x1, y1, _ = self._xyzToCorners(xmax - 1, ymax - 1, z)
         if len(self._series) > 1:
             sidx = frame // self._basis['P'][0]
         else:
@@ -695,30 +708,37 @@ class TifffileFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
         else:
             bza = za
         if step > 2 ** self._maxSkippedLevels:
+            return None
+        sel = []
+        baxis = ''
+        for aidx, axis in enumerate(series.axes):
+            if axis == 'X':
+                sel.append(slice(x0, x1, step))
+                baxis += 'X'
+            elif axis == 'Y':
+                sel.append(slice(y0, y1, step))
+                baxis += 'Y'
+            elif axis == 'S':
+                sel.append(slice(series.shape[aidx]))
+                baxis += 'S'
+            else:
+                if axis not in self._basis and axis == 'I':
+                    axis = 'C'
+                sel.append((frame // self._basis[axis][0]) % self._basis[axis][2])
+        tile = bza[tuple(sel)]
+        # rotate
+        if baxis not in {'YXS', 'YX'}:
+            tile = np.moveaxis(
+                tile, [baxis.index(a) for a in 'YXS' if a in baxis], range(len(baxis)))
+        return tile
+
+    @methodcache()
+    def getTile(self, x, y, z, pilImageAllowed=False, numpyAllowed=False, **kwargs):
+        frame = self._getFrame(**kwargs)
+        tile = self._getTileBlock(x, y, x + 1, y + 1, z, frame)
+        if tile is None:
             tile, _format = self._getTileFromEmptyLevel(x, y, z, **kwargs)
             tile = large_image.tilesource.base._imageToNumpy(tile)[0]
-        else:
-            sel = []
-            baxis = ''
-            for aidx, axis in enumerate(series.axes):
-                if axis == 'X':
-                    sel.append(slice(x0, x1, step))
-                    baxis += 'X'
-                elif axis == 'Y':
-                    sel.append(slice(y0, y1, step))
-                    baxis += 'Y'
-                elif axis == 'S':
-                    sel.append(slice(series.shape[aidx]))
-                    baxis += 'S'
-                else:
-                    if axis not in self._basis and axis == 'I':
-                        axis = 'C'
-                    sel.append((frame // self._basis[axis][0]) % self._basis[axis][2])
-            tile = bza[tuple(sel)]
-            # rotate
-            if baxis not in {'YXS', 'YX'}:
-                tile = np.moveaxis(
-                    tile, [baxis.index(a) for a in 'YXS' if a in baxis], range(len(baxis)))
         return self._outputTile(tile, TILE_FORMAT_NUMPY, x, y, z,
                                 pilImageAllowed, numpyAllowed, **kwargs)
 
@@ -51,6 +51,7 @@ class VipsFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
 
     cacheName = 'tilesource'
     name = 'vips'
+    _releasesGIL = True
     extensions = {
         None: SourcePriority.LOW,
     }
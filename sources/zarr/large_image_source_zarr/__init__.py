@@ -53,6 +53,7 @@ class ZarrFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
 
     cacheName = 'tilesource'
     name = 'zarr'
+    _releasesGIL = True
     extensions = {
         None: SourcePriority.LOW,
         'zarr': SourcePriority.PREFERRED,
@@ -589,14 +590,26 @@ class ZarrFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
             img.expand_dims(axis=2)
         return large_image.tilesource.base._imageToPIL(img)
 
-    @methodcache()
-    def getTile(self, x, y, z, pilImageAllowed=False, numpyAllowed=False, **kwargs):
+    def _getTileBlock(self, xmin, ymin, xmax, ymax, z, frame):
+        """
+        Read a rectangular block of tiles from a single level and frame.
+
+        :param xmin: the first tile column.
+        :param ymin: the first tile row.
+        :param xmax: one more than the last tile column.
+        :param ymax: one more than the last tile row.
+        :param z: the tile level.
+        :param frame: the frame number.
+        :returns: a numpy array with the pixels of the block or None if the
+            level needs to be synthesized from higher resolution data.
+        """
         if self._levels is None:
             self._validateZarr()
 
-        frame = self._getFrame(**kwargs)
-        self._xyzInRange(x, y, z, frame, self._framecount)
-        x0, y0, x1, y1, step = self._xyzToCorners(x, y, z)
+        self._xyzInRange(xmin, ymin, z, frame, self._framecount)
+        self._xyzInRange(xmax - 1, ymax - 1, z, frame, self._framecount)
+        x0, y0, _, _, step = self._xyzToCorners(xmin, ymin, z)
+        _, _, x1, y1, _ = self._xyzToCorners(xmax - 1, ymax - 1, z)
         sidx = 0 if len(self._series) <= 1 else frame // self._strides['xy']
         targlevel = self.levels - 1 - z
         while targlevel and self._levels[sidx][targlevel] is None:
@@ -609,30 +622,37 @@ class ZarrFileTileSource(FileTileSource, metaclass=LruCacheMetaclass):
         y1 //= scale
         step //= scale
         if step > 2 ** self._maxSkippedLevels:
+            return None
+        idx = [slice(None) for _ in arr.shape]
+        idx[self._axes['x']] = slice(x0, x1, step)
+        idx[self._axes['y']] = slice(y0, y1, step)
+        for key in self._axes:
+            if key in self._strides:
+                pos = (frame // self._strides[key]) % self._axisCounts[key]
+                idx[self._axes[key]] = slice(pos, pos + 1)
+        trans = [idx for idx in range(len(arr.shape))
+                 if idx not in {self._axes['x'], self._axes['y'],
+                                self._axes.get('s', self._axes['x'])}]
+        squeezeCount = len(trans)
+        trans += [self._axes['y'], self._axes['x']]
+        if 's' in self._axes:
+            trans.append(self._axes['s'])
+        with self._tileLock:
+            tile = arr[tuple(idx)]
+            tile = np.transpose(tile, trans)
+        for _ in range(squeezeCount):
+            tile = tile.squeeze(0)
+        if len(tile.shape) == 2:
+            tile = np.expand_dims(tile, axis=2)
+        return tile
+
+    @methodcache()
+    def getTile(self, x, y, z, pilImageAllowed=False, numpyAllowed=False, **kwargs):
+        frame = self._getFrame(**kwargs)
+        tile = self._getTileBlock(x, y, x + 1, y + 1, z, frame)
+        if tile is None:
             tile, _format = self._getTileFromEmptyLevel(x, y, z, **kwargs)
             tile = large_image.tilesource.base._imageToNumpy(tile)[0]
-        else:
-            idx = [slice(None) for _ in arr.shape]
-            idx[self._axes['x']] = slice(x0, x1, step)
-            idx[self._axes['y']] = slice(y0, y1, step)
-            for key in self._axes:
-                if key in self._strides:
-                    pos = (frame // self._strides[key]) % self._axisCounts[key]
-                    idx[self._axes[key]] = slice(pos, pos + 1)
-            trans = [idx for idx in range(len(arr.shape))
-                     if idx not in {self._axes['x'], self._axes['y'],
-                                    self._axes.get('s', self._axes['x'])}]
-            squeezeCount = len(trans)
-            trans += [self._axes['y'], self._axes['x']]
-            if 's' in self._axes:
-                trans.append(self._axes['s'])
-            with self._tileLock:
-                tile = arr[tuple(idx)]
-                tile = np.transpose(tile, trans)
-            for _ in range(squeezeCount):
-                tile = tile.squeeze(0)
-            if len(tile.shape) == 2:
-                tile = np.expand_dims(tile, axis=2)
         return self._outputTile(tile, TILE_FORMAT_NUMPY, x, y, z,
                                 pilImageAllowed, numpyAllowed, **kwargs)
 
@@ -0,0 +1,44 @@
+import pytest
+
+from large_image.tilesource.eager_utils.eager_benchmark import (main, sweep_eager_iterator,
+                                                                synthetic_source)
+
+pytest.importorskip('large_image_source_test')
+
+
+@pytest.mark.singular
+def test_eager_profile_timing():
+    source = synthetic_source(1024, fractal=False)
+    with source.eagerIterator(
+            batch=8, prefetch=2, workers=2, tile_size={'width': 128, 'height': 128},
+            profile=True) as iterator:
+        tiles = reads = 0
+        for batch in iterator:
+            timing = batch['timing']
+            assert timing['wait'] >= 0
+            assert timing['read'] > 0 or not timing['reads']
+            tiles += timing['tiles']
+            reads += timing['reads']
+            batch['tile'].close()
+    assert tiles == iterator.get_output_image_count()
+    assert reads == len(iterator.read_kwargs)
+
+
+@pytest.mark.singular
+def test_eager_benchmark_sweep(capsys):
+    source = synthetic_source(1024, fractal=False)
+    results = sweep_eager_iterator(
+        source, workers=[2], batch=[4, 8], prefetch=[2], chunk_mult=[1],
+        max_batches=3, tile_size={'width': 128, 'height': 128})
+    assert [result['batch'] for result in results] == [4, 8]
+    for result in results:
+        assert result['batches'] == 3
+        assert result['tiles'] == 3 * result['batch']
+        assert result['tiles_per_second'] > 0
+        assert 0 <= result['starved'] <= 1
+        fractions = [value for key, value in result.items() if key.endswith('_fraction')]
+        assert sum(fractions) == pytest.approx(1)
+    assert main([
+        '--workers', '2', '--batch', '4', '--max-batches', '2',
+        '--synthetic-size', '512', '--json']) == 0
+    assert '"tiles_per_second"' in capsys.readouterr().out
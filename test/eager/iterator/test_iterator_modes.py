@@ -300,6 +300,217 @@ def test_eager_transform_save_mode_can_pass_region_coordinates(datastore_svs_sou
     assert len(shapes) == 1
 
 
+@pytest.mark.singular
+def test_eager_reuse_buffers_matches_new_buffers(datastore_svs_source):
+    kwargs = dict(
+        tiles=np.array([[0, 0], [0, 1], [1, 0], [1, 1], [2, 2]], dtype=np.float32),
+        batch=2,
+        prefetch=1,
+        workers=2,
+    )
+    batches = []
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        for batch in iterator:
+            batches.append(batch['tile'].view().copy())
+            batch['tile'].close()
+    reused = []
+    with datastore_svs_source.eagerIterator(reuse_buffers=True, **kwargs) as iterator:
+        for batch in iterator:
+            reused.append(batch['tile'].view().copy())
+        allocated = iterator.buffer_pool.allocated
+    assert allocated <= kwargs['prefetch'] + 2
+    assert len(reused) == len(batches)
+    for tiles, reused_tiles in zip(batches, reused, strict=True):
+        assert np.array_equal(tiles, reused_tiles)
+
+
+@pytest.mark.singular
+def test_eager_workers_do_not_pickle_source(datastore_svs_source, monkeypatch):
+    # Worker processes receive the source once when they start, so sources
+    # that cannot be pickled can still be read.
+    monkeypatch.setattr(datastore_svs_source, '_unpickleable', True, raising=False)
+    tiles = np.array([[0, 0], [0, 1], [1, 0]], dtype=np.float32)
+    with datastore_svs_source.eagerIterator(
+            tiles=tiles, batch=2, prefetch=1, workers=2) as iterator:
+        count = 0
+        for batch in iterator:
+            count += batch['tile'].shape[0]
+            batch['tile'].close()
+    assert count == len(tiles)
+
+
+@pytest.mark.singular
+def test_eager_multiple_sources_share_workers(datastore_svs_source, datastore_svs_path):
+    import large_image
+
+    tiles = [
+        np.array([[0, 0], [0, 1], [1, 0]], dtype=np.float32),
+        np.array([[2, 2], [2, 3]], dtype=np.float32),
+    ]
+    expected = {}
+    for slide, slide_tiles in enumerate(tiles):
+        with datastore_svs_source.eagerIterator(
+                tiles=slide_tiles, batch=2, prefetch=1, workers=2) as iterator:
+            for batch in iterator:
+                for idx in range(batch['tile'].shape[0]):
+                    key = (slide, int(batch['gx'][idx]), int(batch['gy'][idx]))
+                    expected[key] = batch['tile'].view()[idx].copy()
+                batch['tile'].close()
+
+    found = {}
+    with large_image.tilesource.eagerIterator(
+            [datastore_svs_source, datastore_svs_path], tiles=tiles, batch=2,
+            prefetch=1, workers=2) as iterator:
+        for batch in iterator:
+            assert len(batch['slide']) == batch['tile'].shape[0]
+            assert len(batch['mm_x']) == batch['tile'].shape[0]
+            for idx in range(batch['tile'].shape[0]):
+                key = (int(batch['slide'][idx]), int(batch['gx'][idx]), int(batch['gy'][idx]))
+                found[key] = batch['tile'].view()[idx].copy()
+            batch['tile'].close()
+    assert found.keys() == expected.keys()
+    for key, tile in expected.items():
+        assert np.array_equal(found[key], tile)
+
+
+@pytest.mark.singular
+def test_eager_multiple_sources_plan_lazily(datastore_svs_path):
+    import large_image
+
+    tiles = np.array([[0, 0], [0, 1], [1, 0]], dtype=np.float32)
+    kwargs = dict(
+        tiles=[tiles] * 5, batch=2, prefetch=1, workers=2, open_slides=2, policy='random')
+    with large_image.tilesource.eagerIterator([datastore_svs_path] * 5, **kwargs) as iterator:
+        assert len(iterator._slide_read_args) < 5
+        batches = []
+        for batch in iterator:
+            batches.append(np.column_stack([batch['slide'], batch['gx'], batch['gy']]))
+            batch['tile'].close()
+            if len(batches) == 3:
+                state = iterator.state_dict()
+        assert len(iterator._slide_read_args) == 5
+    assert sum(len(entries) for entries in batches) == 15
+    with large_image.tilesource.eagerIterator([datastore_svs_path] * 5, **kwargs) as iterator:
+        assert len(iterator) == len(batches)
+        iterator.load_state_dict(state)
+        resumed = []
+        for batch in iterator:
+            resumed.append(np.column_stack([batch['slide'], batch['gx'], batch['gy']]))
+            batch['tile'].close()
+    assert len(resumed) == len(batches) - 3
+    for entries, expected in zip(resumed, batches[3:], strict=True):
+        np.testing.assert_array_equal(entries, expected)
+
+
+@pytest.mark.singular
+@pytest.mark.parametrize('pad_shards', [False, True])
+def test_eager_ranks_read_disjoint_tiles(datastore_svs_source, datastore_svs_path, pad_shards):
+    import large_image
+
+    # Neither source divides evenly into three ranks
+    tiles = np.array([[y, x] for y in range(3) for x in range(3)][:8], dtype=np.float32)
+    kwargs = dict(
+        batch=2, prefetch=1, workers=2, chunk_mult=1, world_size=3, pad_shards=pad_shards)
+    iterators = {
+        'single': (lambda rank: datastore_svs_source.eagerIterator(
+            tiles=tiles, rank=rank, **kwargs), len(tiles)),
+        'multiple': (lambda rank: large_image.tilesource.eagerIterator(
+            [datastore_svs_source, datastore_svs_path], tiles=[tiles, tiles[:5]],
+            rank=rank, **kwargs), len(tiles) + 5),
+    }
+    for create, total in iterators.values():
+        lengths = []
+        shards = []
+        for rank in range(3):
+            entries = []
+            with create(rank) as iterator:
+                lengths.append(len(iterator))
+                batches = 0
+                for batch in iterator:
+                    batches += 1
+                    slides = batch.get('slide', [0] * len(batch['gx']))
+                    entries.extend(zip(
+                        [int(slide) for slide in slides], batch['gx'].tolist(),
+                        batch['gy'].tolist(), strict=True))
+                    batch['tile'].close()
+            assert batches == lengths[-1]
+            shards.append(entries)
+        distinct = [set(entries) for entries in shards]
+        for rank in range(3):
+            for other in range(rank + 1, 3):
+                assert not distinct[rank] & distinct[other]
+        assert sum(len(entries) for entries in distinct) == total
+        if pad_shards:
+            assert len(set(lengths)) == 1
+            assert len({len(entries) for entries in shards}) == 1
+        else:
+            assert sum(len(entries) for entries in shards) == total
+
+
+@pytest.mark.singular
+def test_eager_random_access_and_resume(datastore_svs_source):
+    import json
+
+    kwargs = dict(
+        tiles=np.array([[y, x] for y in range(3) for x in range(3)], dtype=np.float32),
+        batch=2,
+        prefetch=1,
+        workers=2,
+        chunk_mult=1,
+        randomize_chunks=True,
+    )
+
+    def batch_values(batch):
+        values = (batch['gx'].tolist(), batch['gy'].tolist(), batch['tile'].view().copy())
+        batch['tile'].close()
+        return values
+
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        assert len(iterator) == 5
+        batches = [batch_values(batch) for batch in iterator]
+    assert len(batches) == 5
+
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        for index in (3, 0, -1):
+            gx, gy, tiles = batch_values(iterator[index])
+            assert gx == batches[index][0]
+            assert gy == batches[index][1]
+            assert np.array_equal(tiles, batches[index][2])
+        with pytest.raises(IndexError):
+            iterator[5]
+        batch_values(next(iterator))
+        batch_values(next(iterator))
+        state = json.loads(json.dumps(iterator.state_dict()))
+    assert state['batch_index'] == 2
+
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        iterator.load_state_dict(state)
+        resumed = [batch_values(batch) for batch in iterator]
+    assert len(resumed) == 3
+    for (gx, gy, tiles), expected in zip(resumed, batches[2:], strict=True):
+        assert gx == expected[0]
+        assert gy == expected[1]
+        assert np.array_equal(tiles, expected[2])
+
+
+@pytest.mark.singular
+def test_eager_thread_executor_matches_process_executor(datastore_svs_source):
+    tiles = np.array([[0, 0], [0, 1], [1, 0], [1, 1], [2, 2]], dtype=np.float32)
+    results = {}
+    for executor, workers in (('process', 2), ('thread', 1), ('thread', 3)):
+        with datastore_svs_source.eagerIterator(
+                tiles=tiles, batch=2, prefetch=1, workers=workers,
+                executor=executor) as iterator:
+            assert iterator.executor == executor
+            batches = []
+            for batch in iterator:
+                batches.append(batch['tile'].view().copy())
+                batch['tile'].close()
+        results[(executor, workers)] = np.concatenate(batches)
+    assert np.array_equal(results[('process', 2)], results[('thread', 1)])
+    assert np.array_equal(results[('process', 2)], results[('thread', 3)])
+
+
 @pytest.mark.singular
 def test_eager_randomized_chunks_are_seed_reproducible(datastore_svs_source):
     kwargs = dict(
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from large_image.tilesource.eager_utils.eager_tissue_mask import (compute_tissue_mask,
+                                                                  get_tissue_mask,
+                                                                  otsu_threshold)
+
+
+def test_otsu_threshold_separates_classes():
+    values = np.concatenate([np.full(100, 0.1), np.full(50, 0.8)])
+    threshold = otsu_threshold(values)
+    assert 0.1 < threshold < 0.8
+    assert otsu_threshold(np.full(10, 0.5)) <= 0.5
+
+
+def test_compute_tissue_mask_finds_stained_area():
+    rng = np.random.default_rng(0)
+    image = np.clip(rng.normal(238, 4, (200, 300, 3)), 0, 255).astype(np.uint8)
+    image[50:120, 100:250] = np.clip(
+        rng.normal((190, 110, 170), 20, (70, 150, 3)), 0, 255).astype(np.uint8)
+    mask = compute_tissue_mask(image)
+    assert mask.dtype == np.uint8
+    assert mask.shape == (200, 300)
+    tissue = np.count_nonzero(mask[50:120, 100:250])
+    assert tissue > 0.99 * 70 * 150
+    assert np.count_nonzero(mask) - tissue < 0.001 * mask.size
+
+
+def test_compute_tissue_mask_blank_glass():
+    rng = np.random.default_rng(0)
+    image = np.clip(rng.normal(238, 4, (100, 100, 4)), 0, 255).astype(np.uint8)
+    assert not np.count_nonzero(compute_tissue_mask(image))
+
+
+@pytest.mark.singular
+def test_eager_auto_mask_skips_background(datastore_svs_source):
+    mask = get_tissue_mask(datastore_svs_source)
+    assert get_tissue_mask(datastore_svs_source) is mask
+    assert 0 < np.count_nonzero(mask) < mask.size
+    kwargs = dict(batch=8, prefetch=1, workers=2, tile_size={'width': 256, 'height': 256})
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        all_tiles = iterator.get_output_image_count()
+    with datastore_svs_source.eagerIterator(mask='auto', **kwargs) as iterator:
+        tissue_tiles = iterator.get_output_image_count()
+    assert 0 < tissue_tiles < all_tiles
@@ -1,8 +1,10 @@
 import numpy as np
+import pytest
 
 from large_image.tilesource.eager_utils.eager_read_args import (
-    default_region_coords_and_target_scale_from_read_args,
-    gen_read_args_for_tiles)
+    count_native_tile_decodes, default_region_coords_and_target_scale_from_read_args,
+    gen_read_args_for_tiles, gen_read_args_native_grid, interleave_slide_chunks,
+    native_aligned_cuts, shard_read_args)
 from large_image.tilesource.eager_utils.eager_wsi_operations import calculate_slide_dimensions
 
 
@@ -98,3 +100,133 @@ def test_default_region_coords_and_target_scale_from_read_args():
     assert result[5] is None
     assert result[6] == {'width': 128, 'height': 256}
     assert result[7] == {'magnification': 20}
+
+
+def test_interleave_slide_chunks_round_robin():
+    order = list(interleave_slide_chunks([3, 1, 2]))
+    assert order == [(0, 0), (1, 0), (2, 0), (0, 1), (2, 1), (0, 2)]
+
+
+@pytest.mark.parametrize(('policy', 'weights'), [('random', None), ('weighted', [1, 2, 5])])
+def test_interleave_slide_chunks_keeps_chunk_order(policy, weights):
+    order = np.array(list(interleave_slide_chunks([30, 10, 20], policy, weights, seed=3)))
+    assert len(order) == 60
+    for slide, count in enumerate([30, 10, 20]):
+        assert order[order[:, 0] == slide, 1].tolist() == list(range(count))
+    np.testing.assert_array_equal(
+        order, list(interleave_slide_chunks([30, 10, 20], policy, weights, seed=3)))
+
+
+def test_interleave_slide_chunks_weighted():
+    order = np.array(list(interleave_slide_chunks([1000, 1000], 'weighted', [1, 9])))
+    assert np.count_nonzero(order[:100, 0] == 1) > 75
+    order = list(interleave_slide_chunks([3, 3], 'weighted', [0, 1]))
+    assert order == [(1, 0), (1, 1), (1, 2)]
+    with pytest.raises(ValueError, match='weights'):
+        interleave_slide_chunks([3, 3], 'weighted')
+    with pytest.raises(ValueError, match='policy'):
+        interleave_slide_chunks([3, 3], 'unknown')
+
+
+@pytest.mark.parametrize('policy', ['round_robin', 'random'])
+def test_interleave_slide_chunks_window(policy):
+    started = []
+
+    def count(slide):
+        started.append(slide)
+        return 3
+
+    order = interleave_slide_chunks(count, policy, window=2, slides=5)
+    assert started == []
+    seen = []
+    for slide, _chunk in order:
+        seen.append(slide)
+        # Slides are only started as earlier slides finish
+        assert len([s for s in started if seen.count(s) < 3]) <= 2
+    assert started == [0, 1, 2, 3, 4]
+    assert sorted(seen) == sorted([0, 1, 2, 3, 4] * 3)
+    assert list(interleave_slide_chunks([3, 3, 3], window=2)) == [
+        (0, 0), (1, 0), (0, 1), (1, 1), (0, 2), (1, 2), (2, 0), (2, 1), (2, 2)]
+
+
+def test_shard_read_args_partitions_chunks():
+    chunks = [np.full((count, 10), idx) for idx, count in enumerate([4, 4, 3, 1, 4, 2])]
+    shards = [shard_read_args(chunks, rank, 4) for rank in range(4)]
+    assert sorted(id(chunk) for shard in shards for chunk in shard) == sorted(
+        id(chunk) for chunk in chunks)
+    for shard in shards:
+        # Each shard is a contiguous run of chunks
+        indexes = [int(chunk[0, 0]) for chunk in shard]
+        assert indexes == list(range(indexes[0], indexes[0] + len(indexes)))
+    padded = [shard_read_args(chunks, rank, 4, pad=True) for rank in range(4)]
+    assert len({sum(len(chunk) for chunk in shard) for shard in padded}) == 1
+    assert shard_read_args(chunks, 0, 1) is chunks
+    assert sum(len(chunk) for chunk in shard_read_args(chunks[:1], 2, 3, pad=True)) == 4
+    with pytest.raises(ValueError, match='rank'):
+        shard_read_args(chunks, 4, 4)
+
+
+def _grid_read_args(tile_width, count, offset=0):
+    rows = []
+    for ty in range(count):
+        for tx in range(count):
+            top, left = offset + ty * tile_width, offset + tx * tile_width
+            rows.append([0, 0, ty, tx, top, top + tile_width, left, left + tile_width, 1, 1])
+    return np.array(rows, dtype=np.float32)
+
+
+def test_native_grid_chunks_do_not_share_native_tiles():
+    # A low resolution read level whose native tiles are 1024 base pixels wide
+    slide_dimensions = {
+        'native_tile_width': 1024, 'native_tile_height': 1024,
+        'base_size_x': 4096, 'base_size_y': 4096,
+    }
+    read_args = _grid_read_args(512, 8)
+    output_chunks = [read_args[(read_args[:, 2] // 3 == gy) & (read_args[:, 3] // 3 == gx)]
+                     for gy in range(3) for gx in range(3)]
+    decodes, unique = count_native_tile_decodes(output_chunks, slide_dimensions)
+    assert unique == 16
+    assert decodes > unique
+
+    chunks = gen_read_args_native_grid(read_args, slide_dimensions, chunk_mult=2)
+    assert len(chunks) == 4
+    assert sum(len(chunk) for chunk in chunks) == len(read_args)
+    assert count_native_tile_decodes(chunks, slide_dimensions) == (16, 16)
+    for chunk in chunks:
+        # Tiles within a chunk stay in row-major order
+        order = chunk[:, 2] * 100 + chunk[:, 3]
+        assert np.all(np.diff(order) > 0)
+
+
+def test_native_grid_chunks_cut_at_shared_edges():
+    # 224 pixel output tiles on 256 pixel native tiles share an edge every 1792 pixels
+    slide_dimensions = {
+        'native_tile_width': 256, 'native_tile_height': 256,
+        'base_size_x': 8192, 'base_size_y': 8192,
+    }
+    read_args = _grid_read_args(224, 37)
+    for chunk_mult in (2, 4):
+        groups = read_args[:, 2] // chunk_mult * 37 + read_args[:, 3] // chunk_mult
+        output_chunks = [read_args[groups == group] for group in np.unique(groups)]
+        decodes, unique = count_native_tile_decodes(output_chunks, slide_dimensions)
+        output_amplification = decodes / unique
+        chunks = gen_read_args_native_grid(read_args, slide_dimensions, chunk_mult)
+        assert sum(len(chunk) for chunk in chunks) == len(read_args)
+        decodes, unique = count_native_tile_decodes(chunks, slide_dimensions)
+        assert decodes / unique < 1.1 < output_amplification
+    assert list(native_aligned_cuts(np.arange(37) * 224.0, 256, 2)) == [
+        0, 1792, 3584, 5376, 7168]
+    # Without a shared edge nearby, chunks are cut past chunk_mult native tiles
+    assert list(native_aligned_cuts(np.arange(40) * 100.0, 256, 1)) == list(
+        range(0, 3001, 300))
+
+
+def test_count_native_tile_decodes_clips_to_image():
+    slide_dimensions = {
+        'native_tile_width': 256, 'native_tile_height': 256,
+        'base_size_x': 600, 'base_size_y': 600,
+    }
+    # Tiles that cross the image edge only decode the native tiles in the image
+    chunks = [_grid_read_args(400, 2)]
+    assert count_native_tile_decodes(chunks, slide_dimensions) == (9, 9)
+    assert count_native_tile_decodes([], slide_dimensions) == (0, 0)
@@ -0,0 +1,71 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from large_image.tilesource.eager_utils.eager_shared_array import SharedArrayPool
+
+
+@pytest.mark.singular
+def test_shared_array_pool_reuses_released_arrays():
+    pool = SharedArrayPool((4, 16, 16, 3), np.uint8, size=2, maxsize=3)
+    try:
+        assert pool.allocated == 2
+        first = pool.acquire()
+        second = pool.acquire()
+        assert first is not second
+        first.insert(np.full((16, 16, 3), 7, np.uint8), 0)
+        # Closing a pooled array returns it to the pool rather than unlinking it
+        first.close()
+        first.release()
+        assert pool.acquire() is first
+        assert first.view()[0, 0, 0, 0] == 7
+        # A new array is allocated when all arrays are in use
+        third = pool.acquire()
+        assert pool.allocated == 3
+        # Arrays are restored to the pool shape when reused
+        third.resize_shm([2, 16, 16, 3])
+        third.release()
+        assert pool.acquire().shape == (4, 16, 16, 3)
+    finally:
+        pool.close()
+    assert pool.allocated == 0
+
+
+@pytest.mark.singular
+def test_shared_array_pool_is_bounded():
+    pool = SharedArrayPool((2, 8, 8, 3), np.uint8, size=2)
+    try:
+        held = [pool.acquire() for _ in range(4)]
+        # Arrays past the pool size are allocated outside of the pool
+        assert pool.allocated == 2
+        assert pool.overflow == 2
+        extra = held[3]
+        extra.insert(np.full((8, 8, 3), 3, np.uint8), 0)
+        assert extra.view()[0, 0, 0, 0] == 3
+        extra.release()
+        assert extra._closed
+        held[0].release()
+        assert pool.acquire() is held[0]
+        assert pool.allocated == 2
+    finally:
+        pool.close()
+
+
+@pytest.mark.singular
+def test_process_memory_shared_array_pool():
+    pool = SharedArrayPool((4, 8, 8, 3), np.uint8, size=1, shared=False)
+    try:
+        arr = pool.acquire()
+        assert not hasattr(arr, 'shm_array')
+        arr.insert(np.full((8, 8, 3), 5, np.uint8), 1)
+        arr.resize_shm([2, 8, 8, 3])
+        assert arr.view().shape == (2, 8, 8, 3)
+        assert arr.view()[1, 0, 0, 0] == 5
+        with pytest.raises(TypeError):
+            pickle.dumps(arr)
+        arr.release()
+        assert pool.acquire() is arr
+        assert arr.view().shape == (4, 8, 8, 3)
+    finally:
+        pool.close()
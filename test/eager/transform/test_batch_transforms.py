@@ -0,0 +1,94 @@
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+from large_image.tilesource.eager_utils.eager_batch_transforms import (BatchCompose,
+                                                                       MacenkoNormalize,
+                                                                       Normalize,
+                                                                       RandomFlipRotate,
+                                                                       ReinhardNormalize,
+                                                                       ToDtype)
+
+
+def _stained_batch(count=8, size=32, seed=0):
+    rng = np.random.default_rng(seed)
+    hematoxylin = np.array([0.65, 0.70, 0.29])
+    eosin = np.array([0.07, 0.99, 0.11])
+    concentrations = rng.gamma(2, 0.4, (count, size, size, 2))
+    od = concentrations[..., :1] * hematoxylin + concentrations[..., 1:] * eosin
+    return np.clip(240 * np.exp(-od) - 1, 0, 255).astype(np.uint8)
+
+
+def test_random_flip_rotate_uses_dihedral_transforms():
+    batch = _stained_batch()
+    out = RandomFlipRotate(seed=1)(batch)
+    assert out.shape == batch.shape
+    for tile, tile_out in zip(batch, out, strict=True):
+        options = [np.rot90(tile, k) for k in range(4)]
+        options += [option[:, ::-1] for option in options]
+        assert any(np.array_equal(option, tile_out) for option in options)
+    # Tiles that are not square keep their shape
+    assert RandomFlipRotate()(np.zeros((5, 4, 6, 3))).shape == (5, 4, 6, 3)
+
+
+def test_random_flip_rotate_uses_a_generator_per_thread():
+    transform = RandomFlipRotate(seed=1)
+    generator = transform._generator()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(transform._generator).result() is not generator
+    assert transform._generator() is generator
+
+
+def test_dtype_and_normalize_compose():
+    batch = _stained_batch(2)
+    out = BatchCompose([ToDtype(np.float32, 1 / 255), Normalize([0.5] * 3, [0.25] * 3)])(batch)
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out, (batch / 255 - 0.5) / 0.25, atol=1e-5)
+
+
+def test_reinhard_matches_reference_statistics():
+    batch = _stained_batch()
+    normalizer = ReinhardNormalize.fit(batch[0])
+    out = normalizer(batch)
+    assert out.dtype == np.uint8
+    assert np.abs(out[0].astype(int) - batch[0]).max() <= 1
+    lab = ReinhardNormalize.to_lab(out[1]).reshape(-1, 3)
+    np.testing.assert_allclose(lab.mean(axis=0), normalizer.target_mean, atol=0.02)
+
+
+def test_macenko_normalizes_stained_tiles():
+    batch = _stained_batch()
+    out = MacenkoNormalize()(batch)
+    assert out.shape == batch.shape
+    assert out.dtype == np.uint8
+    assert not np.array_equal(out, batch)
+    # Tiles of the same stains are mapped to nearly the same colors
+    means = out.reshape(len(out), -1, 3).mean(axis=1)
+    assert np.ptp(means, axis=0).max() < 10
+    blank = np.full((2, 16, 16, 3), 235, dtype=np.uint8)
+    assert np.array_equal(MacenkoNormalize()(blank), blank)
+
+
+@pytest.mark.singular
+def test_eager_batch_transform(datastore_svs_source):
+    kwargs = dict(
+        tiles=np.array([[0, 0], [0, 1], [1, 0], [1, 1], [2, 2]], dtype=np.float32),
+        batch=2,
+        prefetch=1,
+        workers=2,
+    )
+    with datastore_svs_source.eagerIterator(**kwargs) as iterator:
+        expected = []
+        for batch in iterator:
+            expected.append(batch['tile'].view().copy())
+            batch['tile'].close()
+    expected = np.concatenate(expected).astype(np.float32) / 255
+    with datastore_svs_source.eagerIterator(
+            batch_transform=ToDtype(np.float32, 1 / 255), nchw=True, **kwargs) as iterator:
+        assert iterator.out_dims[1] == 3
+        tiles = []
+        for batch in iterator:
+            tiles.append(batch['tile'].view().copy())
+            batch['tile'].close()
+    np.testing.assert_allclose(np.concatenate(tiles), expected.transpose(0, 3, 1, 2), atol=1e-6)
@@ -4,12 +4,17 @@ import threading
 import time
 
 import cachetools
+import numpy as np
+import PIL.Image
 import pytest
 
 import large_image.cache_util.cache
+from large_image.cache_util.cachefactory import ByteSizeLRUCache
 from large_image import config
-from large_image.cache_util import (LruCacheMetaclass, MemCache, RedisCache,
-                                    cachesClear, cachesInfo, getTileCache,
+from large_image.cache_util import (DiskCache, LruCacheMetaclass, MemCache,
+                                    RedisCache, SharedMemoryCache, TieredCache,
+                                    cacheGetMany, cachesClear, cachesInfo, cachesPurge,
+                                    cacheSetMany, cachesStats, getTileCache,
                                     methodcache, strhash)
 
 
@@ -72,6 +77,211 @@ def testCheckCacheRedis():
     assert val == 354224848179261915075
 
 
+@pytest.fixture
+def sharedMemoryCache():
+    name = 'large_image_test_%d' % os.getpid()
+    cache = SharedMemoryCache(name, 4 * 1024 ** 2)
+    yield cache
+    cache.clear()
+    cache.unlink()
+
+
+def testCacheSharedMemory(sharedMemoryCache):
+    cache_test(sharedMemoryCache)
+    val = sharedMemoryCache['(2,)']
+    assert val == 1
+    val = sharedMemoryCache['(100,)']
+    assert val == 354224848179261915075
+    # A second instance uses the same memory
+    other = SharedMemoryCache(sharedMemoryCache._name)
+    assert other['(100,)'] == 354224848179261915075
+    assert other.maxsize == sharedMemoryCache.maxsize
+
+
+def testCacheSharedMemoryEviction(sharedMemoryCache):
+    value = b'x' * 100000
+    for idx in range(100):
+        sharedMemoryCache['key%d' % idx] = value
+        # Keep the first key recently used
+        assert sharedMemoryCache['key0'] == value
+    assert sharedMemoryCache.currsize <= sharedMemoryCache.maxsize
+    assert sharedMemoryCache.curritems < 100
+    assert 'key0' in sharedMemoryCache
+    assert 'key1' not in sharedMemoryCache
+    assert 'key99' in sharedMemoryCache
+    del sharedMemoryCache['key99']
+    with pytest.raises(KeyError):
+        sharedMemoryCache['key99']
+    # Values that are too large aren't cached
+    sharedMemoryCache['large'] = b'x' * sharedMemoryCache.maxsize
+    assert 'large' not in sharedMemoryCache
+    sharedMemoryCache.clear()
+    assert sharedMemoryCache.curritems == 0
+
+
+def testCacheDisk(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache_test(cache)
+    assert cache['(100,)'] == 354224848179261915075
+    # Values persist in a new instance
+    cache = DiskCache(str(tmp_path))
+    assert cache['(100,)'] == 354224848179261915075
+    assert cache.curritems == 100
+    del cache['(100,)']
+    assert '(100,)' not in cache
+    cache.clear()
+    assert cache.curritems == 0
+    assert cache.currsize == 0
+
+
+def testCacheDiskEviction(tmp_path):
+    cache = DiskCache(str(tmp_path), 1000000)
+    value = b'x' * 50000
+    for idx in range(100):
+        cache['key%d' % idx] = value
+        # Keep the first key recently used
+        cache._connection().execute(
+            'UPDATE entries SET used = ? WHERE key = ?', (time.time() + 1, cache._hashKey('key0')))
+    assert cache.currsize <= cache.maxsize
+    assert 'key0' in cache
+    assert 'key1' not in cache
+    assert 'key99' in cache
+    # Values that are too large aren't cached
+    cache['large'] = b'x' * cache.maxsize
+    assert 'large' not in cache
+
+
+def testCacheTiered(tmp_path):
+    primary = cachetools.LRUCache(10)
+    cache = TieredCache(primary, DiskCache(str(tmp_path)))
+    cache_test(cache)
+    cache.flush()
+    assert len(primary) == 10
+    assert cache.secondary.curritems == 100
+    assert '(50,)' not in primary
+    assert cache['(50,)'] == 12586269025
+    assert '(50,)' in primary
+    # Clearing keeps the disk tier
+    cache.clear()
+    assert len(primary) == 0
+    assert cache.secondary.curritems == 100
+    assert cache['(50,)'] == 12586269025
+    cache.purge()
+    assert len(primary) == 0
+    assert cache.secondary.curritems == 0
+
+
+def testCacheTieredBackgroundWrites(tmp_path):
+    secondary = DiskCache(str(tmp_path))
+    cache = TieredCache(cachetools.LRUCache(2), secondary)
+    cache['key'] = 'value'
+    cache['key2'] = 'value2'
+    cache['key3'] = 'value3'
+    # Values waiting to be written can be read
+    assert cache['key'] == 'value'
+    cache._writer.submit(lambda: None).result()
+    cache.flush()
+    assert secondary['key'] == 'value'
+    assert secondary.curritems == 3
+
+
+def testCacheTieredBoundedPending(tmp_path):
+    secondary = DiskCache(str(tmp_path))
+    cache = TieredCache(cachetools.LRUCache(10), secondary, maxPending=2)
+    cache['key0'] = 'value0'
+    cache._writer.submit(lambda: None).result()
+    # Hold the background writer so values stay pending
+    event = threading.Event()
+    cache._writer.submit(event.wait)
+    cache['key1'] = 'value1'
+    cache['key2'] = 'value2'
+    assert len(cache._pending) == 2
+    # When the pending values are full, values are written immediately
+    cache['key3'] = 'value3'
+    assert len(cache._pending) == 2
+    assert secondary['key3'] == 'value3'
+    event.set()
+    cache._writer.submit(lambda: None).result()
+    assert secondary.curritems == 4
+
+
+def testDiskTierKey(tmp_path):
+    class Source:
+        def _getLargeImagePath(self):
+            return str(path)
+
+    path = tmp_path / 'image.tiff'
+    path.write_bytes(b'image')
+    source = Source()
+    source.cache = cachetools.LRUCache(10)
+    # Only sources cached in a disk tier include the file state
+    assert large_image.cache_util.cache._diskTierKey(source) == ''
+    source.cache = TieredCache(cachetools.LRUCache(10), DiskCache(str(tmp_path / 'cache')))
+    key = large_image.cache_util.cache._diskTierKey(source)
+    assert key
+    path.write_bytes(b'replaced image')
+    assert large_image.cache_util.cache._diskTierKey(source) != key
+    path.unlink()
+    assert large_image.cache_util.cache._diskTierKey(source) == ''
+
+
+@pytest.mark.singular
+def testGetTileCacheDisk(tmp_path):
+    large_image.cache_util.cache._tileCache = None
+    large_image.cache_util.cache._tileLock = None
+    config.setConfig('cache_backend', 'python')
+    config.setConfig('cache_disk_path', str(tmp_path))
+    try:
+        tileCache, tileLock = getTileCache()
+        assert isinstance(tileCache, TieredCache)
+        # The tiered cache does its own locking
+        assert tileLock is None
+        assert 'tileDiskCache' in cachesInfo()
+        tileCache['key'] = 'value'
+        tileCache.flush()
+        cachesClear()
+        assert tileCache.secondary.curritems == 1
+        cachesPurge()
+        assert tileCache.secondary.curritems == 0
+    finally:
+        config.setConfig('cache_disk_path', None)
+        large_image.cache_util.cache._tileCache = None
+        large_image.cache_util.cache._tileLock = None
+
+
+def cache_many_test(specific_cache):
+    cacheSetMany(specific_cache, {'key%d' % idx: idx for idx in range(20)})
+    keys = ['key%d' % idx for idx in range(0, 40, 2)]
+    results = cacheGetMany(specific_cache, keys)
+    assert results == {'key%d' % idx: idx for idx in range(0, 20, 2)}
+    assert cacheGetMany(specific_cache, []) == {}
+
+
+def testCacheManyCacheTools():
+    cache_many_test(cachetools.LRUCache(100))
+
+
+@pytest.mark.singular
+def testCacheManyMemcached():
+    cache_many_test(MemCache())
+
+
+@pytest.mark.singular
+@pytest.mark.skipif(os.getenv('REDIS_TEST_URL') is None, reason='REDIS_TEST_URL is not set')
+def testCacheManyRedis():
+    config.setConfig('cache_redis_url', os.getenv('REDIS_TEST_URL'))
+    cache_many_test(RedisCache())
+
+
+def testCacheManySharedMemory(sharedMemoryCache):
+    cache_many_test(sharedMemoryCache)
+
+
+def testCacheManyDisk(tmp_path):
+    cache_many_test(DiskCache(str(tmp_path)))
+    cache_many_test(TieredCache(cachetools.LRUCache(5), DiskCache(str(tmp_path))))
+
+
 def testBadMemcachedUrl():
     cache = MemCache(url=['192.0.2.254', '192.0.2.253'])
 
@@ -87,9 +297,48 @@ def testGetTileCachePython():
     config.setConfig('cache_backend', 'python')
     tileCache, tileLock = getTileCache()
     assert isinstance(tileCache, cachetools.LRUCache)
+    assert not isinstance(tileCache, ByteSizeLRUCache)
     assert 'tileCache' in cachesInfo()
 
 
+@pytest.mark.singular
+def testGetTileCachePythonBytes():
+    large_image.cache_util.cache._tileCache = None
+    large_image.cache_util.cache._tileLock = None
+    config.setConfig('cache_backend', 'python')
+    config.setConfig('cache_python_size_mode', 'bytes')
+    try:
+        tileCache, tileLock = getTileCache()
+        assert isinstance(tileCache, ByteSizeLRUCache)
+        assert cachesInfo()['tileCache']['maxsize'] >= 256 ** 2 * 4 * 2
+    finally:
+        config.setConfig('cache_python_size_mode', 'items')
+        large_image.cache_util.cache._tileCache = None
+        large_image.cache_util.cache._tileLock = None
+
+
+def testByteSizeLRUCache():
+    cache = ByteSizeLRUCache(100000, defaultItemSize=20000)
+    cache['array'] = np.zeros((100, 100, 3), dtype=np.uint8)
+    assert cache.currsize == 30000
+    cache['bytes'] = b'x' * 20000
+    assert cache.currsize == 50000
+    cache['image'] = PIL.Image.new('RGBA', (100, 100))
+    assert cache.currsize == 90000
+    assert cache.curritems == 3
+    cache['other'] = 'unknown size'
+    assert cache.currsize == 80000
+    assert 'array' not in cache
+    assert cache.evictions == 1
+    with pytest.raises(ValueError):
+        cache['large'] = b'x' * 200000
+    cache = ByteSizeLRUCache(100000, maxitems=3)
+    for idx in range(5):
+        cache[idx] = b'x'
+    assert cache.curritems == 3
+    cache_test(ByteSizeLRUCache(100000, defaultItemSize=100))
+
+
 @pytest.mark.singular
 def testGetTileCacheMemcached():
     large_image.cache_util.cache._tileCache = None
@@ -112,6 +361,23 @@ def testGetTileCacheRedis():
     assert 'tileCache' in cachesInfo()
 
 
+@pytest.mark.singular
+def testGetTileCacheSharedMemory():
+    large_image.cache_util.cache._tileCache = None
+    large_image.cache_util.cache._tileLock = None
+    config.setConfig('cache_backend', 'sharedmemory')
+    config.setConfig('cache_sharedmemory_name', 'large_image_test_%d' % os.getpid())
+    config.setConfig('cache_sharedmemory_size', 4 * 1024 ** 2)
+    tileCache, tileLock = getTileCache()
+    assert isinstance(tileCache, SharedMemoryCache)
+    assert 'tileCache' in cachesInfo()
+    assert 'items' in cachesInfo()['tileCache']
+    tileCache.unlink()
+    large_image.cache_util.cache._tileCache = None
+    large_image.cache_util.cache._tileLock = None
+    config.setConfig('cache_backend', 'python')
+
+
 class TestClass:
     def testLRUThreadSafety(self):
         # The cachetools LRU cache is not thread safe, and if two threads ask
@@ -188,6 +454,89 @@ class TestClass:
         # memcached shows an items record as well
         assert 'items' in cachesInfo()['tileCache']
 
+    def testMethodcacheStats(self):
+        self.cache = cachetools.LRUCache(10)
+        self.cache_lock = threading.Lock()
+
+        @methodcache(lambda x: str(x))
+        def double(self, x):
+            return b'x' * x * 2
+
+        cachesStats(reset=True)
+        for x in [5, 5, 5, 8]:
+            double(self, x)
+        stats = cachesStats()['TestClass.double']
+        assert stats['hits'] == 2
+        assert stats['misses'] == 2
+        assert stats['bytes'] == 26
+        assert sum(stats['fillTimeHistogram'].values()) == 2
+        assert cachesStats(reset=True)
+        assert cachesStats() == {}
+
+    def testMethodcacheSingleFlight(self):
+        self.cache = cachetools.LRUCache(10)
+        self.cache_lock = threading.Lock()
+        calls = []
+
+        @methodcache(lambda x: str(x))
+        def slow(self, x):
+            calls.append(x)
+            time.sleep(0.5)
+            return x * 2
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda x: slow(self, x), [1, 1, 1, 1, 2, 2]))
+        assert results == [2, 2, 2, 2, 4, 4]
+        assert sorted(calls) == [1, 2]
+        assert large_image.cache_util.cache._methodcacheInflight == {}
+
+        # Values that can't be cached are still shared with waiting threads
+        self.cache = cachetools.LRUCache(0)
+        calls[:] = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda x: slow(self, x), [3, 3, 3, 3]))
+        assert results == [6, 6, 6, 6]
+        assert calls == [3]
+
+    def testMethodcacheSingleFlightError(self):
+        self.cache = cachetools.LRUCache(10)
+        self.cache_lock = threading.Lock()
+        calls = []
+
+        @methodcache(lambda x: str(x))
+        def failing(self, x):
+            calls.append(x)
+            time.sleep(0.5)
+            msg = 'failed'
+            raise RuntimeError(msg)
+
+        def call(x):
+            try:
+                failing(self, x)
+            except RuntimeError as exc:
+                return str(exc)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(call, [1, 1, 1, 1]))
+        # Waiting threads get the error instead of each trying again
+        assert results == ['failed'] * 4
+        assert calls == [1]
+        assert large_image.cache_util.cache._methodcacheInflight == {}
+        # Later calls try again
+        assert call(1) == 'failed'
+        assert calls == [1, 1]
+
+    @pytest.mark.singular
+    def testCachesStats(self):
+        cachesClear()
+        cachesStats(reset=True)
+        self.ExampleWithMetaclass('stats')
+        self.ExampleWithMetaclass('stats')
+        stats = cachesInfo(stats=True)['stats']['ExampleWithMetaclass.__init__']
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert 'stats' not in cachesInfo()
+
     @pytest.mark.singular
     def testCachesKeyLock(self):
         cachesClear()
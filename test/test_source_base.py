@@ -420,6 +420,151 @@ def testGetRegionOffsetLargeTile():
     assert np.all(region2 == region1)
 
 
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'region': dict(left=100, top=50, width=3000, height=2000)},
+    {'output': dict(maxWidth=1000)},
+    {'region': dict(left=100, top=50, width=3000, height=2000), 'output': dict(maxWidth=700)},
+])
+def testGetRegionMaxWorkers(kwargs):
+    testDir = os.path.dirname(os.path.realpath(__file__))
+    imagePath = os.path.join(testDir, 'test_files', 'yb10kx5k.zstd.tiff')
+    source = large_image.open(imagePath)
+    region1, _ = source.getRegion(format=large_image.constants.TILE_FORMAT_NUMPY, **kwargs)
+    region2, _ = source.getRegion(
+        format=large_image.constants.TILE_FORMAT_NUMPY, max_workers=4, **kwargs)
+    assert region2.shape == region1.shape
+    assert np.all(region2 == region1)
+    region3, _ = source.getRegion(
+        format=large_image.constants.TILE_FORMAT_NUMPY, max_workers=-4, **kwargs)
+    assert np.all(region3 == region1)
+
+
+@pytest.mark.parametrize(('filename', 'sourceName'), [
+    ('yb10kx5k.zstd.tiff', 'tiff'),
+    ('grey10kx5k.tif', 'tifffile'),
+    ('sample_float32_8bit_range.zarr.zip', 'zarr'),
+])
+def testGetTiles(filename, sourceName):
+    testDir = os.path.dirname(os.path.realpath(__file__))
+    imagePath = os.path.join(testDir, 'test_files', filename)
+    large_image.tilesource.loadTileSources()
+    large_image.cache_util.cachesClear()
+    source = large_image.tilesource.AvailableTileSources[sourceName](imagePath)
+    tileList = []
+    for z in range(source.levels):
+        scale = 2 ** (source.levels - 1 - z)
+        for y in range((source.sizeY // scale + source.tileHeight - 1) // source.tileHeight):
+            for x in range((source.sizeX // scale + source.tileWidth - 1) // source.tileWidth):
+                tileList.append((x, y, z))
+    tileList = tileList[::-1] + tileList[:3]
+    tiles = source.getTiles(tileList, numpyAllowed='always')
+    assert len(tiles) == len(tileList)
+    large_image.cache_util.cachesClear()
+    source = large_image.tilesource.AvailableTileSources[sourceName](imagePath)
+    for (x, y, z), tile in zip(tileList, tiles, strict=True):
+        assert np.array_equal(tile, source.getTile(x, y, z, numpyAllowed='always'))
+    # Cached results and sequential reads are the same
+    tiles2 = source.getTiles(tileList[:8], numpyAllowed='always', max_workers=None)
+    for tile, tile2 in zip(tiles[:8], tiles2, strict=True):
+        assert np.array_equal(tile, tile2)
+
+
+def testGetTilesOutOfRange():
+    large_image.tilesource.loadTileSources()
+    source = large_image.tilesource.AvailableTileSources['test']()
+    with pytest.raises(large_image.exceptions.TileSourceXYZRangeError):
+        source.getTiles([(0, 0, 0), (5, 5, 0)])
+
+
+@pytest.mark.parametrize('dtype', ['uint8', 'uint16', 'int16', 'float32'])
+@pytest.mark.parametrize('kwargs', [{}, {'range': (0, 100)}, {'max_workers': None}])
+def testHistogramDtypes(dtype, kwargs):
+    rng = np.random.default_rng(0)
+    if dtype == 'float32':
+        data = rng.normal(50, 20, (600, 700, 3)).astype(dtype)
+    else:
+        data = rng.integers(-50 if dtype == 'int16' else 0, 250, (600, 700, 3)).astype(dtype)
+    source = large_image.new()
+    source.addTile(data, 0, 0)
+    hist = source.histogram(bins=16, **kwargs)
+    assert np.array_equal(hist['min'], data.min(axis=(0, 1)))
+    assert np.array_equal(hist['max'], data.max(axis=(0, 1)))
+    assert np.allclose(hist['mean'], data.astype(float).mean(axis=(0, 1)))
+    assert np.allclose(hist['stdev'], data.astype(float).std(axis=(0, 1)))
+    for idx, entry in enumerate(hist['histogram']):
+        expected, edges = np.histogram(
+            data[:, :, idx], 16, kwargs.get('range', (entry['min'], entry['max'] + 1)))
+        assert np.array_equal(entry['hist'], expected)
+        assert np.array_equal(entry['bin_edges'], edges)
+        assert entry['samples'] == expected.sum()
+    minmax = source.histogram(onlyMinMax=True, **kwargs)
+    assert np.array_equal(minmax['min'], hist['min'])
+    assert 'histogram' not in minmax
+
+
+def testHistogramSample():
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 1000, (2048, 2048, 2)).astype(np.uint16)
+    data[:, :, 1] += np.arange(2048, dtype=np.uint16)[:, np.newaxis]
+    source = large_image.new()
+    source.addTile(data, 0, 0)
+    full = source.histogram()
+    assert 'sample' not in full
+    totalTiles = (2048 // source.tileWidth) * (2048 // source.tileHeight)
+    fullRes = {'output': {'maxWidth': 2048, 'maxHeight': 2048}}
+    hist = source.histogram(sampleTiles=totalTiles // 2, **fullRes)
+    assert hist['sample']['tiles'] == totalTiles // 2
+    assert hist['sample']['totalTiles'] == totalTiles
+    assert np.all(np.abs(hist['mean'] - full['mean']) <= 4 * hist['sample']['meanError'])
+    assert hist['sample']['meanError'][1] > hist['sample']['meanError'][0]
+    # The same tiles are sampled each time
+    assert np.array_equal(source.histogram(
+        sampleTiles=totalTiles // 2, max_workers=None, **fullRes)['histogram'][0]['hist'],
+        hist['histogram'][0]['hist'])
+    hist = source.histogram(sampleTiles=totalTiles * 2, **fullRes)
+    assert hist['sample']['tiles'] == totalTiles
+    assert np.array_equal(hist['sample']['meanError'], [0, 0])
+    assert np.array_equal(hist['mean'], full['mean'])
+
+
+def testHistogramSampleLevel():
+    import large_image_source_test
+
+    source = large_image_source_test.TestTileSource(
+        sizeX=8192, sizeY=4096, tileWidth=256, tileHeight=256, noCache=True)
+    # By default, the coarsest level at least histogramSampleSize across is
+    # sampled
+    hist = source.histogram(sampleTiles=2, onlyMinMax=True)
+    assert hist['sample']['tiles'] == 2
+    assert hist['sample']['totalTiles'] == 4 * 2
+    assert 'histogram' not in hist
+    hist = source.histogram(sampleTiles=2, onlyMinMax=True, output={'maxWidth': 2048})
+    assert hist['sample']['totalTiles'] == 8 * 4
+    # Only the sampled tiles are read
+    calls = []
+    getTile = source.getTile
+
+    def countedGetTile(*args, **kwargs):
+        calls.append(args)
+        return getTile(*args, **kwargs)
+
+    source.getTile = countedGetTile
+    source.histogram(sampleTiles=3, onlyMinMax=True, output={'maxWidth': 4096})
+    assert len(calls) == 3
+
+
+def testTileIteratorPositions():
+    import large_image_source_test
+
+    source = large_image_source_test.TestTileSource(
+        sizeX=2048, sizeY=1024, tileWidth=256, tileHeight=256, noCache=True)
+    iterator = source.tileIterator(tile_position=[17, 3, 3, 200, 8])
+    assert len(iterator) == 3
+    tiles = [(tile['level_x'], tile['level_y']) for tile in iterator]
+    assert tiles == [(3, 0), (0, 1), (1, 2)]
+
+
 def testGetGeospatialRegion():
     imagePath = datastore.fetch('sample_image.ptif')
     source = large_image.open(imagePath)
@@ -881,6 +1026,45 @@ def testStyleRepeatedFrame():
     assert ts6.getTile(0, 0, 0) == tile1
 
 
+@pytest.mark.parametrize('stops', [
+    [0, 1],
+    [0, 0.25, 0.5, 1],
+    [0.2, 0.3, 0.7, 0.8],
+])
+def testInterpolatePalette(stops):
+    palette = np.array([[0, 0, 255, 255], [255, 0, 0, 255], [255, 255, 0, 255],
+                        [16, 32, 64, 255]], dtype=float)[:len(stops)]
+    values = np.linspace(-0.5, 1.5, 201).reshape(3, 67)
+    values[0, :len(stops)] = stops
+    result = large_image.tilesource.utilities._interpolatePalette(values, stops, palette)
+    assert result.shape == (3, 67, 4)
+    for channel in range(4):
+        assert np.array_equal(
+            result[:, :, channel], np.interp(values, stops, palette[:, channel]))
+
+
+def testStyleFramesComposite():
+    import large_image_source_test
+
+    source = large_image_source_test.TestTileSource(frames=4, fractal=True)
+    style = {'bands': [
+        {'frame': 1, 'band': 1, 'palette': ['#000', '#f00'], 'min': 0, 'max': 255},
+        {'frame': 2, 'band': 1, 'palette': ['#000', '#0f0'], 'min': 0, 'max': 255},
+        {'frame': 3, 'band': 1, 'palette': ['#000', '#00f'], 'min': 0, 'max': 255},
+        {'framedelta': 1, 'band': 2, 'palette': ['#000', '#808080', '#fff'],
+         'min': 0, 'max': 255, 'composite': 'multiply'},
+    ]}
+    ts = large_image_source_test.TestTileSource(frames=4, fractal=True, style=style)
+    tile = ts.getTile(1, 0, 2, frame=0, numpyAllowed='always')
+    frames = [source.getTile(1, 0, 2, frame=frame, numpyAllowed='always')
+              for frame in range(4)]
+    expected = np.stack([frame[:, :, 0] for frame in frames[1:]], axis=-1).astype(float)
+    expected *= np.interp(frames[1][:, :, 1], [0, 127.5, 255], [0, 128, 255])[
+        :, :, np.newaxis] / 255
+    assert tile.shape[:2] == expected.shape[:2]
+    assert np.abs(tile[:, :, :3].astype(float) - expected).max() <= 1
+
+
 def testKnownExtensionList():
     assert len(large_image.tilesource.listSources()['extensions']) > 100
     assert len(large_image.listExtensions()) > 100
@@ -899,3 +1083,27 @@ def testSubtileSlicing():
         sizeY=30 * 2 ** 7, monochrome=True, failBelowMinLevel=False)
     data = ts.getTile(1, 0, 2, pilImageAllowed=False, numpyAllowed='always')
     assert np.amin(data) > 0
+
+
+def testPrewarm():
+    large_image.tilesource.loadTileSources()
+    large_image.cache_util.cachesClear()
+    source = large_image.tilesource.AvailableTileSources['test'](sizeX=4096, sizeY=4096)
+    prewarmer = source.prewarm(levels=3, max_workers=2)
+    assert source.prewarm() is prewarmer
+    assert prewarmer.wait(30)
+    assert prewarmer.stopReason == 'complete'
+    keys = [large_image.cache_util.methodcacheKey(source, None, x, y, z)
+            for z in range(3) for y in range(2 ** z) for x in range(2 ** z)]
+    assert prewarmer.tiles == len(keys)
+    assert len(large_image.cache_util.cacheGetMany(source.cache, keys)) == len(keys)
+    # Levels default to the coarsest levels within the tile limit
+    prewarmer = source.prewarm(restart=True, maxTiles=100)
+    assert prewarmer.levels == [0, 1, 2, 3]
+    assert prewarmer.wait(30)
+    prewarmer = source.prewarm(restart=True, levels=[4, 5])
+    assert prewarmer.levels == [4]
+    prewarmer.cancel()
+    assert prewarmer.wait(30)
+    assert prewarmer.stopReason == 'cancelled'
+    assert prewarmer.tiles < 16 * 16
@@ -4,6 +4,7 @@ import os
 import struct
 import tempfile
 
+import large_image
 import large_image_source_tiff
 import numpy as np
 import pytest
@@ -910,3 +911,124 @@ def testExtraOverview():
     imagePath = datastore.fetch('extraoverview.tiff')
     source = large_image_source_tiff.open(imagePath)
     assert len([d for d in source._tiffDirectories if d is not None]) == 3
+
+
+@pytest.mark.parametrize(('compression', 'options'), [
+    (None, {'tile': (256, 256)}),
+    ('zlib', {'tile': (256, 256), 'byteorder': '>'}),
+    ('lzw', {'tile': (256, 256), 'predictor': True}),
+    ('zlib', {'tile': (256, 256), 'predictor': True}),
+    (None, {'rowsperstrip': 64}),
+    ('zlib', {'rowsperstrip': 64}),
+    ('zlib', {'rowsperstrip': 64, 'predictor': True}),
+])
+def testConcurrentRawTileReads(tmp_path, compression, options):
+    import concurrent.futures
+
+    import tifffile
+
+    from large_image_source_tiff import tiff_reader
+
+    imagePath = str(tmp_path / 'sample.tiff')
+    image = np.random.default_rng(0).integers(0, 65535, (700, 600, 3), dtype=np.uint16)
+    tifffile.imwrite(imagePath, image, compression=compression, photometric='rgb', **options)
+    dir = tiff_reader.TiledTiffDirectory(imagePath, 0, mustBeTiled=None)
+    tiles = [(x, y) for y in range((700 + dir.tileHeight - 1) // dir.tileHeight)
+             for x in range((600 + dir.tileWidth - 1) // dir.tileWidth)]
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda xy: dir.getTile(*xy, asarray=True), tiles * 4))
+    for (x, y), tile in zip(tiles * 4, results, strict=True):
+        expected = image[y * dir.tileHeight:(y + 1) * dir.tileHeight,
+                         x * dir.tileWidth:(x + 1) * dir.tileWidth]
+        assert np.array_equal(tile[:expected.shape[0], :expected.shape[1]], expected)
+    if compression == 'zlib' and options.get('byteorder') != '>':
+        assert dir._decodeRawTile(dir._readRawTile(0)) is not None
+
+
+def testSharedFileDescriptor(tmp_path):
+    import tifffile
+
+    from large_image_source_tiff import tiff_reader
+
+    imagePath = str(tmp_path / 'sample.tiff')
+    image = np.zeros((512, 512, 3), dtype=np.uint8)
+    with tifffile.TiffWriter(imagePath) as tif:
+        tif.write(image, tile=(256, 256), photometric='rgb')
+        tif.write(image[::2, ::2], tile=(256, 256), photometric='rgb')
+    dir0 = tiff_reader.TiledTiffDirectory(imagePath, 0)
+    dir1 = tiff_reader.TiledTiffDirectory(imagePath, 1)
+    assert dir0._fileDescriptor is not None
+    assert dir0._fileDescriptor == dir1._fileDescriptor
+    key = dir0._fileDescriptorKey
+    assert tiff_reader._sharedFileDescriptors[key][1] == 2
+    dir0._close()
+    assert tiff_reader._sharedFileDescriptors[key][1] == 1
+    assert dir1.getTile(0, 0, asarray=True).shape == (256, 256, 3)
+    dir1._close()
+    assert key not in tiff_reader._sharedFileDescriptors
+
+
+@pytest.mark.parametrize('compression', ['jpeg', 'zlib'])
+def testEmptyLevelReducedDecode(tmp_path, compression):
+    import tifffile
+
+    imagePath = str(tmp_path / 'sample.tiff')
+    y, x = np.mgrid[0:4096, 0:4096]
+    image = np.stack([(x // 7) % 256, (y // 5) % 256, ((x + y) // 11) % 256], -1).astype(np.uint8)
+    tifffile.imwrite(imagePath, image, tile=(256, 256), compression=compression,
+                     photometric='rgb')
+    tiles = {}
+    try:
+        for mode, workers in [('quality', -4), ('speed', -4), ('sequential', 1)]:
+            large_image.config.setConfig(
+                'empty_level_decode', 'quality' if mode == 'quality' else 'speed')
+            large_image.config.setConfig('empty_level_workers', workers)
+            source = large_image_source_tiff.open(imagePath, noCache=True)
+            assert source._nonemptyLevelsList()[:-1] == [None] * 4
+            tiles[mode] = [source.getTile(0, 0, z, numpyAllowed='always') for z in range(4)]
+    finally:
+        large_image.config.setConfig('empty_level_decode', 'quality')
+        large_image.config.setConfig('empty_level_workers', -4)
+    for parallel, sequential in zip(tiles['speed'], tiles['sequential'], strict=True):
+        assert np.array_equal(parallel, sequential)
+    for quality, speed in zip(tiles['quality'], tiles['speed'], strict=True):
+        assert quality.shape == speed.shape == (256, 256, 3)
+        assert np.abs(quality.astype(int) - speed).mean() < 2
+
+
+def testOverviewStore(tmp_path, monkeypatch):
+    import time
+
+    import tifffile
+
+    from large_image.cache_util import cachesClear, getOverviewStore
+
+    imagePath = str(tmp_path / 'sample.tiff')
+    y, x = np.mgrid[0:2048, 0:2048]
+    image = np.stack([(x // 7) % 256, (y // 5) % 256, ((x + y) // 11) % 256], -1).astype(np.uint8)
+    tifffile.imwrite(imagePath, image, tile=(256, 256), compression='jpeg', photometric='rgb')
+    try:
+        large_image.config.setConfig('overview_store_path', str(tmp_path / 'overviews'))
+        source = large_image_source_tiff.open(imagePath)
+        tile = source.getTile(0, 0, 0, numpyAllowed='always')
+        store = getOverviewStore()
+        for _ in range(100):
+            if len(store):
+                break
+            time.sleep(0.05)
+        assert len(store) == 1
+
+        def fail(*args, **kwargs):
+            msg = 'Composited a stored tile'
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(
+            large_image_source_tiff.TiffFileTileSource, '_compositeTileFromEmptyLevel', fail)
+        cachesClear()
+        source = large_image_source_tiff.open(imagePath)
+        assert np.array_equal(source.getTile(0, 0, 0, numpyAllowed='always'), tile)
+        with pytest.raises(AssertionError):
+            source.getTile(0, 0, 1, numpyAllowed='always')
+    finally:
+        large_image.config.setConfig('overview_store_path', None)
+        cachesClear()